@@ -81,9 +81,8 @@ class BackgammonCLI:
                     print("\n¡Partida terminada!")
                     return
 
-                # Cambiar turno
+                # turno_completo ya cerró el turno con end_turn()
                 print(f"\nFinalizando turno {turnos_jugados}...")
-                self.__game__.cambiar_turno()
                 print("\n" + "~"*60)
                 print("Cambiando turno...")
                 print("~"*60)
@@ -0,0 +1,258 @@
+"""Búsqueda expectiminimax de n plies sobre las 21 tiradas distintas.
+
+Los nodos de decisión eligen la mejor jugada de ``core.movegen`` y los nodos
+de azar promedian las 21 tiradas distintas (dobles con peso 1/36, el resto
+con 2/36). Los nodos de azar usan poda Star1 y, opcionalmente, sondeo Star2.
+Todos los valores son equidad desde el punto de vista de quien mueve, en el
+rango [-3, 3] (backgammon perdido / ganado).
+"""
+
+import math
+
+from core import movegen, transposition
+from core.excepcions import BusquedaCanceladaError
+from core.board import BARRA_BLANCAS, BARRA_NEGRAS, AFUERA_BLANCAS, AFUERA_NEGRAS
+
+# Las 21 tiradas distintas con su probabilidad, precalculadas una sola vez
+TIRADAS = tuple(
+    ((d1,) * 4 if d1 == d2 else (d1, d2), (1 if d1 == d2 else 2) / 36)
+    for d1 in range(1, 7)
+    for d2 in range(d1, 7)
+)
+
+VALOR_MINIMO = -3.0
+VALOR_MAXIMO = 3.0
+
+
+def _rival(color):
+    return "negra" if color == "blanca" else "blanca"
+
+
+def puntos_ganados(posicion, color):
+    """Puntos que gana ``color`` si ya sacó sus 15 fichas (0 si no terminó)."""
+    propio, ajeno = (AFUERA_BLANCAS, AFUERA_NEGRAS) if color == "blanca" \
+        else (AFUERA_NEGRAS, AFUERA_BLANCAS)
+    if posicion[propio] < 15:
+        return 0
+    if posicion[ajeno] > 0:
+        return 1
+    if color == "blanca":
+        atrapadas = posicion[25] > 0 or any(v < 0 for v in posicion[18:24])
+    else:
+        atrapadas = posicion[24] > 0 or any(v > 0 for v in posicion[0:6])
+    return 3 if atrapadas else 2
+
+
+def evaluar_heuristica(posicion, color):
+    """Evaluación estática en (-1, 1) basada en carrera y estructura.
+
+    Usa los mismos términos que ``AgenteHeuristico.puntaje`` (pips, fichas
+    expuestas y puntos hechos) pero para ambos colores, de modo que
+    ``evaluar_heuristica(p, c) == -evaluar_heuristica(p, rival)`` como
+    requiere la búsqueda negamax. Se calcula en una sola pasada.
+    """
+    pips_blancas = 25 * posicion[BARRA_BLANCAS]
+    pips_negras = 25 * posicion[BARRA_NEGRAS]
+    estructura = 0  # puntos hechos de blancas menos fichas expuestas (vista blanca)
+    for i in range(24):
+        valor = posicion[i]
+        if valor > 0:
+            pips_blancas += (24 - i) * valor
+            estructura += -4 if valor == 1 else 2
+        elif valor < 0:
+            pips_negras -= (i + 1) * valor
+            estructura -= -4 if valor == -1 else 2
+    puntaje = pips_negras - pips_blancas + estructura
+    if color != "blanca":
+        puntaje = -puntaje
+    return math.tanh(puntaje / 40)
+
+
+class Expectimax:
+    """Motor expectiminimax con profundidad configurable en plies.
+
+    ``evaluador(posicion, color)`` debe devolver un valor entre
+    ``cota_inferior`` y ``cota_superior`` desde el punto de vista de ``color``.
+    Con ``profundidad=1`` se elige la jugada de mejor evaluación estática; con
+    ``profundidad=2`` se promedian además las 21 respuestas del rival.
+    ``tabla`` es una ``TranspositionTable`` opcional para los nodos de azar,
+    que conviene reutilizar entre búsquedas con el mismo evaluador. ``cache``
+    es una ``movegen.CacheJugadas`` opcional (p. ej. ``movegen.CACHE``) para
+    no volver a generar las jugadas de posiciones ya vistas.
+    """
+
+    def __init__(self, evaluador=None, profundidad=2, star2=True,
+                 cota_inferior=VALOR_MINIMO, cota_superior=VALOR_MAXIMO, tabla=None,
+                 cache=None):
+        if profundidad < 1:
+            raise ValueError("La profundidad debe ser al menos 1")
+        self.__evaluador__ = evaluador or evaluar_heuristica
+        self.__profundidad__ = profundidad
+        self.__star2__ = star2
+        self.__cota_inferior__ = cota_inferior
+        self.__cota_superior__ = cota_superior
+        self.__tabla__ = tabla
+        self.__cache__ = cache
+        self.__detener__ = None
+        self.nodos = 0
+
+    def _generar(self, posicion, color, dados):
+        """Jugadas de ``core.movegen``, pasando por la cache si se configuró."""
+        if self.__cache__ is None:
+            return movegen.generar_jugadas(posicion, color, dados)
+        return movegen.generar_jugadas_cacheadas(posicion, color, dados, self.__cache__)
+
+    # --------------------------- evaluación ---------------------------
+    def _estatico(self, posicion, color):
+        """Valor de una posición para ``color`` justo después de que movió."""
+        puntos = puntos_ganados(posicion, color)
+        if puntos:
+            return float(puntos)
+        return self.__evaluador__(posicion, color)
+
+    def _ordenar(self, jugadas, color):
+        """Ordena (jugada, final) por evaluación estática, mejor primero.
+
+        Si el evaluador tiene ``evaluar_lote`` se evalúan todas las jugadas de
+        una sola vez (p. ej. una multiplicación de matrices en la red neuronal).
+        """
+        evaluar_lote = getattr(self.__evaluador__, "evaluar_lote", None)
+        if evaluar_lote is None:
+            puntuadas = [(self._estatico(final, color), jugada, final)
+                         for jugada, final in jugadas]
+        else:
+            valores = evaluar_lote([final for _, final in jugadas], color)
+            puntuadas = [(float(puntos_ganados(final, color)) or valor, jugada, final)
+                         for valor, (jugada, final) in zip(valores, jugadas)]
+        puntuadas.sort(key=lambda item: item[0], reverse=True)
+        return puntuadas
+
+    def _valor_hijo(self, estatico, final, color, plies, alfa, beta):
+        """Valor exacto de una jugada ya hecha por ``color``."""
+        if plies == 1 or puntos_ganados(final, color):
+            return estatico
+        return -self._azar(final, _rival(color), plies - 1, -beta, -alfa)
+
+    def _max(self, posicion, color, dados, plies, alfa, beta, ordenadas=None, sonda=None):
+        """Nodo de decisión: mejor valor para ``color`` con ``dados``."""
+        self.nodos += 1
+        if ordenadas is None:
+            ordenadas = self._ordenar(self._generar(posicion, color, dados), color)
+        if plies == 1:
+            return ordenadas[0][0]
+        inicio = 0
+        mejor = -math.inf
+        if sonda is not None:
+            # El primer hijo ya se evaluó durante el sondeo Star2
+            mejor, inicio = sonda, 1
+            if mejor >= beta:
+                return mejor
+        for estatico, _, final in ordenadas[inicio:]:
+            valor = self._valor_hijo(estatico, final, color, plies, max(alfa, mejor), beta)
+            if valor > mejor:
+                mejor = valor
+                if mejor >= beta:
+                    break
+        return mejor
+
+    def _azar(self, posicion, color, plies, alfa, beta):
+        """Nodo de azar: equidad esperada de ``color`` antes de tirar los dados."""
+        tabla = self.__tabla__
+        if tabla is None:
+            return self._azar_busqueda(posicion, color, plies, alfa, beta)[0]
+        clave_posicion = transposition.clave(posicion, color)
+        valor = tabla.consultar(clave_posicion, plies, alfa, beta)
+        if valor is None:
+            valor, tipo = self._azar_busqueda(posicion, color, plies, alfa, beta)
+            tabla.guardar(clave_posicion, plies, valor, tipo)
+        return valor
+
+    def _azar_busqueda(self, posicion, color, plies, alfa, beta):
+        """Busca un nodo de azar; devuelve (valor, tipo de valor para la tabla)."""
+        self.nodos += 1
+        if self.__detener__ is not None and self.__detener__():
+            raise BusquedaCanceladaError("Búsqueda cancelada")
+        cota_inf, cota_sup = self.__cota_inferior__, self.__cota_superior__
+        hijos = [[dados, prob, None] for dados, prob in TIRADAS]
+
+        sondas = [None] * len(hijos)
+        if self.__star2__ and plies > 1 and beta < cota_sup:
+            # Star2: el valor de un hijo es cota inferior del nodo de decisión,
+            # así que el promedio de las sondas puede probar un corte por arriba
+            total = 0.0
+            for i, hijo in enumerate(hijos):
+                hijo[2] = self._ordenar(self._generar(posicion, color, hijo[0]), color)
+                estatico, _, final = hijo[2][0]
+                sondas[i] = self._valor_hijo(estatico, final, color, plies, cota_inf, cota_sup)
+                total += hijo[1] * sondas[i]
+            if total >= beta:
+                return total, transposition.COTA_INFERIOR
+
+        # Star1: ventana reducida para cada tirada según lo ya acumulado
+        suma = 0.0
+        restante = 1.0
+        for i, (dados, prob, ordenadas) in enumerate(hijos):
+            restante -= prob
+            bajo = (alfa - suma - restante * cota_sup) / prob
+            alto = (beta - suma - restante * cota_inf) / prob
+            valor = self._max(posicion, color, dados, plies,
+                              max(bajo, cota_inf), min(alto, cota_sup),
+                              ordenadas, sondas[i])
+            suma += prob * valor
+            if valor >= alto:
+                return suma + restante * cota_inf, transposition.COTA_INFERIOR
+            if valor <= bajo:
+                return suma + restante * cota_sup, transposition.COTA_SUPERIOR
+        return suma, transposition.EXACTO
+
+    # ----------------------------- API -----------------------------
+    def evaluar_jugadas(self, posicion, color, dados):
+        """Devuelve [(valor, jugada, final)] ordenado de mejor a peor (valores exactos)."""
+        ordenadas = self._ordenar(self._generar(posicion, color, dados), color)
+        resultado = [
+            (self._valor_hijo(estatico, final, color, self.__profundidad__,
+                              self.__cota_inferior__, self.__cota_superior__), jugada, final)
+            for estatico, jugada, final in ordenadas
+        ]
+        resultado.sort(key=lambda item: item[0], reverse=True)
+        return resultado
+
+    def _elegir(self, ordenadas, color):
+        """Recorre las jugadas ya ordenadas y devuelve (indice, valor) de la mejor."""
+        mejor, mejor_valor = 0, -math.inf
+        for i, (estatico, _, final) in enumerate(ordenadas):
+            # Solo interesa saber si la jugada supera a la mejor encontrada
+            valor = self._valor_hijo(estatico, final, color, self.__profundidad__,
+                                     max(mejor_valor, self.__cota_inferior__),
+                                     self.__cota_superior__)
+            if valor > mejor_valor:
+                mejor, mejor_valor = i, valor
+        return mejor, mejor_valor
+
+    def mejor_jugada(self, posicion, color, dados, detener=None):
+        """Devuelve (jugada, valor) de la mejor jugada para la tirada dada.
+
+        ``detener`` es una función sin argumentos que se consulta en cada nodo
+        de azar; si devuelve True la búsqueda se corta con
+        ``BusquedaCanceladaError`` (p. ej. ``threading.Event().is_set``).
+        """
+        self.__detener__ = detener
+        try:
+            ordenadas = self._ordenar(self._generar(posicion, color, dados), color)
+            indice, valor = self._elegir(ordenadas, color)
+        finally:
+            self.__detener__ = None
+        return ordenadas[indice][1], valor
+
+    def sugerir(self, game):
+        """Sugiere (jugada, valor) para el turno y los dados actuales de ``game``."""
+        return self.mejor_jugada(game.posicion_compacta(),
+                                 game.get_turno().get_color(),
+                                 game.get_dados_disponibles())
+
+    def elegir_jugada(self, game, jugadas):
+        """Interfaz de agente de ``core.simulate``: elige entre las jugadas dadas."""
+        color = game.get_turno().get_color()
+        ordenadas = self._ordenar(jugadas, color)
+        indice, _ = self._elegir(ordenadas, color)
+        return ordenadas[indice][1], ordenadas[indice][2]
@@ -0,0 +1,419 @@
+"""Base de datos de bearoff de un solo lado, generada una vez y leída con mmap.
+
+Para cada posición de un jugador con todas sus fichas en el home (hasta
+``fichas`` fichas en ``puntos`` puntos; 15 y 6 por defecto, 54.264
+posiciones) guarda la distribución de la cantidad de tiradas necesarias para
+sacarlas todas jugando a minimizar la esperanza, y esa esperanza.
+
+Una posición es una tupla de conteos por distancia a la salida:
+``(punto 1, punto 2, ..., punto 6)``. Se indexa con el sistema combinatorio:
+cada posición con a lo sumo ``n`` fichas en ``p`` puntos se corresponde con un
+subconjunto de ``p`` elementos de ``{0, ..., n + p - 1}``.
+
+Formato del archivo: cabecera ``MAGIA`` + ``<HHH`` (puntos, fichas, tiradas
+máximas) y luego, por posición en orden de índice, un ``float32`` con la
+esperanza y ``TIRADAS_MAXIMAS`` probabilidades ``uint16`` (escala 65535).
+También incluye la base exacta de dos lados (``TwoSidedBearoff``) para
+carreras chicas: para cada par de posiciones guarda la probabilidad de ganar
+de quien tira, cuantizada a ``uint16``. Uso para generarlas:
+
+    python -m core.bearoff --salida bearoff1.bin
+    python -m core.bearoff --dos-lados --fichas 6 --salida bearoff2.bin
+"""
+
+import argparse
+import mmap
+import struct
+from array import array
+from math import comb
+
+from core.board import BARRA_BLANCAS, BARRA_NEGRAS, AFUERA_BLANCAS, AFUERA_NEGRAS
+
+MAGIA = b"BGBO1\0"
+MAGIA_DOS_LADOS = b"BGBO2\0"
+_UINT16 = struct.Struct("<H")
+_CABECERA = struct.Struct("<HHH")
+TIRADAS_MAXIMAS = 32
+_ESCALA = 65535
+_DADOS = range(1, 7)
+_NO_DOBLES = tuple((a, b) for a in _DADOS for b in _DADOS if a < b)
+# Tope de la base de dos lados: 6 fichas en 6 puntos (924 posiciones, ~850k pares)
+POSICIONES_MAXIMAS_DOS_LADOS = 924
+
+
+def cantidad_posiciones(puntos=6, fichas=15):
+    """Cantidad de posiciones con a lo sumo ``fichas`` fichas en ``puntos`` puntos."""
+    return comb(fichas + puntos, puntos)
+
+
+def indice(posicion):
+    """Índice combinatorio de una posición (tupla de conteos por punto)."""
+    resultado = 0
+    acumulado = -1
+    for k, cantidad in enumerate(posicion, start=1):
+        acumulado += cantidad + 1
+        resultado += comb(acumulado, k)
+    return resultado
+
+
+def posicion_de_indice(numero, puntos=6):
+    """Inversa de ``indice``: reconstruye la tupla de conteos."""
+    elementos = []
+    for k in range(puntos, 0, -1):
+        valor = k - 1
+        while comb(valor + 1, k) <= numero:
+            valor += 1
+        elementos.append(valor)
+        numero -= comb(valor, k)
+    elementos.reverse()
+    conteos = []
+    anterior = -1
+    for elemento in elementos:
+        conteos.append(elemento - anterior - 1)
+        anterior = elemento
+    return tuple(conteos)
+
+
+def _enumerar(puntos, fichas):
+    """Genera todas las posiciones con a lo sumo ``fichas`` fichas en ``puntos`` puntos."""
+    if puntos == 0:
+        yield ()
+        return
+    for cantidad in range(fichas + 1):
+        for resto in _enumerar(puntos - 1, fichas - cantidad):
+            yield (cantidad,) + resto
+
+
+def movimientos(posicion, dado):
+    """Posiciones alcanzables moviendo una ficha con ``dado`` (sin contacto)."""
+    alto = max((i for i, c in enumerate(posicion) if c), default=-1)
+    resultado = []
+    for i in range(alto, -1, -1):
+        if not posicion[i]:
+            continue
+        destino = i - dado
+        # Se saca con dado exacto o con dado mayor desde el punto más alto
+        if destino >= -1 or i == alto:
+            nueva = list(posicion)
+            nueva[i] -= 1
+            if destino >= 0:
+                nueva[destino] += 1
+            resultado.append(tuple(nueva))
+    return resultado
+
+
+def generar(puntos=6, fichas=15):
+    """Calcula (esperanzas, distribuciones) para todas las posiciones.
+
+    Recorre las posiciones por cantidad creciente de pips, así todas las
+    posiciones alcanzables ya están resueltas. Para cada dado guarda la mejor
+    posición alcanzable con uno, dos y tres movimientos, lo que resuelve
+    tiradas simples y dobles sin enumerar jugadas completas.
+    """
+    total = cantidad_posiciones(puntos, fichas)
+    posiciones = [None] * total
+    for posicion in _enumerar(puntos, fichas):
+        posiciones[indice(posicion)] = posicion
+    indices = {posicion: i for i, posicion in enumerate(posiciones)}
+    orden = sorted(range(total), key=lambda i: sum((k + 1) * c for k, c in
+                                                   enumerate(posiciones[i])))
+    esperanzas = [0.0] * total
+    distribuciones = [None] * total
+    # mejores[n][dado][i]: índice de la mejor posición tras n movimientos con ``dado``
+    mejores = [[[0] * total for _ in range(7)] for _ in range(4)]
+    cero = indice((0,) * puntos)
+    distribuciones[cero] = [1.0] + [0.0] * (TIRADAS_MAXIMAS - 1)
+
+    def mejor(candidatos):
+        return min(candidatos, key=esperanzas.__getitem__)
+
+    for i in orden:
+        if i == cero:
+            for nivel in range(1, 4):
+                for dado in _DADOS:
+                    mejores[nivel][dado][i] = cero
+            continue
+        hijos = {dado: [indices[p] for p in movimientos(posiciones[i], dado)] for dado in _DADOS}
+        resultados = []
+        for a, b in _NO_DOBLES:
+            resultados.append((2, mejor([mejores[1][b][h] for h in hijos[a]]
+                                        + [mejores[1][a][h] for h in hijos[b]])))
+        for dado in _DADOS:
+            resultados.append((1, mejor([mejores[3][dado][h] for h in hijos[dado]])))
+
+        distribucion = [0.0] * TIRADAS_MAXIMAS
+        for peso, final in resultados:
+            for k, prob in enumerate(distribuciones[final][:-1]):
+                distribucion[k + 1] += peso * prob / 36
+        distribuciones[i] = distribucion
+        esperanzas[i] = sum(k * p for k, p in enumerate(distribucion))
+
+        # Solo ahora, con la esperanza de i conocida, se completan sus mejores
+        for dado in _DADOS:
+            mejores[1][dado][i] = mejor(hijos[dado])
+            for nivel in (2, 3):
+                mejores[nivel][dado][i] = mejor([mejores[nivel - 1][dado][h]
+                                                 for h in hijos[dado]])
+    return esperanzas, distribuciones
+
+
+def escribir(ruta, puntos=6, fichas=15):
+    """Genera la base y la guarda en ``ruta``."""
+    esperanzas, distribuciones = generar(puntos, fichas)
+    registro = struct.Struct(f"<f{TIRADAS_MAXIMAS}H")
+    with open(ruta, "wb") as archivo:
+        archivo.write(MAGIA)
+        archivo.write(_CABECERA.pack(puntos, fichas, TIRADAS_MAXIMAS))
+        for esperanza, distribucion in zip(esperanzas, distribuciones):
+            archivo.write(registro.pack(esperanza,
+                                        *(round(p * _ESCALA) for p in distribucion)))
+
+
+class OneSidedBearoff:
+    """Consulta la base de un solo lado directamente desde el archivo mapeado."""
+
+    def __init__(self, ruta):
+        with open(ruta, "rb") as archivo:
+            self.__mapa__ = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.__mapa__[:len(MAGIA)] != MAGIA:
+            self.__mapa__.close()
+            raise ValueError(f"{ruta} no es una base de bearoff")
+        self.puntos, self.fichas, tiradas = _CABECERA.unpack_from(self.__mapa__, len(MAGIA))
+        self.__registro__ = struct.Struct(f"<f{tiradas}H")
+        self.__inicio__ = len(MAGIA) + _CABECERA.size
+
+    def cerrar(self):
+        """Libera el mapeo del archivo."""
+        self.__mapa__.close()
+
+    def contiene(self, posicion):
+        """True si la posición entra en los límites de la base."""
+        return len(posicion) <= self.puntos and sum(posicion) <= self.fichas
+
+    def _desplazamiento(self, posicion):
+        posicion = tuple(posicion) + (0,) * (self.puntos - len(posicion))
+        return self.__inicio__ + indice(posicion) * self.__registro__.size
+
+    def esperanza(self, posicion):
+        """Cantidad esperada de tiradas para sacar todas las fichas."""
+        return struct.unpack_from("<f", self.__mapa__, self._desplazamiento(posicion))[0]
+
+    def distribucion(self, posicion):
+        """Probabilidad de terminar en exactamente k tiradas, para cada k."""
+        valores = self.__registro__.unpack_from(self.__mapa__, self._desplazamiento(posicion))
+        return [v / _ESCALA for v in valores[1:]]
+
+    def probabilidad_ganar(self, en_turno, rival):
+        """Probabilidad de que ``en_turno`` (que tira primero) saque antes que ``rival``."""
+        propia = self.distribucion(en_turno)
+        ajena = self.distribucion(rival)
+        resultado = 0.0
+        ajena_restante = 1.0  # P(rival necesita al menos k tiradas)
+        for k, prob in enumerate(propia):
+            resultado += prob * ajena_restante
+            if k < len(ajena):
+                ajena_restante -= ajena[k]
+        return resultado
+
+
+BaseBearoff = OneSidedBearoff
+
+
+def finales(posicion, dados):
+    """Posiciones distintas a las que se llega jugando toda la tirada ``dados``."""
+    dados = tuple(dados)
+    ordenes = {dados, dados[::-1]}
+    resultado = set()
+    for orden in ordenes:
+        actuales = {posicion}
+        for dado in orden:
+            siguientes = set()
+            for actual in actuales:
+                if any(actual):
+                    siguientes.update(movimientos(actual, dado))
+                else:
+                    siguientes.add(actual)
+            actuales = siguientes
+        resultado |= actuales
+    return resultado
+
+
+def generar_dos_lados(puntos=6, fichas=6):
+    """Probabilidad exacta de ganar de quien tira, para cada par de posiciones.
+
+    Devuelve un ``array("d")`` plano de ``N * N`` valores (``N`` posiciones):
+    ``tabla[i * N + j]`` es la probabilidad de que el jugador en la posición
+    de índice ``i``, que está por tirar, saque todas sus fichas antes que el
+    rival en la posición ``j``, jugando ambos a maximizar esa probabilidad.
+    Los pares se resuelven por suma de pips creciente: cada jugada reduce los
+    pips de quien mueve.
+
+    La tabla entera vive en memoria (8 bytes por par) y el tiempo crece con
+    ``N ** 2``: por eso se rechazan con ``ValueError`` las bases de más de
+    ``POSICIONES_MAXIMAS_DOS_LADOS`` posiciones (6 fichas en 6 puntos).
+    """
+    total = cantidad_posiciones(puntos, fichas)
+    if total > POSICIONES_MAXIMAS_DOS_LADOS:
+        raise ValueError(f"La base de dos lados admite hasta {POSICIONES_MAXIMAS_DOS_LADOS} "
+                         f"posiciones; {fichas} fichas en {puntos} puntos son {total}")
+    posiciones = [None] * total
+    for posicion in _enumerar(puntos, fichas):
+        posiciones[indice(posicion)] = posicion
+    indices = {posicion: i for i, posicion in enumerate(posiciones)}
+    pips = [sum((k + 1) * c for k, c in enumerate(p)) for p in posiciones]
+    tiradas = [((a,) * 4 if a == b else (a, b), (1 if a == b else 2) / 36)
+               for a in _DADOS for b in _DADOS if a <= b]
+    cero = indice((0,) * puntos)
+
+    # Quien ya sacó todo ganó: fila del cero en 1, columna del cero en 0
+    tabla = array("d", bytes(8 * total * total))
+    tabla[cero * total:(cero + 1) * total] = array("d", [1.0] * total)
+    tabla[cero * total + cero] = 0.0
+    sucesores = [None] * total
+    por_pips = {}
+    for i, posicion in enumerate(posiciones):
+        if i != cero:
+            sucesores[i] = [(prob, [indices[f] for f in finales(posicion, dados)])
+                            for dados, prob in tiradas]
+            por_pips.setdefault(pips[i], []).append(i)
+
+    _resolver_pares(tabla, total, sucesores, por_pips)
+    return tabla
+
+
+def _resolver_pares(tabla, total, sucesores, por_pips):
+    """Llena ``tabla`` recorriendo los pares por suma de pips, sin listarlos todos."""
+    for suma in range(2 * max(por_pips, default=0) + 1):
+        for pips_propios, propias in por_pips.items():
+            rivales = por_pips.get(suma - pips_propios, ())
+            for i in propias:
+                for j in rivales:
+                    fila_rival = j * total
+                    tabla[i * total + j] = sum(
+                        prob * (1.0 - min(tabla[fila_rival + f] for f in opciones))
+                        for prob, opciones in sucesores[i])
+
+
+def escribir_dos_lados(ruta, puntos=6, fichas=6):
+    """Genera la base de dos lados y la guarda cuantizada a ``uint16``."""
+    tabla = generar_dos_lados(puntos, fichas)
+    total = cantidad_posiciones(puntos, fichas)
+    with open(ruta, "wb") as archivo:
+        archivo.write(MAGIA_DOS_LADOS)
+        archivo.write(_CABECERA.pack(puntos, fichas, 0))
+        for inicio in range(0, len(tabla), total):
+            fila = tabla[inicio:inicio + total]
+            archivo.write(array("H", (round(p * _ESCALA) for p in fila)).tobytes())
+
+
+class TwoSidedBearoff:
+    """Probabilidades exactas de carrera para pares de posiciones, desde el mmap.
+
+    Cada par ocupa un ``uint16`` en la posición ``i * N + j`` del archivo,
+    con ``i`` el índice de quien tira y ``j`` el del rival.
+    """
+
+    def __init__(self, ruta):
+        with open(ruta, "rb") as archivo:
+            self.__mapa__ = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.__mapa__[:len(MAGIA_DOS_LADOS)] != MAGIA_DOS_LADOS:
+            self.__mapa__.close()
+            raise ValueError(f"{ruta} no es una base de bearoff de dos lados")
+        self.puntos, self.fichas, _ = _CABECERA.unpack_from(self.__mapa__,
+                                                            len(MAGIA_DOS_LADOS))
+        self.__total__ = cantidad_posiciones(self.puntos, self.fichas)
+        self.__inicio__ = len(MAGIA_DOS_LADOS) + _CABECERA.size
+
+    def cerrar(self):
+        """Libera el mapeo del archivo."""
+        self.__mapa__.close()
+
+    def contiene(self, posicion):
+        """True si la posición entra en los límites de la base."""
+        return len(posicion) <= self.puntos and sum(posicion) <= self.fichas
+
+    def _indice(self, posicion):
+        return indice(tuple(posicion) + (0,) * (self.puntos - len(posicion)))
+
+    def probabilidad_ganar(self, en_turno, rival):
+        """Probabilidad exacta de que ``en_turno`` (que tira primero) gane la carrera."""
+        par = self._indice(en_turno) * self.__total__ + self._indice(rival)
+        return _UINT16.unpack_from(self.__mapa__, self.__inicio__ + 2 * par)[0] / _ESCALA
+
+    def equidad(self, en_turno, rival):
+        """Equidad a un punto (sin gammons) de quien tira."""
+        return 2 * self.probabilidad_ganar(en_turno, rival) - 1
+
+
+BaseBearoffDosLados = TwoSidedBearoff
+
+
+def posicion_home(posicion, color, puntos=6):
+    """Conteos por distancia a la salida si ``color`` tiene todo en su home, si no None."""
+    if color == "blanca":
+        if posicion[BARRA_BLANCAS] or any(v > 0 for v in posicion[:24 - puntos]):
+            return None
+        return tuple(max(posicion[23 - k], 0) for k in range(puntos))
+    if posicion[BARRA_NEGRAS] or any(v < 0 for v in posicion[puntos:24]):
+        return None
+    return tuple(max(-posicion[k], 0) for k in range(puntos))
+
+
+class EvaluadorBearoff:
+    """Evaluador que resuelve las carreras de bearoff con tablas.
+
+    Si ambos jugadores tienen todas sus fichas en el home (sin contacto)
+    devuelve la equidad de carrera de ``color`` (que acaba de mover, el rival
+    tira primero): exacta si el par entra en la base de dos lados
+    ``dos_lados``, aproximada con la de un lado ``base`` si no. Fuera de los
+    límites de ambas usa ``respaldo``.
+    """
+
+    def __init__(self, base, respaldo, dos_lados=None):
+        self.__bases__ = [b for b in (dos_lados, base) if b is not None]
+        self.__respaldo__ = respaldo
+
+    def equidad_carrera(self, posicion, color):
+        """Equidad de carrera para ``color`` o None si no corresponde usar una base."""
+        if posicion[AFUERA_BLANCAS] == 0 or posicion[AFUERA_NEGRAS] == 0:
+            return None  # todavía es posible un gammon: lo decide el respaldo
+        rival = "negra" if color == "blanca" else "blanca"
+        for base in self.__bases__:
+            propia = posicion_home(posicion, color, base.puntos)
+            ajena = posicion_home(posicion, rival, base.puntos)
+            if (propia is not None and ajena is not None
+                    and base.contiene(propia) and base.contiene(ajena)):
+                return 1 - 2 * base.probabilidad_ganar(ajena, propia)
+        return None
+
+    def __call__(self, posicion, color):
+        valor = self.equidad_carrera(posicion, color)
+        return self.__respaldo__(posicion, color) if valor is None else valor
+
+
+def main(argv=None):
+    """Punto de entrada de ``python -m core.bearoff``."""
+    parser = argparse.ArgumentParser(description="Genera bases de bearoff")
+    parser.add_argument("--salida", default="bearoff1.bin")
+    parser.add_argument("--puntos", type=int, default=6)
+    parser.add_argument("--fichas", type=int, default=None,
+                        help="15 para la base de un lado, 6 para la de dos lados")
+    parser.add_argument("--dos-lados", action="store_true",
+                        help="genera la base exacta de dos lados")
+    args = parser.parse_args(argv)
+    if args.dos_lados:
+        fichas = args.fichas or 6
+        if cantidad_posiciones(args.puntos, fichas) > POSICIONES_MAXIMAS_DOS_LADOS:
+            parser.error(f"la base de dos lados admite hasta {POSICIONES_MAXIMAS_DOS_LADOS} "
+                         "posiciones (6 fichas en 6 puntos)")
+        escribir_dos_lados(args.salida, args.puntos, fichas)
+        cantidad = cantidad_posiciones(args.puntos, fichas) ** 2
+    else:
+        fichas = args.fichas or 15
+        escribir(args.salida, args.puntos, fichas)
+        cantidad = cantidad_posiciones(args.puntos, fichas)
+    print(f"{cantidad} posiciones en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,25 @@
 """Módulo que define el tablero y operaciones sobre él."""
 
+from array import array
+
+from core import zobrist
 from core.checker import Ficha
+from core.excepcions import PosicionVaciaError
+
+# Disposición de la representación compacta (28 casilleros int8):
+# 0-23 puntos del tablero (positivo = blancas, negativo = negras),
+# luego barra y fichas afuera de cada color.
+BARRA_BLANCAS = 24
+BARRA_NEGRAS = 25
+AFUERA_BLANCAS = 26
+AFUERA_NEGRAS = 27
+CASILLEROS = 28
+
+POSICION_INICIAL = (
+    2, 0, 0, 0, 0, -5, 0, -3, 0, 0, 0, 5,
+    -5, 0, 0, 0, 3, 0, 5, 0, 0, 0, 0, -2,
+    0, 0, 0, 0,
+)
 
 class Board:
     """Modelo del tablero de backgammon con sus puntos y fichas."""
@@ -13,6 +32,10 @@ class Board:
         self.__barra_blancas__ = []
         self.__barra_negras__ = []
 
+        # Contadores de fichas sacadas del tablero (borne-off)
+        self.__afuera_blancas__ = 0
+        self.__afuera_negras__ = 0
+
         # Posiciones iniciales estándar del Backgammon
         iniciales = [(0, 2, "blanca"), (11, 5, "blanca"), (16, 3, "blanca"), (18, 5, "blanca"),
                     (23, 2, "negra"), (12, 5, "negra"), (7, 3, "negra"), (5, 5, "negra")]
@@ -20,6 +43,25 @@ class Board:
         for posicion, cantidad, color in iniciales:
             self.__contenedor__[posicion] = [Ficha(color, posicion) for _ in range(cantidad)]
 
+        # Hash Zobrist de la posición, actualizado en O(1) por cada mutador
+        self.__zobrist__ = zobrist.hash_posicion(self.posicion_compacta())
+
+    def hash_posicion(self):
+        """Devuelve el hash Zobrist de 64 bits de la posición (sin turno)."""
+        return self.__zobrist__
+
+    def recalcular_hash(self):
+        """Recalcula el hash desde cero (tras modificar el contenedor a mano)."""
+        self.__zobrist__ = zobrist.hash_posicion(self.posicion_compacta())
+        return self.__zobrist__
+
+    def _valor_punto(self, posicion):
+        """Conteo con signo de un punto (positivo = blancas, negativo = negras)."""
+        fichas = self.__contenedor__[posicion]
+        if not fichas:
+            return 0
+        return len(fichas) if fichas[0].obtener_color() == "blanca" else -len(fichas)
+
     def get_contenedor(self):
         """Muestra el contenedor."""
         return self.__contenedor__
@@ -41,37 +83,65 @@ class Board:
     def guardar_ficha(self, posicion, ficha: Ficha):
         """Guarda una ficha en una posición dada."""
         ficha.mover(posicion)
+        antes = self._valor_punto(posicion)
         self.__contenedor__[posicion].append(ficha)
+        self.__zobrist__ ^= zobrist.delta(posicion, antes, self._valor_punto(posicion))
+
+    def asignar_punto(self, posicion, fichas):
+        """Reemplaza el contenido de un punto por la lista de fichas dada."""
+        antes = self._valor_punto(posicion)
+        self.__contenedor__[posicion] = list(fichas)
+        self.__zobrist__ ^= zobrist.delta(posicion, antes, self._valor_punto(posicion))
 
     def quitar_ficha(self, posicion):
         """Quita una ficha de una posición dada."""
         if not self.__contenedor__[posicion]:
             return None
+        antes = self._valor_punto(posicion)
         ficha = self.__contenedor__[posicion].pop()
         ficha.mover(None)
+        self.__zobrist__ ^= zobrist.delta(posicion, antes, self._valor_punto(posicion))
         return ficha
 
     def mover_ficha(self, origen, destino):
         """Mueve una ficha de una posición de origen a una de destino."""
+        antes_origen = self._valor_punto(origen)
+        antes_destino = self._valor_punto(destino)
         ficha = self.__contenedor__[origen].pop()
         ficha.mover(destino)
         self.__contenedor__[destino].append(ficha)
+        self.__zobrist__ ^= (
+            zobrist.delta(origen, antes_origen, self._valor_punto(origen))
+            ^ zobrist.delta(destino, antes_destino, self._valor_punto(destino))
+        )
 
     def enviar_a_barra(self, ficha: Ficha):
         """Envía una ficha a la barra (fichas capturadas)."""
         ficha.mover("barra")
-        destino_barra = (
-            self.__barra_blancas__ if ficha.obtener_color() == "blanca" else self.__barra_negras__
-        )
+        if ficha.obtener_color() == "blanca":
+            destino_barra, casillero = self.__barra_blancas__, BARRA_BLANCAS
+        else:
+            destino_barra, casillero = self.__barra_negras__, BARRA_NEGRAS
         destino_barra.append(ficha)
+        cantidad = len(destino_barra)
+        self.__zobrist__ ^= zobrist.delta(casillero, cantidad - 1, cantidad)
 
     def reingresar_desde_barra(self, color, destino):
         """Reingresa una ficha desde la barra a una posición del tablero."""
-        barra = self.__barra_blancas__ if color == "blanca" else self.__barra_negras__
+        if color == "blanca":
+            barra, casillero = self.__barra_blancas__, BARRA_BLANCAS
+        else:
+            barra, casillero = self.__barra_negras__, BARRA_NEGRAS
         if barra:
+            antes = self._valor_punto(destino)
             ficha = barra.pop()
             ficha.mover(destino)
             self.__contenedor__[destino].append(ficha)
+            cantidad = len(barra)
+            self.__zobrist__ ^= (
+                zobrist.delta(casillero, cantidad + 1, cantidad)
+                ^ zobrist.delta(destino, antes, self._valor_punto(destino))
+            )
 
     def fichas_en_barra(self, color):
         """Devuelve la cantidad de fichas de un color en la barra."""
@@ -81,10 +151,53 @@ class Board:
         """Saca una ficha de una posición y la envía 'afuera'."""
         if not self.__contenedor__[posicion]:
             return None
+        antes = self._valor_punto(posicion)
         ficha = self.__contenedor__[posicion].pop()
         ficha.mover("afuera")
+        if ficha.obtener_color() == "blanca":
+            self.__afuera_blancas__ += 1
+            casillero, cantidad = AFUERA_BLANCAS, self.__afuera_blancas__
+        else:
+            self.__afuera_negras__ += 1
+            casillero, cantidad = AFUERA_NEGRAS, self.__afuera_negras__
+        self.__zobrist__ ^= (
+            zobrist.delta(posicion, antes, self._valor_punto(posicion))
+            ^ zobrist.delta(casillero, cantidad - 1, cantidad)
+        )
         return ficha
 
+    def devolver_ficha(self, posicion, ficha: Ficha):
+        """Devuelve al tablero una ficha que había salido (deshace sacar_ficha)."""
+        if ficha.obtener_color() == "blanca":
+            self.__afuera_blancas__ -= 1
+            casillero, cantidad = AFUERA_BLANCAS, self.__afuera_blancas__
+        else:
+            self.__afuera_negras__ -= 1
+            casillero, cantidad = AFUERA_NEGRAS, self.__afuera_negras__
+        self.__zobrist__ ^= zobrist.delta(casillero, cantidad + 1, cantidad)
+        self.guardar_ficha(posicion, ficha)
+
+    def fichas_afuera(self, color):
+        """Devuelve la cantidad de fichas de un color sacadas del tablero."""
+        return self.__afuera_blancas__ if color == "blanca" else self.__afuera_negras__
+
+    def posicion_compacta(self):
+        """Devuelve el tablero como arreglo de 28 enteros con signo (ver CASILLEROS)."""
+        posicion = array("b", bytes(CASILLEROS))
+        for i, fichas in enumerate(self.__contenedor__):
+            if fichas:
+                signo = 1 if fichas[0].obtener_color() == "blanca" else -1
+                posicion[i] = signo * len(fichas)
+        posicion[BARRA_BLANCAS] = len(self.__barra_blancas__)
+        posicion[BARRA_NEGRAS] = len(self.__barra_negras__)
+        posicion[AFUERA_BLANCAS] = self.__afuera_blancas__
+        posicion[AFUERA_NEGRAS] = self.__afuera_negras__
+        return posicion
+
+    def a_compacto(self):
+        """Devuelve un CompactBoard equivalente a este tablero."""
+        return CompactBoard(self.posicion_compacta())
+
     def reset(self):
         """Inicializa o reinicia el tablero a la posición inicial."""
         # 24 posiciones del tablero, cada una lista de fichas
@@ -93,6 +206,8 @@ class Board:
         # Barras (fichas capturadas)
         self.__barra_blancas__ = []
         self.__barra_negras__ = []
+        self.__afuera_blancas__ = 0
+        self.__afuera_negras__ = 0
 
         # Posiciones iniciales estándar del Backgammon
         # Blancas
@@ -105,13 +220,12 @@ class Board:
         self.__contenedor__[12] = [Ficha("negra", 12) for _ in range(5)]
         self.__contenedor__[7] = [Ficha("negra", 7) for _ in range(3)]
         # La posición 5 debe quedar vacía después del reset según el test
+        self.recalcular_hash()
 
     def mover(self, desde_punto, hasta_punto):
         """Mueve una ficha validando reglas básicas."""
         if self.__contenedor__[desde_punto]:
-            ficha = self.__contenedor__[desde_punto].pop()
-            ficha.mover(hasta_punto)
-            self.__contenedor__[hasta_punto].append(ficha)
+            self.mover_ficha(desde_punto, hasta_punto)
 
     def contar_punto(self, punto):
         """Devuelve la cantidad de fichas en un punto dado."""
@@ -250,4 +364,234 @@ class Board:
     def validate_position(self, position):
         """Alias en inglés para validar_posicion()."""
         return self.validar_posicion(position)
+
+
+class _VistaContenedor:
+    """Vista perezosa de un CompactBoard con la forma de ``get_contenedor()``.
+
+    Cada acceso por índice materializa una lista nueva de fichas a partir del
+    conteo; asignar una lista a un índice actualiza el conteo del tablero.
+    """
+
+    def __init__(self, tablero):
+        self.__tablero__ = tablero
+
+    def __len__(self):
+        return 24
+
+    def __getitem__(self, posicion):
+        if not -24 <= posicion < 24:
+            raise IndexError("posición fuera del tablero")
+        return self.__tablero__.get_fichas(posicion % 24)
+
+    def __setitem__(self, posicion, fichas):
+        self.__tablero__.asignar_punto(posicion, fichas)
+
+    def __iter__(self):
+        for i in range(24):
+            yield self.__tablero__.get_fichas(i)
+
+
+class CompactBoard(Board):
+    """Tablero compacto: cada punto es un conteo int8 con signo.
+
+    Guarda toda la posición en un ``array('b')`` de 28 casilleros (24 puntos,
+    dos barras y dos contadores de fichas afuera) en lugar de objetos ``Ficha``.
+    Mantiene la API de ``Board``; ``get_contenedor`` y ``get_fichas`` crean las
+    fichas bajo demanda para el renderer y los tests.
+    """
+
+    def __init__(self, posicion=None):  # pylint: disable=super-init-not-called
+        self.__posicion__ = array("b", POSICION_INICIAL if posicion is None else posicion)
+        if len(self.__posicion__) != CASILLEROS:
+            raise ValueError(f"La posición compacta debe tener {CASILLEROS} casilleros")
+        self.__zobrist__ = zobrist.hash_posicion(self.__posicion__)
+
+    def recalcular_hash(self):
+        """Recalcula el hash desde cero."""
+        self.__zobrist__ = zobrist.hash_posicion(self.__posicion__)
+        return self.__zobrist__
+
+    def _sumar(self, casillero, cantidad):
+        """Suma ``cantidad`` a un casillero manteniendo el hash al día."""
+        antes = self.__posicion__[casillero]
+        self.__posicion__[casillero] = antes + cantidad
+        self.__zobrist__ ^= zobrist.delta(casillero, antes, antes + cantidad)
+
+    def posicion_compacta(self):
+        """Devuelve una copia del arreglo de 28 casilleros."""
+        return array("b", self.__posicion__)
+
+    def a_compacto(self):
+        """Devuelve una copia independiente del tablero."""
+        copia = CompactBoard.__new__(CompactBoard)
+        copia.__posicion__ = array("b", self.__posicion__)
+        copia.__zobrist__ = self.__zobrist__
+        return copia
+
+    def copiar(self):
+        """Alias de a_compacto() para copiar el tablero."""
+        return self.a_compacto()
+
+    def a_board(self):
+        """Devuelve un Board tradicional (con objetos Ficha) equivalente."""
+        board = Board()
+        for i in range(24):
+            board.asignar_punto(i, self.get_fichas(i))
+        board.__barra_blancas__ = [
+            Ficha("blanca", "barra") for _ in range(self.__posicion__[BARRA_BLANCAS])
+        ]
+        board.__barra_negras__ = [
+            Ficha("negra", "barra") for _ in range(self.__posicion__[BARRA_NEGRAS])
+        ]
+        board.__afuera_blancas__ = self.__posicion__[AFUERA_BLANCAS]
+        board.__afuera_negras__ = self.__posicion__[AFUERA_NEGRAS]
+        board.recalcular_hash()
+        return board
+
+    def get_contenedor(self):
+        """Devuelve una vista perezosa de los 24 puntos."""
+        return _VistaContenedor(self)
+
+    def get_fichas(self, posicion):
+        """Devuelve una lista nueva de fichas en una posición."""
+        cantidad = self.__posicion__[posicion]
+        if cantidad == 0:
+            return []
+        color = "blanca" if cantidad > 0 else "negra"
+        return [Ficha(color, posicion) for _ in range(abs(cantidad))]
+
+    def asignar_punto(self, posicion, fichas):
+        """Reemplaza el contenido de un punto por la lista de fichas dada."""
+        valor = 0
+        if fichas:
+            valor = len(fichas) if fichas[0].obtener_color() == "blanca" else -len(fichas)
+        self._sumar(posicion, valor - self.__posicion__[posicion])
+
+    def contar_fichas(self, posicion):
+        """Cantidad de fichas en una posición."""
+        return abs(self.__posicion__[posicion])
+
+    def color_en_posicion(self, posicion):
+        """Devuelve el color de las fichas en una posición (None si está vacía)."""
+        cantidad = self.__posicion__[posicion]
+        if cantidad == 0:
+            return None
+        return "blanca" if cantidad > 0 else "negra"
+
+    def guardar_ficha(self, posicion, ficha: Ficha):
+        """Guarda una ficha en una posición dada."""
+        ficha.mover(posicion)
+        self._sumar(posicion, 1 if ficha.obtener_color() == "blanca" else -1)
+
+    def _retirar(self, posicion):
+        """Resta una ficha de un punto y devuelve su color (None si está vacío)."""
+        cantidad = self.__posicion__[posicion]
+        if cantidad == 0:
+            return None
+        if cantidad > 0:
+            self._sumar(posicion, -1)
+            return "blanca"
+        self._sumar(posicion, 1)
+        return "negra"
+
+    def quitar_ficha(self, posicion):
+        """Quita una ficha de una posición dada."""
+        color = self._retirar(posicion)
+        return Ficha(color) if color else None
+
+    def mover_ficha(self, origen, destino):
+        """Mueve una ficha de una posición de origen a una de destino."""
+        color = self._retirar(origen)
+        if color is None:
+            raise PosicionVaciaError()
+        self._sumar(destino, 1 if color == "blanca" else -1)
+
+    def enviar_a_barra(self, ficha: Ficha):
+        """Envía una ficha a la barra (fichas capturadas)."""
+        ficha.mover("barra")
+        self._sumar(BARRA_BLANCAS if ficha.obtener_color() == "blanca" else BARRA_NEGRAS, 1)
+
+    def reingresar_desde_barra(self, color, destino):
+        """Reingresa una ficha desde la barra a una posición del tablero."""
+        barra = BARRA_BLANCAS if color == "blanca" else BARRA_NEGRAS
+        if self.__posicion__[barra]:
+            self._sumar(barra, -1)
+            self._sumar(destino, 1 if color == "blanca" else -1)
+
+    def fichas_en_barra(self, color):
+        """Devuelve la cantidad de fichas de un color en la barra."""
+        return self.__posicion__[BARRA_BLANCAS if color == "blanca" else BARRA_NEGRAS]
+
+    def sacar_ficha(self, posicion):
+        """Saca una ficha de una posición y la envía 'afuera'."""
+        color = self._retirar(posicion)
+        if color is None:
+            return None
+        self._sumar(AFUERA_BLANCAS if color == "blanca" else AFUERA_NEGRAS, 1)
+        return Ficha(color, "afuera")
+
+    def devolver_ficha(self, posicion, ficha: Ficha):
+        """Devuelve al tablero una ficha que había salido (deshace sacar_ficha)."""
+        blanca = ficha.obtener_color() == "blanca"
+        self._sumar(AFUERA_BLANCAS if blanca else AFUERA_NEGRAS, -1)
+        self.guardar_ficha(posicion, ficha)
+
+    def fichas_afuera(self, color):
+        """Devuelve la cantidad de fichas de un color sacadas del tablero."""
+        return self.__posicion__[AFUERA_BLANCAS if color == "blanca" else AFUERA_NEGRAS]
+
+    def reset(self):
+        """Reinicia el tablero a la posición inicial estándar."""
+        self.__posicion__ = array("b", POSICION_INICIAL)
+        self.recalcular_hash()
+
+    def mover(self, desde_punto, hasta_punto):
+        """Mueve una ficha si hay alguna en el punto de origen."""
+        if self.__posicion__[desde_punto]:
+            self.mover_ficha(desde_punto, hasta_punto)
+
+    def contar_punto(self, punto):
+        """Devuelve la cantidad de fichas en un punto dado."""
+        return abs(self.__posicion__[punto])
+
+    def mostrar_tablero(self):
+        """Muestra una representación simple del tablero."""
+        self.a_board().mostrar_tablero()
+
+    def hay_fichas_en_posicion(self, posicion, color=None):
+        """Verifica si hay fichas en una posición específica."""
+        if posicion == "barra":
+            if color:
+                return self.fichas_en_barra(color) > 0
+            return self.fichas_en_barra("blanca") > 0 or self.fichas_en_barra("negra") > 0
+
+        if posicion == "afuera":
+            return False
+
+        valido, _ = self.validar_posicion(posicion)
+        if not valido:
+            return False
+
+        if color:
+            return self.color_en_posicion(posicion - 1) == color
+        return self.__posicion__[posicion - 1] != 0
+
+    def posicion_bloqueada(self, posicion, color):
+        """Verifica si una posición está bloqueada para un color específico."""
+        if posicion == "afuera":
+            return False
+
+        valido, _ = self.validar_posicion(posicion)
+        if not valido:
+            return True
+
+        ocupante = self.color_en_posicion(posicion - 1)
+        if ocupante is None or ocupante == color:
+            return False
+        return self.contar_fichas(posicion - 1) >= 2
+
+
+# alias en español
+TableroCompacto = CompactBoard
 # EOF
\ No newline at end of file
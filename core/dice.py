@@ -1,17 +1,53 @@
 """Módulo de dados usado en el juego de backgammon."""
 
 import random
+from array import array
+
+_CARAS = (1, 2, 3, 4, 5, 6)
+
 
 class Dice:
     """Representa un par de dados y sus tiradas."""
 
-    def __init__(self):
-        """Inicializa los dados con valores vacíos."""
+    def __init__(self, rng=None, buffer=0):
+        """Inicializa los dados con valores vacíos.
+
+        ``rng`` puede ser un ``random.Random``, un ``numpy.random.Generator``
+        o None (generador global del módulo ``random``). Con ``buffer`` > 0 se
+        sortean bloques de ``buffer`` tiradas por adelantado y se sirven desde
+        un ``array``, lo que acelera mucho las simulaciones.
+        """
         self.__valores__ = []
+        self.__rng__ = rng or random
+        self.__buffer__ = buffer
+        self.__reserva__ = array("b")
+        self.__indice__ = 0
+
+    def _generar_bloque(self, tiradas):
+        """Sortea ``tiradas`` pares de dados de una sola vez."""
+        rng = self.__rng__
+        if hasattr(rng, "integers"):  # numpy.random.Generator
+            return array("b", rng.integers(1, 7, size=2 * tiradas, dtype="int8").tobytes())
+        return array("b", rng.choices(_CARAS, k=2 * tiradas))
+
+    def _siguiente_par(self):
+        """Devuelve el próximo par de dados sorteado."""
+        if self.__buffer__:
+            if self.__indice__ >= len(self.__reserva__):
+                self.__reserva__ = self._generar_bloque(self.__buffer__)
+                self.__indice__ = 0
+            i = self.__indice__
+            self.__indice__ = i + 2
+            return self.__reserva__[i], self.__reserva__[i + 1]
+        rng = self.__rng__
+        if hasattr(rng, "integers"):
+            d1, d2 = rng.integers(1, 7, size=2)
+            return int(d1), int(d2)
+        return rng.randint(1, 6), rng.randint(1, 6)
 
     def roll(self):
         """Realiza una tirada y actualiza los valores internos."""
-        d1, d2 = random.randint(1, 6), random.randint(1, 6)
+        d1, d2 = self._siguiente_par()
         self.__valores__ = [d1] * 4 if d1 == d2 else [d1, d2]
         return self.__valores__
 
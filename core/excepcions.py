@@ -63,3 +63,7 @@ class ConfiguracionJuegoError(BackgammonError):
 class EstadoJuegoInconsistenteError(BackgammonError):
     """Error cuando el estado del juego se vuelve inconsistente."""
     pass
+
+class BusquedaCanceladaError(BackgammonError):
+    """Error lanzado cuando se cancela una búsqueda de jugadas en curso."""
+    pass
@@ -1,30 +1,64 @@
 """Módulo que orquesta la lógica del juego (turnos, reglas y flujo)."""
 
+from core import bearoff, movegen, zobrist
 from core.dice import Dice
-from core.board import Board
+from core.board import Board, CompactBoard, AFUERA_BLANCAS, AFUERA_NEGRAS
+from core.checker import Ficha
 from core.player import Player
-from core.excepcions import (MovimientoInvalidoError, DadoNoDisponibleError,
-                            PosicionVaciaError, PosicionBloqueadaError,
-                            MovimientoColorError)
+from core.excepcions import (BackgammonError, MovimientoInvalidoError,
+                            DadoNoDisponibleError, PosicionVaciaError, PosicionBloqueadaError,
+                            MovimientoColorError, EntradaInvalidaError,
+                            JuegoTerminadoError, TurnoInvalidoError)
+
+# Fases de la API por pasos (roll / play / end_turn)
+FASE_TIRAR = "tirar"
+FASE_MOVER = "mover"
+FASE_TERMINADA = "terminada"
 
 class Game:
     """Controla el flujo de una partida entre dos jugadores."""
 
-    def __init__(self, player1=None, player2=None, quiet=False):
+    def __init__(self, player1=None, player2=None, quiet=False, compacto=False, rng=None,
+                 dados=None):
         """Inicializa la partida; jugadores son opcionales para facilitar tests.
 
         Parámetros:
         - quiet (bool): Si es True, suprime impresiones de prompts/estado pensadas
           para la UI interactiva. Útil para correr tests y coverage sin ruido.
+        - compacto (bool): Si es True, usa un CompactBoard (conteos int8) en lugar
+          de listas de objetos Ficha. Pensado para análisis con muchos tableros.
+        - rng: generador de números aleatorios para los dados (p. ej.
+          ``random.Random(semilla)``); None usa el generador global.
+        - dados: instancia de Dice a usar (p. ej. con buffer); si se indica,
+          ``rng`` se ignora.
         """
         self.__players__ = (player1 or Player("blanca"), player2 or Player("negra"))
         self.__turn__ = 0
-        self.__dice__ = Dice()
+        self.__rng__ = rng
+        self.__dice__ = dados or Dice(rng)
         self.__dado__ = self.__dice__
-        self.__board__ = Board()
+        self.__board__ = CompactBoard() if compacto else Board()
         self.__tablero__ = self.__board__
         self.__state__ = "initialized"
         self.__quiet__ = quiet
+        # Pila de deshacer: (origen, destino, dado, indice_dado, hubo_captura, turno)
+        self.__historial__ = []
+        # Contador que cambia con cada tirada, movimiento o cambio de turno
+        self.__version__ = 0
+        # Estado de la API por pasos: fase, color ganador y puntos ganados
+        self.__fase__ = FASE_TIRAR
+        self.__ganador__ = None
+        self.__puntos__ = 0
+
+    def get_version(self):
+        """Número que aumenta cada vez que cambia el estado de la partida.
+
+        Permite memorizar resultados derivados del estado (p. ej. si hay
+        movimientos posibles) y recalcularlos solo cuando la versión cambia.
+        Los cambios hechos directamente sobre el tablero o los dados, sin pasar
+        por los métodos de ``Game``, no la modifican.
+        """
+        return self.__version__
 
     def get_turno(self):
         """Devuelve el jugador en turno."""
@@ -33,12 +67,14 @@ class Game:
     def cambiar_turno(self):
         """Cambia el turno al otro jugador."""
         self.__turn__ = (self.__turn__ + 1) % 2
+        self.__version__ += 1
         # No resetear dados aquí - se tiran en turno_completo()
 
     def usar_valor_dado(self, valor):
         """Usa un valor de dado si está disponible."""
         if hasattr(self.__dice__, "__valores__") and valor in self.__dice__.__valores__:
             self.__dice__.__valores__.remove(valor)
+            self.__version__ += 1
             return True
         return False
 
@@ -88,6 +124,118 @@ class Game:
             self.__board__.enviar_a_barra(ficha_capturada)
         self.__board__.mover_ficha(origen, destino)
 
+    def aplicar(self, movimiento):
+        """Aplica un movimiento (origen, destino, dado) y lo apila para deshacer.
+
+        Usa la notación de ``generar_jugadas`` ('barra' como origen, 'off' como
+        destino). No revalida todas las reglas: está pensado para movimientos
+        obtenidos de ``generar_jugadas`` o ``movimientos_legales``.
+        """
+        origen, destino, dado = movimiento
+        color = self.get_turno().get_color()
+        valores = self.__dice__.__valores__
+        if dado not in valores:
+            raise DadoNoDisponibleError()
+        board = self.__board__
+        captura = self._validar_aplicar(origen, destino, color)
+
+        indice = valores.index(dado)
+        del valores[indice]
+        if destino == "off":
+            self.get_turno().sacar_del_tablero(board.sacar_ficha(origen))
+        else:
+            if captura:
+                board.enviar_a_barra(board.quitar_ficha(destino))
+            if origen == "barra":
+                board.reingresar_desde_barra(color, destino)
+            else:
+                board.mover_ficha(origen, destino)
+        self.__historial__.append((origen, destino, dado, indice, captura, self.__turn__))
+        self.__version__ += 1
+
+    def _validar_aplicar(self, origen, destino, color):
+        """Chequeos de ``aplicar`` antes de tocar dados o historial; True si hay captura."""
+        board = self.__board__
+        if origen == "barra":
+            if self.fichas_en_barra(color) == 0:
+                raise MovimientoInvalidoError("No hay fichas en la barra")
+        elif board.color_en_posicion(origen) != color:
+            raise PosicionVaciaError()
+        if destino == "off":
+            return False
+        ocupante = board.color_en_posicion(destino)
+        if ocupante in (None, color):
+            return False
+        if board.contar_fichas(destino) > 1:
+            raise PosicionBloqueadaError()
+        return True
+
+    def aplicar_jugada(self, jugada):
+        """Aplica en orden todos los movimientos de una jugada."""
+        for movimiento in jugada:
+            self.aplicar(movimiento)
+
+    def limpiar_historial(self):
+        """Descarta la pila de deshacer (p. ej. al cerrar un turno)."""
+        self.__historial__.clear()
+
+    def deshacer(self):
+        """Revierte el último movimiento aplicado con ``aplicar``.
+
+        Usa el jugador que hizo el movimiento, aunque el turno haya cambiado.
+        Devuelve el movimiento deshecho o None si la pila está vacía.
+        """
+        if not self.__historial__:
+            return None
+        origen, destino, dado, indice, captura, turno = self.__historial__.pop()
+        jugador = self.__players__[turno]
+        color = jugador.get_color()
+        board = self.__board__
+        if destino == "off":
+            board.devolver_ficha(origen, jugador.devolver_al_tablero())
+        else:
+            if origen == "barra":
+                board.enviar_a_barra(board.quitar_ficha(destino))
+            else:
+                # Argumentos invertidos a propósito: la ficha vuelve de destino a origen
+                board.mover_ficha(destino, origen)  # pylint: disable=arguments-out-of-order
+            if captura:
+                rival = "negra" if color == "blanca" else "blanca"
+                board.reingresar_desde_barra(rival, destino)
+        self.__dice__.__valores__.insert(indice, dado)
+        self.__version__ += 1
+        return (origen, destino, dado)
+
+    def cargar_posicion(self, posicion, turno=0):
+        """Reemplaza el estado por una posición compacta de 28 casilleros.
+
+        ``turno`` es 0 (blancas) o 1 (negras). Se conserva el tipo de tablero
+        (compacto o con fichas) y se descartan los dados y el historial.
+        """
+        compacto = CompactBoard(posicion)
+        if not isinstance(self.__board__, CompactBoard):
+            compacto = compacto.a_board()
+        self.__board__ = self.__tablero__ = compacto
+        for jugador, casillero in zip(self.__players__, (AFUERA_BLANCAS, AFUERA_NEGRAS)):
+            jugador.__fuera__ = [
+                Ficha(jugador.get_color(), "afuera") for _ in range(posicion[casillero])
+            ]
+        self.__turn__ = turno
+        self.__dice__.__valores__ = []
+        self.__historial__.clear()
+        self.__version__ += 1
+        self.__fase__ = FASE_TIRAR
+        self.__ganador__ = None
+        self.__puntos__ = 0
+
+    def posicion_compacta(self):
+        """Copia inmutable (tupla de 28 casilleros) de la posición actual."""
+        return tuple(self.__board__.posicion_compacta())
+
+    def hash_posicion(self):
+        """Hash Zobrist de 64 bits de la posición incluyendo el jugador en turno."""
+        return self.__board__.hash_posicion() ^ zobrist.clave_turno(self.__turn__)
+
     def get_tablero(self):
         """Devuelve el estado del tablero (contenedor de posiciones)."""
         return self.__board__.get_contenedor()
@@ -96,10 +244,25 @@ class Game:
         """Verifica si el jugador en turno ganó (todas sus fichas fuera)."""
         return self.__players__[self.__turn__].fichas_restantes() == 0
 
+    def puntos_victoria(self):
+        """Puntos que gana el jugador en turno: 0 (no ganó), 1, 2 (gammon) o 3 (backgammon)."""
+        if not self.verificar_victoria():
+            return 0
+        rival = "negra" if self.get_turno().get_color() == "blanca" else "blanca"
+        if self.__board__.fichas_afuera(rival) > 0:
+            return 1
+        if self.__board__.fichas_en_barra(rival) > 0:
+            return 3
+        home_ganador = range(0, 6) if rival == "blanca" else range(18, 24)
+        if any(self.__board__.color_en_posicion(i) == rival for i in home_ganador):
+            return 3
+        return 2
+
     def siguiente_turno(self):
         """Avanza el turno al siguiente jugador y prepara la tirada."""
         self.__turn__ = (self.__turn__ + 1) % 2
         self.__state__ = "waiting"
+        self.__version__ += 1
 
     def next_turn(self):
         """Alias en inglés para siguiente_turno()."""
@@ -107,6 +270,7 @@ class Game:
 
     def tirar_dados(self):
         """Realiza la tirada de dados usando la API disponible en Dice."""
+        self.__version__ += 1
         if hasattr(self.__dice__, "tirar"):
             return self.__dice__.tirar()
         if hasattr(self.__dice__, "roll"):
@@ -155,6 +319,21 @@ class Game:
 
         return self.__board__.fichas_en_barra(color) == 0
 
+    def tiradas_esperadas_bearoff(self, base, jugador=None):
+        """Tiradas esperadas para sacar todas las fichas según una base de bearoff.
+
+        ``base`` es una ``core.bearoff.OneSidedBearoff``. Devuelve None fuera de
+        la fase de bearoff o si la posición excede los límites de la base.
+        """
+        jugador = jugador or self.get_turno()
+        if not self.todas_fichas_en_home(jugador):
+            return None
+        posicion = bearoff.posicion_home(self.__board__.posicion_compacta(),
+                                         jugador.get_color(), base.puntos)
+        if posicion is None or not base.contiene(posicion):
+            return None
+        return base.esperanza(posicion)
+
     def ejecutar_movimiento_barra(self, destino, dado):
         """Ejecuta un movimiento desde la barra."""
         color = self.get_turno().get_color()
@@ -198,6 +377,160 @@ class Game:
             return True, "Ficha sacada del tablero"
         return False, f"No hay fichas en posición {origen + 1}"
 
+    def generar_jugadas(self, dados=None):
+        """Enumera las jugadas legales completas del jugador en turno.
+
+        Aplica las reglas de barra primero, usar ambos dados (o los cuatro en
+        dobles), usar el dado mayor y sacar con dado mayor. Si ``dados`` es
+        None usa los dados disponibles. Devuelve tuplas
+        ``(jugada, posicion_resultante)`` sin posiciones repetidas. El
+        resultado sale de la cache compartida ``movegen.CACHE``: no modificarlo.
+        """
+        if dados is None:
+            dados = self.get_dados_disponibles()
+        return self._consultar_cache(movegen.generar_jugadas_cacheadas, dados)
+
+    def movimientos_legales(self, dados=None):
+        """Movimientos (origen, destino, dado) con los que puede empezar una jugada legal."""
+        if dados is None:
+            dados = self.get_dados_disponibles()
+        return self._consultar_cache(movegen.movimientos_legales_cacheados, dados)
+
+    def hay_movimientos_posibles(self, dados=None):
+        """True si el jugador en turno puede mover con alguno de los dados."""
+        if dados is None:
+            dados = self.get_dados_disponibles()
+        if not dados:
+            return False
+        return self._consultar_cache(movegen.hay_movimientos_cacheado, dados)
+
+    def _consultar_cache(self, funcion, dados):
+        """Consulta ``funcion`` de movegen con el hash incremental del tablero.
+
+        La posición compacta solo se construye si el resultado no está en la cache.
+        """
+        board = self.__board__
+        return funcion(board.posicion_compacta, self.get_turno().get_color(), dados,
+                       hash_posicion=board.hash_posicion())
+
+    # --- API por pasos sin entrada/salida (servidores, simuladores y UIs) ---
+    def _exigir_fase(self, fase):
+        """Lanza la excepción que corresponde si la partida no está en ``fase``."""
+        if self.__fase__ == FASE_TERMINADA:
+            raise JuegoTerminadoError("La partida ya terminó")
+        if self.__fase__ != fase:
+            if fase == FASE_TIRAR:
+                raise TurnoInvalidoError("Ya se tiraron los dados en este turno")
+            raise TurnoInvalidoError("Primero hay que tirar los dados")
+
+    def roll(self, dados=None):
+        """Tira los dados del jugador en turno y devuelve ``status()``.
+
+        ``dados`` permite fijar la tirada ``(d1, d2)`` (p. ej. dados enviados por
+        un cliente o una partida reproducida); los dobles se expanden a cuatro.
+        """
+        self._exigir_fase(FASE_TIRAR)
+        if dados is None:
+            self.tirar_dados()
+        else:
+            if len(dados) != 2 or not all(d in (1, 2, 3, 4, 5, 6) for d in dados):
+                raise EntradaInvalidaError("La tirada debe ser un par de valores entre 1 y 6")
+            d1, d2 = dados
+            self.__dice__.__valores__ = [d1] * 4 if d1 == d2 else [d1, d2]
+            self.__version__ += 1
+        self.__historial__.clear()
+        self.__fase__ = FASE_MOVER
+        return self.status()
+
+    def legal_plays(self):
+        """Jugadas completas legales con los dados restantes (ver ``generar_jugadas``).
+
+        Fuera de la fase de mover devuelve una lista vacía.
+        """
+        if self.__fase__ != FASE_MOVER:
+            return []
+        return self.generar_jugadas()
+
+    def play(self, move):
+        """Aplica un movimiento ``(origen, destino, dado)`` o una jugada completa.
+
+        Cada movimiento tiene que estar en ``movimientos_legales()`` en el
+        momento de aplicarlo, así se respetan todas las reglas (barra, usar
+        ambos dados, dado mayor). Una jugada completa se aplica entera o no se
+        aplica: si un movimiento es ilegal se deshacen los anteriores y se
+        lanza ``MovimientoInvalidoError``. Devuelve ``status()``.
+        """
+        self._exigir_fase(FASE_MOVER)
+        if not isinstance(move, (tuple, list)):
+            raise EntradaInvalidaError("Se esperaba un movimiento o una lista de movimientos")
+        jugada = move if move and isinstance(move[0], (tuple, list)) else (move,)
+        aplicados = 0
+        try:
+            for movimiento in jugada:
+                movimiento = tuple(movimiento)
+                if movimiento not in self.movimientos_legales():
+                    raise MovimientoInvalidoError(f"Movimiento ilegal: {movimiento}")
+                self.aplicar(movimiento)
+                aplicados += 1
+                puntos = self.puntos_victoria()
+                if puntos:
+                    self.__fase__ = FASE_TERMINADA
+                    self.__ganador__ = self.get_turno().get_color()
+                    self.__puntos__ = puntos
+                    break
+        except MovimientoInvalidoError:
+            for _ in range(aplicados):
+                self.deshacer()
+            raise
+        return self.status()
+
+    def end_turn(self, forzar=False):
+        """Cierra el turno y se lo pasa al rival; devuelve ``status()``.
+
+        Solo se permite cuando no queda ningún movimiento legal con los dados
+        restantes (se usaron todos o los que quedan no se pueden jugar).
+        ``forzar=True`` abandona los dados que queden aunque se puedan jugar
+        (p. ej. el CLI tras demasiadas entradas inválidas).
+        """
+        self._exigir_fase(FASE_MOVER)
+        if not forzar and self.movimientos_legales():
+            raise MovimientoInvalidoError("Todavía hay movimientos legales con los dados restantes")
+        self.__dice__.__valores__ = []
+        self.__historial__.clear()
+        self.cambiar_turno()
+        self.__fase__ = FASE_TIRAR
+        return self.status()
+
+    def status(self):
+        """Resumen serializable del estado de la partida (sin efectos secundarios)."""
+        return {
+            "turno": self.get_turno().get_color(),
+            "fase": self.__fase__,
+            "dados": self.get_dados_disponibles(),
+            "posicion": self.posicion_compacta(),
+            "ganador": self.__ganador__,
+            "puntos": self.__puntos__,
+            "version": self.__version__,
+        }
+
+    def cargar_estado(self, posicion, turno, fase=FASE_TIRAR, dados=(), ganador=None,
+                      puntos=0, version=None):
+        """Restaura un estado de la API por pasos (inversa de ``status()``).
+
+        Como ``cargar_posicion`` pero además fija la fase, los dados restantes,
+        el ganador y los puntos, así una partida guardada a mitad de turno
+        sigue igual. ``version`` (si se indica) reemplaza al contador.
+        """
+        if fase not in (FASE_TIRAR, FASE_MOVER, FASE_TERMINADA):
+            raise EntradaInvalidaError(f"Fase desconocida: {fase}")
+        self.cargar_posicion(posicion, turno)
+        self.__dice__.__valores__ = list(dados)
+        self.__fase__ = fase
+        self.__ganador__ = ganador
+        self.__puntos__ = puntos
+        if version is not None:
+            self.__version__ = version
+
     def mostrar_dados_disponibles(self):
         """Devuelve una cadena con los dados disponibles."""
         dice = self.__dice__
@@ -228,7 +561,7 @@ class Game:
             ]
 
         opciones.extend([
-            "- Pasar turno: 'pass'",
+            "- Pasar turno (si no quedan movimientos legales): 'pass'",
             "- Salir: 'quit'",
         ])
         return opciones
@@ -269,22 +602,12 @@ class Game:
             return None, "Error: Ingrese números válidos"
 
     def ejecutar_movimiento_completo(self, origen, destino, dado):
-        """Ejecuta un movimiento completo y devuelve el resultado."""
+        """Aplica un movimiento con ``play`` y devuelve (éxito, mensaje)."""
         try:
-            if origen == 'barra':
-                exito, mensaje = self.ejecutar_movimiento_barra(destino, dado)
-            elif destino == 'off':
-                exito, mensaje = self.ejecutar_bearing_off(origen, dado)
-            else:
-                self.mover(origen, destino, dado)
-                return True, "Movimiento realizado exitosamente"
-
-            return exito, f"{'OK' if exito else 'ERROR'} {mensaje}"
-
-        except (MovimientoInvalidoError, DadoNoDisponibleError,
-                PosicionVaciaError, PosicionBloqueadaError,
-                MovimientoColorError) as e:
+            self.play((origen, destino, dado))
+        except BackgammonError as e:
             return False, f"ERROR: {e}"
+        return True, "Movimiento realizado exitosamente"
 
     def verificar_fin_juego_completo(self):
         """Verifica si el juego ha terminado y muestra el mensaje correspondiente."""
@@ -321,19 +644,21 @@ class Game:
             return 'quit'
 
     def turno_completo(self):
-        """Ejecuta un turno completo del jugador actual."""
-        self.mostrar_estado_juego()
+        """Ejecuta un turno completo del jugador actual sobre la API por pasos.
 
-        # Limpiar dados anteriores y tirar nuevos dados
-        self.__dice__ = Dice()  # Resetear dados al inicio del turno
-        self.tirar_dados()
+        Tira con ``roll``, aplica cada movimiento ingresado con ``play`` y
+        cierra con ``end_turn``; solo agrega la entrada y los mensajes del CLI.
+        Devuelve True al pasar el turno, 'fin' si la partida terminó o 'quit'.
+        """
+        self.mostrar_estado_juego()
+        self.roll()
         print(self.mostrar_dados_disponibles())
 
-        if not self.quedan_movimientos():
+        if not self.quedan_movimientos() or self._dados_sin_jugadas():
             print("No hay movimientos disponibles. Pasando turno...")
+            self.end_turn()
             return True
 
-        movimientos_realizados = False
         intentos_invalidos = 0  # Solo contar intentos inválidos
         max_intentos_invalidos = 10  # Límite para entradas inválidas
 
@@ -344,52 +669,44 @@ class Game:
             if movimiento == 'quit':
                 return 'quit'
             if movimiento == 'pass':
-                print("Pasando turno...")
-                # Limpiar todos los dados al pasar turno
-                if hasattr(self.__dice__, '__valores__'):
-                    dados_antes = self.__dice__.__valores__.copy()
-                    self.__dice__.__valores__.clear()
+                dados_antes = self.get_dados_disponibles()
+                try:
+                    self.end_turn()
+                except MovimientoInvalidoError as e:
+                    error = f"ERROR: {e}"
+                else:
+                    print("Pasando turno...")
                     print(f"Dados limpiados: {dados_antes} -> []")
-                # Verificar victoria antes de terminar el turno
-                if self.verificar_fin_juego_completo():
-                    return 'fin'
-                # Asegurarse de que no quedan movimientos
-                print("Turno completado con 'pass'")
-                return True  # Terminar turno inmediatamente
-            if error:
-                print(error)
-                intentos_invalidos += 1
-                if intentos_invalidos >= max_intentos_invalidos:
-                    print(f"ERROR: Demasiados intentos inválidos "
-                          f"({max_intentos_invalidos}). Pasando turno...")
+                    print("Turno completado con 'pass'")
                     return True
-                continue
-            if movimiento is None:
-                intentos_invalidos += 1
-                if intentos_invalidos >= max_intentos_invalidos:
-                    print(f"ERROR: Demasiados intentos inválidos "
-                          f"({max_intentos_invalidos}). Pasando turno...")
-                    return True
-                continue
-
-            origen, destino, dado = movimiento
-            exito, mensaje = self.ejecutar_movimiento_completo(origen, destino, dado)
-            print(mensaje)
-
-            if exito:
-                movimientos_realizados = True
-                if self.verificar_fin_juego_completo():
-                    return 'fin'
-
-            if movimientos_realizados:
-                print(self.mostrar_dados_disponibles())
-
-        # Verificar victoria al final del turno
-        if self.verificar_fin_juego_completo():
-            return 'fin'
+            elif movimiento is not None:
+                exito, error = self.ejecutar_movimiento_completo(*movimiento)
+                if exito:
+                    print(error)
+                    if self.verificar_fin_juego_completo():
+                        return 'fin'
+                    print(self.mostrar_dados_disponibles())
+                    if self._dados_sin_jugadas():
+                        print("No quedan movimientos legales con los dados restantes.")
+                        break
+                    continue
 
+            if error:
+                print(error)
+            intentos_invalidos += 1
+            if intentos_invalidos >= max_intentos_invalidos:
+                print(f"ERROR: Demasiados intentos inválidos "
+                      f"({max_intentos_invalidos}). Pasando turno...")
+                self.end_turn(forzar=True)
+                return True
+
+        self.end_turn()
         return True
 
+    def _dados_sin_jugadas(self):
+        """True si quedan dados pero ninguno se puede jugar."""
+        return bool(self.get_dados_disponibles()) and not self.movimientos_legales()
+
     def validar_entrada_movimiento(self, entrada):
         """Valida que la entrada del usuario sea correcta para un movimiento."""
         if not entrada or not isinstance(entrada, str):
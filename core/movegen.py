@@ -0,0 +1,328 @@
+"""Generador de jugadas legales para una tirada completa.
+
+Trabaja sobre la posición compacta de 28 casilleros de ``core.board``. Para
+no duplicar la lógica por color, cada búsqueda convierte la posición a una
+lista relativa al jugador en turno:
+
+- ``rel[0]``: fichas propias ya sacadas.
+- ``rel[1..24]``: puntos vistos por quien mueve (positivo = propias,
+  negativo = rivales); las fichas avanzan de 24 hacia 1.
+- ``rel[25]``: fichas propias en la barra.
+- ``rel[26]``: fichas rivales en la barra.
+
+Una jugada es una tupla de movimientos ``(origen, destino, dado)`` con la
+misma notación que ``Game.ejecutar_movimiento_completo``: índices 0-23,
+``'barra'`` como origen y ``'off'`` como destino.
+"""
+
+import threading
+from collections import OrderedDict
+
+from core import zobrist
+from core.board import BARRA_BLANCAS, BARRA_NEGRAS, AFUERA_BLANCAS, AFUERA_NEGRAS
+
+_BARRA = 25
+_BARRA_RIVAL = 26
+
+
+def _a_relativa(posicion, color):
+    """Convierte una posición absoluta a la lista relativa de quien mueve."""
+    if color == "blanca":
+        rel = [posicion[AFUERA_BLANCAS]]
+        rel.extend(posicion[23::-1])
+        rel.append(posicion[BARRA_BLANCAS])
+        rel.append(posicion[BARRA_NEGRAS])
+    else:
+        rel = [posicion[AFUERA_NEGRAS]]
+        rel.extend(-v for v in posicion[:24])
+        rel.append(posicion[BARRA_NEGRAS])
+        rel.append(posicion[BARRA_BLANCAS])
+    return rel
+
+
+def _a_absoluta(rel, color, posicion):
+    """Arma la posición absoluta (tupla) a partir de la relativa."""
+    if color == "blanca":
+        puntos = rel[24:0:-1]
+        barras = (rel[_BARRA], rel[_BARRA_RIVAL], rel[0], posicion[AFUERA_NEGRAS])
+    else:
+        puntos = [-v for v in rel[1:25]]
+        barras = (rel[_BARRA_RIVAL], rel[_BARRA], posicion[AFUERA_BLANCAS], rel[0])
+    return tuple(puntos) + barras
+
+
+def _traducir(movimiento, color):
+    """Traduce un movimiento relativo ``(desde, hasta, dado)`` a notación absoluta."""
+    desde, hasta, dado = movimiento
+    if color == "blanca":
+        origen = "barra" if desde == _BARRA else 24 - desde
+        destino = "off" if hasta <= 0 else 24 - hasta
+    else:
+        origen = "barra" if desde == _BARRA else desde - 1
+        destino = "off" if hasta <= 0 else hasta - 1
+    return (origen, destino, dado)
+
+
+def _movimientos_simples(rel, dado, tope=_BARRA):
+    """Lista de movimientos relativos ``(desde, hasta, dado)`` para un solo dado.
+
+    ``tope`` limita el punto de origen (se usa para recorrer los dobles en un
+    único orden canónico, de los puntos altos a los bajos).
+    """
+    if rel[_BARRA]:
+        entrada = _BARRA - dado
+        return [(_BARRA, entrada, dado)] if rel[entrada] >= -1 else []
+
+    movimientos = []
+    alto = 0
+    for punto in range(24, 0, -1):
+        if rel[punto] > 0:
+            alto = punto
+            break
+    puede_sacar = alto <= 6
+    for punto in range(min(alto, tope), 0, -1):
+        if rel[punto] <= 0:
+            continue
+        hasta = punto - dado
+        if hasta > 0:
+            if rel[hasta] >= -1:
+                movimientos.append((punto, hasta, dado))
+        elif puede_sacar and (hasta == 0 or punto == alto):
+            # Sacar con dado exacto, o con dado mayor desde el punto más alto
+            movimientos.append((punto, 0, dado))
+    return movimientos
+
+
+def _aplicar(rel, movimiento):
+    """Devuelve una nueva lista relativa con el movimiento aplicado."""
+    desde, hasta, _ = movimiento
+    nueva = rel[:]
+    nueva[desde] -= 1
+    if hasta <= 0:
+        nueva[0] += 1
+    elif nueva[hasta] == -1:
+        nueva[hasta] = 1
+        nueva[_BARRA_RIVAL] += 1
+    else:
+        nueva[hasta] += 1
+    return nueva
+
+
+def _ordenes(dados):
+    """Órdenes distintos en los que pueden usarse los dados."""
+    dados = tuple(dados)
+    if len(dados) == 2 and dados[0] != dados[1]:
+        return (dados, dados[::-1])
+    return (dados,)
+
+
+def _registrar(rel, secuencia, finales):
+    """Guarda una posición terminal, conservando la secuencia más larga.
+
+    Si dos jugadas de un solo movimiento llegan a la misma posición (p. ej.
+    sacar la última ficha con cualquiera de los dados) se conserva la del dado
+    mayor, que es la que deja pasar la regla del dado mayor en
+    ``_filtrar_reglas``.
+    """
+    clave_final = tuple(rel)
+    anterior = finales.get(clave_final)
+    if (anterior is None or len(anterior[0]) < len(secuencia)
+            or (len(secuencia) == len(anterior[0]) == 1
+                and secuencia[0][2] > anterior[0][0][2])):
+        finales[clave_final] = (tuple(secuencia), rel)
+
+
+def _buscar(rel, orden, paso, secuencia, visitados, finales, dobles, tope=_BARRA):
+    """Recorre en profundidad las jugadas; guarda cada posición terminal.
+
+    Con dobles el orden de los movimientos no importa, así que solo se
+    exploran secuencias con orígenes no crecientes (``tope``).
+    """
+    if paso < len(orden):
+        clave = (paso, tope, tuple(rel))
+        if clave in visitados:
+            return
+        visitados.add(clave)
+        movimientos = _movimientos_simples(rel, orden[paso], tope)
+        if movimientos:
+            ultimo = paso == len(orden) - 1
+            for movimiento in movimientos:
+                secuencia.append(movimiento)
+                if ultimo:
+                    # Último dado: registrar sin otro nivel de recursión
+                    _registrar(_aplicar(rel, movimiento), secuencia, finales)
+                else:
+                    _buscar(_aplicar(rel, movimiento), orden, paso + 1, secuencia,
+                            visitados, finales, dobles,
+                            movimiento[0] if dobles else _BARRA)
+                secuencia.pop()
+            return
+    _registrar(rel, secuencia, finales)
+
+
+def _filtrar_reglas(candidatos, dados):
+    """Aplica las reglas de usar la mayor cantidad de dados y el dado mayor.
+
+    ``candidatos`` son tuplas ``(dados_usados, primer_dado, dato)``; devuelve
+    los ``dato`` que cumplen las reglas.
+    """
+    if not candidatos:
+        return []
+    maximo = max(c[0] for c in candidatos)
+    candidatos = [c for c in candidatos if c[0] == maximo]
+    if maximo == 1 and len(dados) == 2 and dados[0] != dados[1]:
+        mayor = max(dados)
+        con_mayor = [c for c in candidatos if c[1] == mayor]
+        if con_mayor:
+            candidatos = con_mayor
+    return [c[2] for c in candidatos]
+
+
+def generar_jugadas(posicion, color, dados):
+    """Enumera las jugadas legales completas para una tirada.
+
+    Devuelve una lista de tuplas ``(jugada, posicion_resultante)`` sin
+    posiciones repetidas. ``posicion_resultante`` es una tupla de 28
+    casilleros. Si no hay ningún movimiento posible devuelve
+    ``[((), tuple(posicion))]``: la única jugada es pasar.
+    """
+    if not dados:
+        return [((), tuple(posicion))]
+    rel = _a_relativa(posicion, color)
+    finales = {}
+    dobles = len(dados) > 2 or (len(dados) == 2 and dados[0] == dados[1])
+    for orden in _ordenes(dados):
+        _buscar(rel, orden, 0, [], set(), finales, dobles)
+
+    candidatos = [(len(secuencia), secuencia[0][2] if secuencia else 0, (secuencia, final))
+                  for secuencia, final in finales.values()]
+    jugadas = []
+    for secuencia, final in _filtrar_reglas(candidatos, tuple(dados)):
+        jugada = tuple(_traducir(m, color) for m in secuencia)
+        jugadas.append((jugada, _a_absoluta(final, color, posicion)))
+    return jugadas
+
+
+def _longitud_maxima(rel, dados):
+    """Cantidad máxima de dados utilizables desde ``rel`` (corta al llegar al tope)."""
+    mejor = 0
+    for orden in _ordenes(dados):
+        pendientes = [(rel, 0)]
+        while pendientes:
+            estado, paso = pendientes.pop()
+            if paso > mejor:
+                mejor = paso
+                if mejor == len(dados):
+                    return mejor
+            if paso < len(orden):
+                for movimiento in _movimientos_simples(estado, orden[paso]):
+                    pendientes.append((_aplicar(estado, movimiento), paso + 1))
+    return mejor
+
+
+def movimientos_legales(posicion, color, dados):
+    """Movimientos individuales con los que puede empezar una jugada legal.
+
+    Útil para la UI: a diferencia de ``generar_jugadas`` no deduplica por
+    posición final, así que incluye todos los primeros pasos válidos.
+    """
+    if not dados:
+        return []
+    rel = _a_relativa(posicion, color)
+    dados = tuple(dados)
+    candidatos = []
+    for dado in set(dados):
+        restantes = list(dados)
+        restantes.remove(dado)
+        for movimiento in _movimientos_simples(rel, dado):
+            largo = 1 + _longitud_maxima(_aplicar(rel, movimiento), restantes)
+            candidatos.append((largo, dado, movimiento))
+    return [_traducir(m, color) for m in _filtrar_reglas(candidatos, dados)]
+
+
+def hay_movimientos(posicion, color, dados):
+    """True si existe al menos un movimiento legal con alguno de los dados."""
+    rel = _a_relativa(posicion, color)
+    return any(_movimientos_simples(rel, dado) for dado in set(dados))
+
+
+class CacheJugadas:
+    """Cache LRU acotada de resultados del generador, compartida entre hilos.
+
+    Las claves son ``(tipo, hash Zobrist, color, dados)``; los dados van en
+    el orden recibido porque ese orden fija el de los movimientos generados.
+    Los valores guardados se comparten entre quienes consultan, así que no
+    deben modificarse.
+    """
+
+    def __init__(self, maximo=4096):
+        self.maximo = maximo
+        self.__entradas__ = OrderedDict()
+        self.__candado__ = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self):
+        return len(self.__entradas__)
+
+    def obtener(self, clave, calcular):
+        """Devuelve el valor de ``clave``; si falta lo calcula con ``calcular()``."""
+        with self.__candado__:
+            if clave in self.__entradas__:
+                self.__entradas__.move_to_end(clave)
+                self.aciertos += 1
+                return self.__entradas__[clave]
+            self.fallos += 1
+        valor = calcular()
+        with self.__candado__:
+            self.__entradas__[clave] = valor
+            if len(self.__entradas__) > self.maximo:
+                self.__entradas__.popitem(last=False)
+        return valor
+
+    def tasa_aciertos(self):
+        """Proporción de consultas resueltas desde la cache."""
+        consultas = self.aciertos + self.fallos
+        return self.aciertos / consultas if consultas else 0.0
+
+    def limpiar(self):
+        """Vacía la cache y reinicia las estadísticas."""
+        with self.__candado__:
+            self.__entradas__.clear()
+            self.aciertos = self.fallos = 0
+
+
+CACHE = CacheJugadas()
+
+
+def _consultar(funcion, posicion, color, dados, cache, hash_posicion):
+    """Resuelve ``funcion(posicion, color, dados)`` pasando por la cache LRU.
+
+    Con ``hash_posicion`` (el Zobrist que un tablero ya mantiene) no se
+    recalcula el hash, y ``posicion`` puede ser una función sin argumentos que
+    devuelve la posición: solo se llama si falta el resultado en la cache.
+    """
+    cache = CACHE if cache is None else cache
+    if hash_posicion is None:
+        hash_posicion = zobrist.hash_posicion(posicion)
+    clave = (funcion.__name__, hash_posicion, color, tuple(dados))
+
+    def calcular():
+        return funcion(posicion() if callable(posicion) else posicion, color, dados)
+
+    return cache.obtener(clave, calcular)
+
+
+def generar_jugadas_cacheadas(posicion, color, dados, cache=None, hash_posicion=None):
+    """Como ``generar_jugadas`` pero reutilizando resultados de la cache."""
+    return _consultar(generar_jugadas, posicion, color, dados, cache, hash_posicion)
+
+
+def movimientos_legales_cacheados(posicion, color, dados, cache=None, hash_posicion=None):
+    """Como ``movimientos_legales`` pero reutilizando resultados de la cache."""
+    return _consultar(movimientos_legales, posicion, color, dados, cache, hash_posicion)
+
+
+def hay_movimientos_cacheado(posicion, color, dados, cache=None, hash_posicion=None):
+    """Como ``hay_movimientos`` pero reutilizando resultados de la cache."""
+    return _consultar(hay_movimientos, posicion, color, dados, cache, hash_posicion)
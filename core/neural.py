@@ -0,0 +1,132 @@
+"""Evaluador de posiciones con una red neuronal estilo TD-Gammon (NumPy).
+
+La red es un perceptrón de una capa oculta con salidas sigmoides. Recibe la
+codificación de una posición vista por el jugador que acaba de mover (el
+rival está por tirar) y devuelve cinco probabilidades:
+
+    [gana, gana gammon, gana backgammon, pierde gammon, pierde backgammon]
+
+La inferencia trabaja por lotes: todas las jugadas candidatas de una tirada se
+codifican en una matriz y se evalúan con una sola multiplicación por capa.
+"""
+
+import numpy as np
+
+from core.board import BARRA_BLANCAS, BARRA_NEGRAS, AFUERA_BLANCAS, AFUERA_NEGRAS
+
+# 4 unidades por punto y por jugador, más barra y fichas afuera de cada uno
+ENTRADAS = 4 * 24 * 2 + 4
+SALIDAS = 5
+OCULTAS = 80
+
+
+def codificar(posiciones, color):
+    """Codifica un lote de posiciones compactas desde el punto de vista de ``color``.
+
+    Devuelve una matriz ``float32`` de forma ``(N, ENTRADAS)``. Cada punto se
+    describe con las unidades de TD-Gammon (al menos 1, 2 y 3 fichas, y el
+    excedente sobre 3 dividido 2); los puntos se ordenan en el sentido de
+    avance de cada jugador, así la red no distingue colores.
+    """
+    pos = np.asarray(posiciones, dtype=np.int8).reshape(-1, 28).astype(np.float32)
+    puntos = pos[:, :24]
+    if color == "blanca":
+        propias = np.maximum(puntos[:, ::-1], 0)
+        rivales = np.maximum(-puntos, 0)
+        barras = pos[:, [BARRA_BLANCAS, BARRA_NEGRAS]]
+        afuera = pos[:, [AFUERA_BLANCAS, AFUERA_NEGRAS]]
+    else:
+        propias = np.maximum(-puntos, 0)
+        rivales = np.maximum(puntos[:, ::-1], 0)
+        barras = pos[:, [BARRA_NEGRAS, BARRA_BLANCAS]]
+        afuera = pos[:, [AFUERA_NEGRAS, AFUERA_BLANCAS]]
+    bloques = [_unidades(propias), _unidades(rivales), barras / 2, afuera / 15]
+    return np.concatenate(bloques, axis=1)
+
+
+def _unidades(conteos):
+    """Unidades de TD-Gammon para una matriz de conteos ``(N, 24)``."""
+    unidades = np.stack([
+        conteos >= 1,
+        conteos >= 2,
+        conteos >= 3,
+        np.maximum(conteos - 3, 0) / 2,
+    ], axis=2).astype(np.float32)
+    return unidades.reshape(len(conteos), -1)
+
+
+def _sigmoide(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def equidad(probabilidades):
+    """Equidad (en puntos) a partir de la matriz ``(N, 5)`` de probabilidades."""
+    p = np.asarray(probabilidades)
+    return 2 * p[:, 0] - 1 + p[:, 1] - p[:, 3] + p[:, 2] - p[:, 4]
+
+
+class NeuralEvaluator:
+    """Red de una capa oculta usable como evaluador de ``core.ai.Expectimax``.
+
+    ``evaluador(posicion, color)`` evalúa una posición suelta y
+    ``evaluar_lote(posiciones, color)`` un lote completo; ``Expectimax`` usa
+    el segundo cuando está disponible.
+    """
+
+    def __init__(self, ocultas=OCULTAS, rng=None, pesos=None):
+        """Crea la red con pesos aleatorios pequeños o con ``pesos`` dados.
+
+        ``pesos`` es una tupla ``(w1, b1, w2, b2)``; ``rng`` es un
+        ``numpy.random.Generator`` para la inicialización.
+        """
+        if pesos is None:
+            rng = rng or np.random.default_rng()
+            pesos = (
+                rng.normal(0, 0.1, (ENTRADAS, ocultas)),
+                np.zeros(ocultas),
+                rng.normal(0, 0.1, (ocultas, SALIDAS)),
+                np.zeros(SALIDAS),
+            )
+        w1, b1, w2, b2 = (np.asarray(p, dtype=np.float32) for p in pesos)
+        if w1.shape[0] != ENTRADAS or w2.shape != (w1.shape[1], SALIDAS) \
+                or b1.shape != (w1.shape[1],) or b2.shape != (SALIDAS,):
+            raise ValueError("Las formas de los pesos no corresponden a la red")
+        self.w1, self.b1, self.w2, self.b2 = w1, b1, w2, b2
+
+    @classmethod
+    def cargar(cls, ruta):
+        """Crea un evaluador con los pesos de un archivo ``.npz``."""
+        with np.load(ruta) as datos:
+            return cls(pesos=(datos["w1"], datos["b1"], datos["w2"], datos["b2"]))
+
+    def guardar(self, ruta):
+        """Guarda los pesos en un archivo ``.npz``."""
+        np.savez(ruta, w1=self.w1, b1=self.b1, w2=self.w2, b2=self.b2)
+
+    def propagar(self, entradas):
+        """Pasada hacia adelante; devuelve (ocultas, salidas) para un lote."""
+        ocultas = _sigmoide(entradas @ self.w1 + self.b1)
+        return ocultas, _sigmoide(ocultas @ self.w2 + self.b2)
+
+    def probabilidades(self, posiciones, color):
+        """Matriz ``(N, 5)`` de probabilidades para ``color``."""
+        return self.propagar(codificar(posiciones, color))[1]
+
+    def evaluar_lote(self, posiciones, color):
+        """Equidades de un lote de posiciones para ``color`` (lista de floats)."""
+        if len(posiciones) == 0:
+            return []
+        return equidad(self.probabilidades(posiciones, color)).tolist()
+
+    def __call__(self, posicion, color):
+        """Equidad de una sola posición para ``color``."""
+        return self.evaluar_lote([posicion], color)[0]
+
+    def elegir_jugada(self, game, jugadas):
+        """Interfaz de agente: la jugada cuya posición final tiene mayor equidad."""
+        valores = self.evaluar_lote([final for _, final in jugadas],
+                                    game.get_turno().get_color())
+        return jugadas[int(np.argmax(valores))]
+
+
+EvaluadorNeuronal = NeuralEvaluator
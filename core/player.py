@@ -47,6 +47,14 @@ class Player:
         ficha.mover("afuera")
         self.__fuera__.append(ficha)
 
+    def devolver_al_tablero(self):
+        """Quita la última ficha de la zona de fuera (deshace sacar_del_tablero)."""
+        if self.__fuera__:
+            ficha = self.__fuera__.pop()
+            ficha.mover(None)
+            return ficha
+        return None
+
     def fichas_fuera(self):
         """Devuelve la cantidad de fichas que el jugador tiene fuera del tablero."""
         return len(self.__fuera__)
@@ -0,0 +1,190 @@
+"""Rollouts Monte Carlo con reducción de varianza.
+
+Juega una posición hasta el final miles de veces con un agente de
+``core.simulate.AGENTES`` y devuelve la equidad del jugador en turno con su
+error estándar. Técnicas de reducción de varianza:
+
+- Primera tirada estratificada: la unidad ``i`` empieza con la tirada
+  ``PRIMERAS_TIRADAS[i % 36]``, así cada bloque de 36 cubre todas las tiradas.
+- Dados antitéticos: cada unidad es un par de partidas, la segunda con los
+  dados espejados (``7 - d``) de la primera; se promedia el par.
+
+Las unidades se reparten en shards deterministas (semillas derivadas de
+``(semilla, indice_unidad)``) que pueden correr en un ProcessPoolExecutor.
+Con ``error_objetivo`` el rollout se corta apenas el error estándar lo alcanza.
+"""
+
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from core.dice import Dice
+from core.game import Game
+from core.simulate import AGENTES, jugar_partida
+
+# Las 36 tiradas ordenadas, para estratificar la primera tirada
+PRIMERAS_TIRADAS = tuple((d1, d2) for d1 in range(1, 7) for d2 in range(1, 7))
+TAMANO_SHARD = 72
+
+
+class DadosRollout(Dice):
+    """Dados con primera tirada fija y opción de espejar todas las tiradas."""
+
+    def __init__(self, rng=None, primera=None, antitetico=False):
+        super().__init__(rng)
+        self.__primera__ = primera
+        self.__antitetico__ = antitetico
+
+    def _siguiente_par(self):
+        """Devuelve la tirada fija pendiente o la siguiente (espejada si corresponde)."""
+        if self.__primera__ is not None:
+            par, self.__primera__ = self.__primera__, None
+        else:
+            par = super()._siguiente_par()
+        if self.__antitetico__:
+            return 7 - par[0], 7 - par[1]
+        return par
+
+
+class ResultadoRollout:
+    """Acumula los resultados de un rollout, por unidad de muestreo."""
+
+    def __init__(self):
+        self.unidades = 0
+        self.partidas = 0
+        self.suma = 0.0
+        self.suma_cuadrados = 0.0
+        self.victorias = 0
+        self.gammons = 0
+        self.backgammons = 0
+        self.segundos = 0.0
+
+    def agregar_partida(self, equidad):
+        """Registra una partida: ``equidad`` es ±1, ±2 o ±3 para quien movía."""
+        self.partidas += 1
+        if equidad > 0:
+            self.victorias += 1
+        if abs(equidad) == 2:
+            self.gammons += 1
+        elif abs(equidad) == 3:
+            self.backgammons += 1
+
+    def agregar_unidad(self, valor):
+        """Registra el valor de una unidad (una partida o el promedio de un par)."""
+        self.unidades += 1
+        self.suma += valor
+        self.suma_cuadrados += valor * valor
+
+    def combinar(self, otro):
+        """Suma al resultado los contadores de otro (p. ej. de otro shard)."""
+        self.unidades += otro.unidades
+        self.partidas += otro.partidas
+        self.suma += otro.suma
+        self.suma_cuadrados += otro.suma_cuadrados
+        self.victorias += otro.victorias
+        self.gammons += otro.gammons
+        self.backgammons += otro.backgammons
+        return self
+
+    def equidad(self):
+        """Equidad media del jugador en turno."""
+        return self.suma / self.unidades if self.unidades else 0.0
+
+    def error_estandar(self):
+        """Error estándar de la equidad (infinito con menos de dos unidades)."""
+        if self.unidades < 2:
+            return math.inf
+        media = self.equidad()
+        varianza = (self.suma_cuadrados - self.unidades * media * media) / (self.unidades - 1)
+        return math.sqrt(max(varianza, 0.0) / self.unidades)
+
+    def intervalo(self, z=1.96):
+        """Intervalo de confianza (por defecto 95%) de la equidad."""
+        margen = z * self.error_estandar()
+        return self.equidad() - margen, self.equidad() + margen
+
+    def tasa_victorias(self):
+        """Proporción de partidas ganadas por quien movía."""
+        return self.victorias / self.partidas if self.partidas else 0.0
+
+    def reporte(self):
+        """Devuelve un texto con el resumen del rollout."""
+        return (f"Equidad: {self.equidad():+.4f} ± {self.error_estandar():.4f} "
+                f"({self.partidas} partidas, victorias {self.tasa_victorias():.2%}, "
+                f"{self.segundos:.2f} s)")
+
+
+def _jugar_unidad(posicion, turno, agentes, semilla, primera, antitetico):
+    """Juega una unidad; devuelve la lista de equidades de sus partidas."""
+    equidades = []
+    for espejo in ((False, True) if antitetico else (False,)):
+        game = Game(quiet=True, compacto=True,
+                    dados=DadosRollout(random.Random(semilla), primera, espejo))
+        game.cargar_posicion(posicion, turno)
+        ganador, puntos, _ = jugar_partida(agentes, game=game)
+        equidades.append(puntos if ganador == game.get_players()[turno].get_color() else -puntos)
+    return equidades
+
+
+def _rollout_shard(tarea):
+    """Juega las unidades ``[inicio, inicio + cantidad)`` de un rollout."""
+    posicion, turno, agente, semilla, inicio, cantidad, estratificado, antitetico = tarea
+    resultado = ResultadoRollout()
+    for unidad in range(inicio, inicio + cantidad):
+        base = f"{semilla}:{unidad}"
+        agentes = (AGENTES[agente](random.Random(base + ":blancas")),
+                   AGENTES[agente](random.Random(base + ":negras")))
+        primera = PRIMERAS_TIRADAS[unidad % 36] if estratificado else None
+        equidades = _jugar_unidad(posicion, turno, agentes, base + ":dados", primera, antitetico)
+        for equidad in equidades:
+            resultado.agregar_partida(equidad)
+        resultado.agregar_unidad(sum(equidades) / len(equidades))
+    return resultado
+
+
+def rollout_posicion(posicion, turno=0, agente="heuristico", partidas=1296, semilla=0,
+                     estratificado=True, antitetico=False, error_objetivo=None,
+                     procesos=1, tamano_shard=TAMANO_SHARD):
+    """Rollout de una posición compacta con ``turno`` (0 blancas, 1 negras) por tirar.
+
+    ``partidas`` es el máximo de partidas a jugar (con dados antitéticos se
+    juegan de a pares). Con ``error_objetivo`` se detiene al terminar la tanda
+    de shards en la que el error estándar queda por debajo del objetivo.
+    ``procesos=None`` usa un proceso por núcleo; ``procesos=1`` corre aquí.
+    """
+    posicion = tuple(posicion)
+    por_unidad = 2 if antitetico else 1
+    unidades = max(1, partidas // por_unidad)
+    tareas = [
+        (posicion, turno, agente, semilla, inicio, min(tamano_shard, unidades - inicio),
+         estratificado, antitetico)
+        for inicio in range(0, unidades, tamano_shard)
+    ]
+    resultado = ResultadoRollout()
+    inicio = time.perf_counter()
+    if procesos == 1:
+        for tarea in tareas:
+            resultado.combinar(_rollout_shard(tarea))
+            if error_objetivo is not None and resultado.error_estandar() <= error_objetivo:
+                break
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as executor:
+            tanda = procesos or os.cpu_count() or 1
+            for desde in range(0, len(tareas), tanda):
+                for parcial in executor.map(_rollout_shard, tareas[desde:desde + tanda]):
+                    resultado.combinar(parcial)
+                if error_objetivo is not None and resultado.error_estandar() <= error_objetivo:
+                    break
+    resultado.segundos = time.perf_counter() - inicio
+    return resultado
+
+
+def rollout(game, agente="heuristico", partidas=1296, **opciones):
+    """Rollout de la posición actual de ``game`` con su jugador en turno por tirar.
+
+    Acepta las mismas opciones que ``rollout_posicion``; ``game`` no se modifica.
+    """
+    turno = game.get_players().index(game.get_turno())
+    return rollout_posicion(game.posicion_compacta(), turno, agente, partidas, **opciones)
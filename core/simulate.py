@@ -0,0 +1,235 @@
+"""Simulador headless de partidas completas entre agentes.
+
+Juega partidas sin ``print`` ni ``input`` usando solo la API de motor de
+``Game`` (``tirar_dados``, ``generar_jugadas``, ``aplicar_jugada``). Uso:
+
+    python -m core.simulate -n 1000 --blancas heuristico --negras aleatorio
+    python -m core.simulate -n 100000 --procesos 32 --semilla 7
+
+Las partidas se reparten en shards de tamaño fijo; cada shard deriva sus
+generadores de ``(semilla, indice_shard)``, así que el resultado depende solo
+de la semilla maestra y no de la cantidad de procesos.
+"""
+
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from core.ai import Expectimax
+from core.board import BARRA_BLANCAS, BARRA_NEGRAS
+from core.dice import Dice
+from core.excepcions import EstadoJuegoInconsistenteError
+from core.game import Game
+
+MAX_TURNOS = 10_000
+TAMANO_SHARD = 250
+BUFFER_DADOS = 4096
+
+
+class AgenteAleatorio:
+    """Elige una jugada legal al azar."""
+
+    def __init__(self, rng=None):
+        self.__rng__ = rng or random.Random()
+
+    def elegir_jugada(self, game, jugadas):  # pylint: disable=unused-argument
+        """Devuelve una de las tuplas (jugada, posicion) recibidas."""
+        return jugadas[self.__rng__.randrange(len(jugadas))]
+
+
+def conteo_pips(posicion, color):
+    """Pips que le faltan a un color para sacar todas sus fichas."""
+    if color == "blanca":
+        pips = sum((24 - i) * v for i, v in enumerate(posicion[:24]) if v > 0)
+        return pips + 25 * posicion[BARRA_BLANCAS]
+    pips = sum((i + 1) * -v for i, v in enumerate(posicion[:24]) if v < 0)
+    return pips + 25 * posicion[BARRA_NEGRAS]
+
+
+class AgenteHeuristico:
+    """Elige la jugada con mejor carrera de pips y menos fichas expuestas."""
+
+    def __init__(self, rng=None):
+        self.__rng__ = rng
+
+    @staticmethod
+    def puntaje(posicion, color):
+        """Puntaje de una posición para ``color`` (mayor es mejor)."""
+        rival = "negra" if color == "blanca" else "blanca"
+        signo = 1 if color == "blanca" else -1
+        expuestas = sum(1 for v in posicion[:24] if v * signo == 1)
+        puntos_hechos = sum(1 for v in posicion[:24] if v * signo >= 2)
+        return (conteo_pips(posicion, rival) - conteo_pips(posicion, color)
+                - 4 * expuestas + 2 * puntos_hechos)
+
+    def elegir_jugada(self, game, jugadas):
+        """Devuelve la tupla (jugada, posicion) de mayor puntaje."""
+        color = game.get_turno().get_color()
+        return max(jugadas, key=lambda jugada: self.puntaje(jugada[1], color))
+
+
+def agente_expectimax(rng=None):  # pylint: disable=unused-argument
+    """Agente que busca a 2 plies con ``core.ai.Expectimax``."""
+    return Expectimax(profundidad=2)
+
+
+AGENTES = {
+    "aleatorio": AgenteAleatorio,
+    "heuristico": AgenteHeuristico,
+    "expectimax": agente_expectimax,
+}
+
+
+def jugar_partida(agentes, game=None, dados=None):
+    """Juega una partida hasta el final y devuelve (color_ganador, puntos, turnos).
+
+    ``agentes`` es un par (blancas, negras) con método ``elegir_jugada``;
+    ``dados`` es el Dice a usar si se crea una partida nueva.
+    """
+    game = game or Game(quiet=True, compacto=True, dados=dados)
+    for turno in range(1, MAX_TURNOS + 1):
+        game.tirar_dados()
+        jugadas = game.generar_jugadas()
+        agente = agentes[game.get_players().index(game.get_turno())]
+        jugada, _ = agente.elegir_jugada(game, jugadas)
+        game.aplicar_jugada(jugada)
+        game.limpiar_historial()
+        puntos = game.puntos_victoria()
+        if puntos:
+            return game.get_turno().get_color(), puntos, turno
+        game.cambiar_turno()
+    raise EstadoJuegoInconsistenteError(f"La partida superó {MAX_TURNOS} turnos")
+
+
+class ResumenSimulacion:
+    """Acumula estadísticas de un conjunto de partidas simuladas."""
+
+    def __init__(self):
+        self.partidas = 0
+        self.turnos = 0
+        self.victorias_blancas = 0
+        self.gammons = 0
+        self.backgammons = 0
+        self.segundos = 0.0
+
+    def agregar(self, ganador, puntos, turnos):
+        """Registra el resultado de una partida."""
+        self.partidas += 1
+        self.turnos += turnos
+        if ganador == "blanca":
+            self.victorias_blancas += 1
+        if puntos == 2:
+            self.gammons += 1
+        elif puntos == 3:
+            self.backgammons += 1
+
+    def combinar(self, otro):
+        """Suma al resumen los contadores de otro (p. ej. de otro shard)."""
+        self.partidas += otro.partidas
+        self.turnos += otro.turnos
+        self.victorias_blancas += otro.victorias_blancas
+        self.gammons += otro.gammons
+        self.backgammons += otro.backgammons
+        return self
+
+    def resultados(self):
+        """Contadores de la simulación, sin el tiempo medido."""
+        return (self.partidas, self.turnos, self.victorias_blancas,
+                self.gammons, self.backgammons)
+
+    def partidas_por_segundo(self):
+        """Partidas simuladas por segundo."""
+        return self.partidas / self.segundos if self.segundos else 0.0
+
+    def turnos_promedio(self):
+        """Cantidad promedio de turnos por partida."""
+        return self.turnos / self.partidas if self.partidas else 0.0
+
+    def tasa_gammon(self):
+        """Proporción de partidas ganadas por gammon (sin contar backgammons)."""
+        return self.gammons / self.partidas if self.partidas else 0.0
+
+    def tasa_backgammon(self):
+        """Proporción de partidas ganadas por backgammon."""
+        return self.backgammons / self.partidas if self.partidas else 0.0
+
+    def reporte(self):
+        """Devuelve un texto con el resumen de la simulación."""
+        return "\n".join([
+            f"Partidas: {self.partidas} en {self.segundos:.2f} s "
+            f"({self.partidas_por_segundo():.1f} partidas/s)",
+            f"Turnos promedio: {self.turnos_promedio():.1f}",
+            f"Victorias blancas: {self.victorias_blancas} | "
+            f"negras: {self.partidas - self.victorias_blancas}",
+            f"Gammons: {self.tasa_gammon():.2%} | Backgammons: {self.tasa_backgammon():.2%}",
+        ])
+
+
+def simular(partidas, agente_blancas, agente_negras, rng=None):
+    """Juega ``partidas`` partidas y devuelve un ResumenSimulacion.
+
+    Todas las partidas comparten un Dice con buffer alimentado por ``rng``.
+    """
+    resumen = ResumenSimulacion()
+    agentes = (agente_blancas, agente_negras)
+    dados = Dice(rng, buffer=BUFFER_DADOS)
+    inicio = time.perf_counter()
+    for _ in range(partidas):
+        resumen.agregar(*jugar_partida(agentes, dados=dados))
+    resumen.segundos = time.perf_counter() - inicio
+    return resumen
+
+
+def _simular_shard(tarea):
+    """Juega un shard con generadores derivados de (semilla, índice)."""
+    indice, partidas, semilla, blancas, negras = tarea
+    base = f"{semilla}:{indice}"
+    agentes = (AGENTES[blancas](random.Random(base + ":blancas")),
+               AGENTES[negras](random.Random(base + ":negras")))
+    return simular(partidas, *agentes, rng=random.Random(base + ":dados"))
+
+
+def simular_paralelo(partidas, blancas="aleatorio", negras="aleatorio", semilla=0,
+                     procesos=None, tamano_shard=TAMANO_SHARD):
+    """Reparte las partidas en shards y los juega en un ProcessPoolExecutor.
+
+    ``blancas`` y ``negras`` son nombres de AGENTES (deben poder enviarse a
+    otros procesos). Con ``procesos=1`` todo corre en el proceso actual.
+    """
+    tareas = [
+        (indice, min(tamano_shard, partidas - inicio), semilla, blancas, negras)
+        for indice, inicio in enumerate(range(0, partidas, tamano_shard))
+    ]
+    resumen = ResumenSimulacion()
+    inicio = time.perf_counter()
+    if procesos == 1:
+        for parcial in map(_simular_shard, tareas):
+            resumen.combinar(parcial)
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as executor:
+            for parcial in executor.map(_simular_shard, tareas):
+                resumen.combinar(parcial)
+    resumen.segundos = time.perf_counter() - inicio
+    return resumen
+
+
+def main(argv=None):
+    """Punto de entrada de ``python -m core.simulate``."""
+    parser = argparse.ArgumentParser(description="Simulador headless de Backgammon")
+    parser.add_argument("-n", "--partidas", type=int, default=1000)
+    parser.add_argument("--blancas", choices=sorted(AGENTES), default="aleatorio")
+    parser.add_argument("--negras", choices=sorted(AGENTES), default="aleatorio")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--procesos", type=int, default=1,
+                        help="procesos de trabajo (0 = uno por núcleo)")
+    args = parser.parse_args(argv)
+
+    resumen = simular_paralelo(args.partidas, args.blancas, args.negras,
+                               semilla=args.semilla, procesos=args.procesos or None)
+    print(resumen.reporte())
+    return resumen
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""Entrenamiento TD(λ) por autojuego del evaluador neuronal.
+
+Los procesos de trabajo juegan partidas completas con las reglas de ``Game``
+(dados con generador inyectado y semilla derivada de la tarea) usando una
+copia de los pesos actuales, y devuelven las posiciones de cada partida. El
+proceso principal aplica las actualizaciones TD(λ) por lotes y vuelve a
+encolar trabajo con los pesos nuevos apenas termina cada tarea, de modo que
+la simulación y el aprendizaje quedan en paralelo. Uso:
+
+    python -m core.train --partidas 200000 --procesos 32 --carpeta pesos/
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from core.dice import Dice
+from core.neural import NeuralEvaluator, codificar
+from core.simulate import AGENTES, BUFFER_DADOS, jugar_partida
+
+PARTIDAS_POR_TAREA = 16
+
+
+class _AgenteRegistrador:
+    """Agente codicioso con la red que anota cada posición elegida."""
+
+    def __init__(self, red, trayectoria, rng, exploracion):
+        self.__red__ = red
+        self.__trayectoria__ = trayectoria
+        self.__rng__ = rng
+        self.__exploracion__ = exploracion
+
+    def elegir_jugada(self, game, jugadas):
+        """Elige la mejor jugada (o una al azar con probabilidad ``exploracion``)."""
+        if self.__exploracion__ and self.__rng__.random() < self.__exploracion__:
+            elegida = jugadas[self.__rng__.randrange(len(jugadas))]
+        else:
+            elegida = self.__red__.elegir_jugada(game, jugadas)
+        turno = game.get_players().index(game.get_turno())
+        self.__trayectoria__.append((elegida[1], turno))
+        return elegida
+
+
+def generar_partidas(tarea):
+    """Proceso de trabajo: juega partidas de autojuego con pesos fijos.
+
+    Devuelve una lista de ``(posiciones, turnos, puntos)`` por partida, donde
+    ``turnos[i]`` indica quién movió hasta ``posiciones[i]`` (0 blancas) y
+    ``puntos`` es lo que ganó quien hizo la última jugada.
+    """
+    pesos, semilla, partidas, exploracion = tarea
+    red = NeuralEvaluator(pesos=pesos)
+    rng = random.Random(f"{semilla}:agentes")
+    dados = Dice(random.Random(f"{semilla}:dados"), buffer=BUFFER_DADOS)
+    resultado = []
+    for _ in range(partidas):
+        trayectoria = []
+        agente = _AgenteRegistrador(red, trayectoria, rng, exploracion)
+        _, puntos, _ = jugar_partida((agente, agente), dados=dados)
+        posiciones, turnos = zip(*trayectoria)
+        resultado.append((posiciones, turnos, puntos))
+    return resultado
+
+
+def _invertir(probabilidades):
+    """Pasa probabilidades ``(N, 5)`` al punto de vista del otro jugador."""
+    p = probabilidades
+    return np.stack([1 - p[:, 0], p[:, 3], p[:, 4], p[:, 1], p[:, 2]], axis=1)
+
+
+def codificar_partida(posiciones, turnos):
+    """Codifica cada posición desde el punto de vista de quien la jugó."""
+    turnos = np.asarray(turnos)
+    entradas = np.empty((len(posiciones), codificar([posiciones[0]], "blanca").shape[1]),
+                        dtype=np.float32)
+    for turno, color in ((0, "blanca"), (1, "negra")):
+        filas = np.flatnonzero(turnos == turno)
+        if len(filas):
+            entradas[filas] = codificar([posiciones[i] for i in filas], color)
+    return entradas
+
+
+def objetivos_td(red, entradas, puntos, lam):
+    """Objetivos λ-return de una partida (vista hacia adelante de TD(λ)).
+
+    La última posición recibe el resultado real; cada anterior mezcla la
+    predicción de la siguiente posición y el objetivo de la siguiente, ambos
+    invertidos porque las posiciones alternan de jugador.
+    """
+    final = np.array([1.0, puntos >= 2, puntos >= 3, 0.0, 0.0], dtype=np.float32)
+    predicciones = _invertir(red.propagar(entradas)[1])
+    objetivos = np.empty((len(entradas), 5), dtype=np.float32)
+    objetivos[-1] = final
+    for t in range(len(entradas) - 2, -1, -1):
+        siguiente = _invertir(objetivos[t + 1:t + 2])[0]
+        objetivos[t] = (1 - lam) * predicciones[t + 1] + lam * siguiente
+    return objetivos
+
+
+def paso_gradiente(red, entradas, objetivos, alfa):
+    """Un paso de descenso por gradiente del error cuadrático; devuelve el error."""
+    ocultas, salidas = red.propagar(entradas)
+    error = salidas - objetivos
+    delta_salida = error * salidas * (1 - salidas)
+    delta_oculta = (delta_salida @ red.w2.T) * ocultas * (1 - ocultas)
+    n = len(entradas)
+    red.w2 -= alfa * (ocultas.T @ delta_salida) / n
+    red.b2 -= alfa * delta_salida.mean(axis=0)
+    red.w1 -= alfa * (entradas.T @ delta_oculta) / n
+    red.b1 -= alfa * delta_oculta.mean(axis=0)
+    return float((error ** 2).sum(axis=1).mean())
+
+
+def aprender(red, partidas, alfa, lam):
+    """Aplica TD(λ) a un lote de partidas; devuelve el error medio."""
+    entradas, objetivos = [], []
+    for posiciones, turnos, puntos in partidas:
+        codificadas = codificar_partida(posiciones, turnos)
+        entradas.append(codificadas)
+        objetivos.append(objetivos_td(red, codificadas, puntos, lam))
+    return paso_gradiente(red, np.concatenate(entradas), np.concatenate(objetivos), alfa)
+
+
+def evaluar_contra(red, agente="heuristico", partidas=100, semilla=0):
+    """Equidad media de la red contra un agente de ``AGENTES`` alternando colores."""
+    rival = AGENTES[agente](random.Random(f"{semilla}:rival"))
+    dados = Dice(random.Random(f"{semilla}:evaluacion"), buffer=BUFFER_DADOS)
+    total = 0
+    for i in range(partidas):
+        agentes = (red, rival) if i % 2 == 0 else (rival, red)
+        ganador, puntos, _ = jugar_partida(agentes, dados=dados)
+        color_red = "blanca" if i % 2 == 0 else "negra"
+        total += puntos if ganador == color_red else -puntos
+    return total / partidas if partidas else 0.0
+
+
+def _registrar(metricas, red, carpeta, evaluacion, semilla):
+    """Guarda un punto de control y agrega la métrica de la curva de aprendizaje."""
+    if evaluacion:
+        metricas["equidad_vs_heuristico"] = evaluar_contra(red, "heuristico", evaluacion, semilla)
+    if carpeta:
+        red.guardar(os.path.join(carpeta, f"pesos_{metricas['partidas']:08d}.npz"))
+        with open(os.path.join(carpeta, "metricas.jsonl"), "a", encoding="utf-8") as archivo:
+            archivo.write(json.dumps(metricas) + "\n")
+
+
+class EntrenadorTD:
+    """Coordina los procesos de autojuego y las actualizaciones TD(λ).
+
+    Cada ``cada`` partidas registra error medio, partidas por segundo y, si
+    ``evaluacion`` > 0, la equidad contra el agente heurístico en esa cantidad
+    de partidas; con ``carpeta`` guarda además los pesos y ``metricas.jsonl``.
+    """
+
+    def __init__(self, red=None, alfa=0.1, lam=0.7, exploracion=0.0, semilla=0,
+                 partidas_por_tarea=PARTIDAS_POR_TAREA, carpeta=None, cada=1000,
+                 evaluacion=0):
+        self.red = red or NeuralEvaluator(rng=np.random.default_rng(semilla))
+        self.alfa = alfa
+        self.lam = lam
+        self.exploracion = exploracion
+        self.semilla = semilla
+        self.partidas_por_tarea = partidas_por_tarea
+        self.carpeta = carpeta
+        self.cada = cada
+        self.evaluacion = evaluacion
+        self.metricas = []
+        self.partidas = 0
+        self.__tareas__ = 0
+        self.__errores__ = []
+        self.__inicio__ = time.perf_counter()
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+
+    def _nueva_tarea(self, pendientes):
+        """Arma la próxima tarea con una copia de los pesos actuales."""
+        pesos = (self.red.w1.copy(), self.red.b1.copy(), self.red.w2.copy(), self.red.b2.copy())
+        tarea = (pesos, f"{self.semilla}:{self.__tareas__}",
+                 min(self.partidas_por_tarea, pendientes), self.exploracion)
+        self.__tareas__ += 1
+        return tarea
+
+    def _consumir(self, lote, objetivo):
+        """Aprende de un lote de partidas y registra la métrica si corresponde."""
+        anteriores = self.partidas
+        self.__errores__.append(aprender(self.red, lote, self.alfa, self.lam))
+        self.partidas += len(lote)
+        if self.partidas // self.cada > anteriores // self.cada or self.partidas >= objetivo:
+            segundos = time.perf_counter() - self.__inicio__
+            punto = {
+                "partidas": self.partidas,
+                "error_td": float(np.mean(self.__errores__)),
+                "partidas_por_segundo": self.partidas / segundos if segundos else 0.0,
+            }
+            _registrar(punto, self.red, self.carpeta, self.evaluacion, self.semilla)
+            self.metricas.append(punto)
+            self.__errores__ = []
+
+    def entrenar(self, partidas, procesos=1):
+        """Juega y aprende ``partidas`` partidas más; devuelve la red.
+
+        ``procesos=1`` corre todo en el proceso actual; ``None`` usa un proceso
+        por núcleo. Con varios procesos siempre hay tareas en cola, así los
+        procesos de trabajo siguen jugando mientras se aplican las actualizaciones.
+        """
+        objetivo = self.partidas + partidas
+        encoladas = 0
+        if procesos == 1:
+            while encoladas < partidas:
+                tarea = self._nueva_tarea(partidas - encoladas)
+                encoladas += tarea[2]
+                self._consumir(generar_partidas(tarea), objetivo)
+            return self.red
+
+        with ProcessPoolExecutor(max_workers=procesos) as executor:
+            en_curso = set()
+            for _ in range(2 * (procesos or os.cpu_count() or 1)):
+                if encoladas >= partidas:
+                    break
+                tarea = self._nueva_tarea(partidas - encoladas)
+                encoladas += tarea[2]
+                en_curso.add(executor.submit(generar_partidas, tarea))
+            while en_curso:
+                listas, en_curso = wait(en_curso, return_when=FIRST_COMPLETED)
+                for futuro in listas:
+                    self._consumir(futuro.result(), objetivo)
+                    if encoladas < partidas:
+                        tarea = self._nueva_tarea(partidas - encoladas)
+                        encoladas += tarea[2]
+                        en_curso.add(executor.submit(generar_partidas, tarea))
+        return self.red
+
+
+def main(argv=None):
+    """Punto de entrada de ``python -m core.train``."""
+    parser = argparse.ArgumentParser(description="Entrenamiento TD(λ) por autojuego")
+    parser.add_argument("--partidas", type=int, default=10_000)
+    parser.add_argument("--procesos", type=int, default=1,
+                        help="procesos de trabajo (0 = uno por núcleo)")
+    parser.add_argument("--alfa", type=float, default=0.1)
+    parser.add_argument("--lambda", dest="lam", type=float, default=0.7)
+    parser.add_argument("--exploracion", type=float, default=0.0)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--pesos", help="archivo .npz desde el cual continuar")
+    parser.add_argument("--carpeta", default="pesos")
+    parser.add_argument("--cada", type=int, default=1000)
+    parser.add_argument("--evaluacion", type=int, default=0,
+                        help="partidas contra el heurístico en cada punto de control")
+    args = parser.parse_args(argv)
+
+    red = NeuralEvaluator.cargar(args.pesos) if args.pesos else None
+    entrenador = EntrenadorTD(red, alfa=args.alfa, lam=args.lam, exploracion=args.exploracion,
+                              semilla=args.semilla, carpeta=args.carpeta, cada=args.cada,
+                              evaluacion=args.evaluacion)
+    entrenador.entrenar(args.partidas, args.procesos or None)
+    for punto in entrenador.metricas:
+        print(json.dumps(punto))
+    return entrenador
+
+
+if __name__ == "__main__":
+    main()
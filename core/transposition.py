@@ -0,0 +1,113 @@
+"""Tabla de transposición de tamaño fijo para la búsqueda.
+
+Las entradas se guardan en arrays paralelos (clave, valor, profundidad y
+tipo) indexados por los bits bajos de la clave, así que la memoria usada
+queda fija al crearla. Ante una colisión se conserva la entrada de mayor
+profundidad (reemplazo por profundidad).
+"""
+
+from array import array
+
+from core import zobrist
+
+EXACTO = 0
+COTA_INFERIOR = 1
+COTA_SUPERIOR = 2
+
+# Bytes por entrada: clave (8) + valor (8) + profundidad (1) + tipo (1)
+_BYTES_POR_ENTRADA = 18
+_VACIA = -1
+
+
+def clave(posicion, color):
+    """Clave de una posición compacta con ``color`` como jugador en turno."""
+    return zobrist.hash_posicion(posicion) ^ zobrist.clave_turno(color != "blanca")
+
+
+class TranspositionTable:
+    """Tabla de transposición con tope de memoria en MB.
+
+    Sirve para cualquier evaluador: las claves son enteros de 64 bits (p. ej.
+    ``Game.hash_posicion()`` o ``clave(posicion, color)``) y los valores son
+    floats con la profundidad a la que se calcularon.
+    """
+
+    def __init__(self, megabytes=16):
+        if megabytes <= 0:
+            raise ValueError("La tabla necesita al menos algo de memoria")
+        entradas = 1
+        while entradas * 2 * _BYTES_POR_ENTRADA <= megabytes * 1024 * 1024:
+            entradas *= 2
+        self.__mascara__ = entradas - 1
+        self.__claves__ = array("Q", bytes(8 * entradas))
+        self.__valores__ = array("d", bytes(8 * entradas))
+        self.__profundidades__ = array("b", [_VACIA]) * entradas
+        self.__tipos__ = array("b", bytes(entradas))
+        self.aciertos = 0
+        self.fallos = 0
+        self.reemplazos = 0
+
+    def __len__(self):
+        """Cantidad de entradas ocupadas."""
+        return sum(1 for p in self.__profundidades__ if p != _VACIA)
+
+    def capacidad(self):
+        """Cantidad máxima de entradas."""
+        return self.__mascara__ + 1
+
+    def consultar(self, clave_posicion, profundidad, alfa, beta):
+        """Devuelve un valor utilizable para la ventana (alfa, beta) o None.
+
+        Solo sirven entradas calculadas con al menos ``profundidad`` plies; las
+        cotas se usan cuando ya alcanzan para decidir fuera de la ventana.
+        """
+        i = clave_posicion & self.__mascara__
+        if (self.__profundidades__[i] >= profundidad
+                and self.__claves__[i] == clave_posicion):
+            valor = self.__valores__[i]
+            tipo = self.__tipos__[i]
+            if (tipo == EXACTO
+                    or (tipo == COTA_INFERIOR and valor >= beta)
+                    or (tipo == COTA_SUPERIOR and valor <= alfa)):
+                self.aciertos += 1
+                return valor
+        self.fallos += 1
+        return None
+
+    def guardar(self, clave_posicion, profundidad, valor, tipo=EXACTO):
+        """Guarda un valor salvo que la casilla tenga otra posición más profunda."""
+        i = clave_posicion & self.__mascara__
+        anterior = self.__profundidades__[i]
+        if anterior != _VACIA and self.__claves__[i] != clave_posicion:
+            if anterior > profundidad:
+                return False
+            self.reemplazos += 1
+        self.__claves__[i] = clave_posicion
+        self.__valores__[i] = valor
+        self.__profundidades__[i] = profundidad
+        self.__tipos__[i] = tipo
+        return True
+
+    def limpiar(self):
+        """Vacía la tabla y reinicia las estadísticas."""
+        self.__profundidades__[:] = array("b", [_VACIA]) * len(self.__profundidades__)
+        self.aciertos = self.fallos = self.reemplazos = 0
+
+    def tasa_aciertos(self):
+        """Proporción de consultas que devolvieron un valor."""
+        consultas = self.aciertos + self.fallos
+        return self.aciertos / consultas if consultas else 0.0
+
+    def estadisticas(self):
+        """Diccionario con el uso de la tabla."""
+        return {
+            "capacidad": self.capacidad(),
+            "ocupadas": len(self),
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "reemplazos": self.reemplazos,
+            "tasa_aciertos": self.tasa_aciertos(),
+        }
+
+
+TablaTransposicion = TranspositionTable
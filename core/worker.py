@@ -0,0 +1,91 @@
+"""Búsqueda de jugadas en un hilo de fondo para interfaces interactivas.
+
+La interfaz envía una posición con ``AIWorker.enviar`` y consulta
+``resultado`` en cada cuadro sin bloquearse. Enviar un trabajo nuevo o llamar
+``cancelar`` corta la búsqueda en curso en el próximo nodo de azar, de modo
+que nunca se entrega una sugerencia de una posición que ya cambió.
+"""
+
+import queue
+import threading
+
+from core.ai import Expectimax
+from core.excepcions import BusquedaCanceladaError
+
+
+class AIWorker:
+    """Hilo de trabajo con un motor propio y a lo sumo un trabajo vigente.
+
+    ``motor`` es cualquier objeto con ``mejor_jugada(posicion, color, dados,
+    detener)`` (por defecto ``Expectimax`` de 2 plies) y solo lo usa el hilo
+    de trabajo. ``al_terminar(trabajo)`` se llama desde ese hilo cuando hay un
+    resultado, por ejemplo para despertar un bucle de eventos bloqueado.
+    """
+
+    def __init__(self, motor=None, al_terminar=None):
+        self.__motor__ = motor or Expectimax(profundidad=2)
+        self.__al_terminar__ = al_terminar
+        self.__cola__ = queue.Queue()
+        self.__candado__ = threading.Lock()
+        self.__trabajo__ = 0
+        self.__cancelado__ = threading.Event()
+        self.__resultado__ = None
+        self.__hilo__ = threading.Thread(target=self._bucle, name="AIWorker", daemon=True)
+        self.__hilo__.start()
+
+    def enviar(self, posicion, color, dados):
+        """Encola una búsqueda y cancela la anterior; devuelve el id del trabajo."""
+        cancelado = threading.Event()
+        with self.__candado__:
+            self.__cancelado__.set()
+            self.__cancelado__ = cancelado
+            self.__trabajo__ += 1
+            trabajo = self.__trabajo__
+            self.__resultado__ = None
+        self.__cola__.put((trabajo, tuple(posicion), color, tuple(dados), cancelado))
+        return trabajo
+
+    def cancelar(self):
+        """Cancela el trabajo vigente (si terminó, descarta su resultado)."""
+        with self.__candado__:
+            self.__cancelado__.set()
+            self.__resultado__ = None
+
+    def resultado(self, trabajo):
+        """(jugada, valor) del trabajo si ya terminó y sigue vigente; si no, None."""
+        with self.__candado__:
+            if self.__resultado__ is None or self.__resultado__[0] != trabajo:
+                return None
+            return self.__resultado__[1]
+
+    def ocupado(self):
+        """True si el trabajo vigente todavía no tiene resultado ni fue cancelado."""
+        with self.__candado__:
+            return self.__resultado__ is None and not self.__cancelado__.is_set()
+
+    def cerrar(self, timeout=None):
+        """Cancela lo pendiente y termina el hilo de trabajo."""
+        self.cancelar()
+        self.__cola__.put(None)
+        self.__hilo__.join(timeout)
+
+    def _bucle(self):
+        """Hilo de trabajo: atiende la cola hasta recibir None."""
+        while True:
+            tarea = self.__cola__.get()
+            if tarea is None:
+                return
+            trabajo, posicion, color, dados, cancelado = tarea
+            if cancelado.is_set():
+                continue
+            try:
+                encontrado = self.__motor__.mejor_jugada(posicion, color, dados,
+                                                         detener=cancelado.is_set)
+            except BusquedaCanceladaError:
+                continue
+            with self.__candado__:
+                if cancelado.is_set() or trabajo != self.__trabajo__:
+                    continue
+                self.__resultado__ = (trabajo, encontrado)
+            if self.__al_terminar__ is not None:
+                self.__al_terminar__(trabajo)
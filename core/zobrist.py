@@ -0,0 +1,39 @@
+"""Claves Zobrist de 64 bits para identificar posiciones del tablero."""
+
+import random
+
+# Mismos 28 casilleros que la posición compacta de core.board
+_CASILLEROS = 28
+# Rango de conteos soportado por casillero: -DESPLAZAMIENTO..DESPLAZAMIENTO
+DESPLAZAMIENTO = 32
+
+# Semilla fija: el hash de una posición es estable entre ejecuciones y procesos
+_rng = random.Random(0x5EED_BAC6)
+
+CLAVES = tuple(
+    tuple(
+        0 if valor == DESPLAZAMIENTO else _rng.getrandbits(64)
+        for valor in range(2 * DESPLAZAMIENTO + 1)
+    )
+    for _ in range(_CASILLEROS)
+)
+TURNO_NEGRAS = _rng.getrandbits(64)
+
+
+def hash_posicion(posicion):
+    """Calcula desde cero el hash de una posición compacta de 28 casilleros."""
+    resultado = 0
+    for claves, valor in zip(CLAVES, posicion):
+        resultado ^= claves[valor + DESPLAZAMIENTO]
+    return resultado
+
+
+def clave_turno(turno):
+    """Clave a combinar según el jugador en turno (0 = blancas, 1 = negras)."""
+    return TURNO_NEGRAS if turno else 0
+
+
+def delta(casillero, antes, despues):
+    """Valor a combinar (XOR) cuando un casillero pasa de ``antes`` a ``despues``."""
+    claves = CLAVES[casillero]
+    return claves[antes + DESPLAZAMIENTO] ^ claves[despues + DESPLAZAMIENTO]
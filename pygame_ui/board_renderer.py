@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 import pygame
 
 # --- Colores ---
@@ -7,6 +9,25 @@ BROWN_DARK = (140, 90, 40)
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 GRAY = (50, 50, 50)
+HOVER = (255, 255, 255, 50)
+
+# Máximo de superficies de texto que guarda la cache LRU de BoardView
+TEXT_CACHE_SIZE = 256
+
+# Lado en píxeles de cada celda de la grilla de detección de clics
+HIT_GRID_CELL = 4
+# Valores posibles de la grilla; el código de cada celda es su índice (255 = nada)
+_HIT_VALUES = tuple(range(24)) + ('barra', 'off')
+_HIT_CODES = {valor: codigo for codigo, valor in enumerate(_HIT_VALUES)}
+_HIT_NONE = 255
+
+# Panel de dados de la bandeja: lado y separación en px, distancia del centro de
+# la primera fila al borde superior del tablero y cantidad de columnas
+DICE_SIZE = 26
+DICE_GAP = 8
+DICE_TOP_OFFSET = 10
+DICE_COLS = 2
+DICE_MAX = 4
 
 
 class BoardView:
@@ -15,9 +36,27 @@ class BoardView:
     Este renderer sólo dibuja; no modifica la lógica del juego. Se añadieron
     mejoras de layout: números inferiores visibles, barra central y bandeja
     derecha para borne-off.
+
+    Lo que no cambia entre cuadros se dibuja una sola vez: el tablero estático
+    queda en una ``Surface`` y las fichas, caras de dados y números de pila son
+    sprites pre-renderizados. Todo se regenera solo al llamar ``resize``.
     """
 
     def __init__(self, width=900, height=600):
+        # Tipografías
+        self.font = pygame.font.SysFont("arial", 18)
+        self.message_font = pygame.font.SysFont("arial", 22, bold=True)
+        self.small_font = pygame.font.SysFont("arial", 20)
+        self.big_font = pygame.font.SysFont("arial", 32, bold=True)
+
+        # Cache LRU de textos renderizados: (fuente, texto, color) -> Surface
+        self._text_cache = OrderedDict()
+        self.text_cache_hits = 0
+        self.text_cache_misses = 0
+        self.resize(width, height)
+
+    def resize(self, width, height):
+        """Recalcula la geometría para un nuevo tamaño y descarta las caches."""
         self.width = width
         self.height = height
 
@@ -39,10 +78,39 @@ class BoardView:
                 self.message_bar_height + self.bottom_labels_band + self.top_labels_band + self.margin
             )
         ) / 2
+        self.checker_radius = int(min(self.triangle_width * 0.33, (self.off_tray_width * 0.45)))
 
-        # Tipografías
-        self.font = pygame.font.SysFont("arial", 18)
-        self.message_font = pygame.font.SysFont("arial", 22, bold=True)
+        # Caches de superficies (se crean al primer uso)
+        self._board_surface = None
+        self._checker_sprites = {}
+        self._highlight_sprites = {}
+        self._dice_sprites = {}
+        self._hit_grid = None
+        self._hit_cols = -(-self.width // HIT_GRID_CELL)
+
+    # --- texto ---
+    def render_text(self, font, texto, color=BLACK):
+        """``font.render`` con cache LRU acotada a ``TEXT_CACHE_SIZE`` entradas.
+
+        Las superficies devueltas se comparten entre llamadas: no modificarlas.
+        """
+        clave = (font, texto, color)
+        superficie = self._text_cache.get(clave)
+        if superficie is not None:
+            self._text_cache.move_to_end(clave)
+            self.text_cache_hits += 1
+            return superficie
+        self.text_cache_misses += 1
+        superficie = font.render(texto, True, color)
+        self._text_cache[clave] = superficie
+        if len(self._text_cache) > TEXT_CACHE_SIZE:
+            self._text_cache.popitem(last=False)
+        return superficie
+
+    def text_cache_hit_rate(self):
+        """Proporción de textos servidos desde la cache."""
+        total = self.text_cache_hits + self.text_cache_misses
+        return self.text_cache_hits / total if total else 0.0
 
     # --- utilidades de geometría ---
     def _col_x(self, col: int) -> float:
@@ -57,7 +125,14 @@ class BoardView:
 
     # ------------------------------------------------------------------
     def draw_board(self, screen):
-        """Dibuja el fondo y los triángulos del tablero."""
+        """Dibuja el fondo y los triángulos del tablero desde la superficie cacheada."""
+        if self._board_surface is None:
+            self._board_surface = pygame.Surface((self.width, self.height)).convert()
+            self._render_board(self._board_surface)
+        screen.blit(self._board_surface, (0, 0))
+
+    def _render_board(self, screen):
+        """Dibuja el tablero estático (fondo, triángulos, barra, bandeja y números)."""
         screen.fill(BEIGE)
 
         tablero_top = self.margin
@@ -107,7 +182,7 @@ class BoardView:
 
         # Números de posiciones
         for i in range(12):
-            num = self.font.render(str(12 - i), True, BLACK)
+            num = self.render_text(self.font, str(12 - i))
             screen.blit(num, (self._col_x(i) + 10, tablero_top + 5))
 
         # Números inferiores por encima de la barra de mensajes
@@ -115,9 +190,69 @@ class BoardView:
             self.height - self.message_bar_height - self.bottom_labels_band + 18
         )
         for i in range(12):
-            num = self.font.render(str(13 + i), True, BLACK)
+            num = self.render_text(self.font, str(13 + i))
             screen.blit(num, (self._col_x(i) + 10, bottom_num_y))
 
+    # --- regiones para el render por rectángulos sucios ---
+    def regiones(self, game, message, dados, destinos, nombres=("", ""), winner_text=None,
+                 hover=None):
+        """Contenido visible de cada región de la pantalla de juego.
+
+        Devuelve un dict {clave: contenido}; las claves son índices de punto
+        (0-23), 'barra', 'bandeja', 'dados', 'mensaje', 'nombres' y 'fin'.
+        Una región está sucia cuando su contenido cambia entre dos cuadros.
+        """
+        contenido = {}
+        for i, fichas in enumerate(game.get_tablero()):
+            color = fichas[0].obtener_color() if fichas else None
+            contenido[i] = (len(fichas), color, i in destinos, hover == i)
+        contenido["barra"] = (
+            game.fichas_en_barra("blanca"), game.fichas_en_barra("negra"), hover == "barra"
+        )
+        contenido["bandeja"] = (
+            game.fichas_fuera("blanca"), game.fichas_fuera("negra"), "off" in destinos,
+            hover == "off",
+        )
+        contenido["dados"] = tuple(dados[:4])
+        contenido["mensaje"] = message
+        contenido["nombres"] = tuple(nombres)
+        contenido["fin"] = winner_text
+        return contenido
+
+    def region_rect(self, clave):
+        """Rectángulo de pantalla que ocupa una región de ``regiones``."""
+        tablero_top = self.margin
+        tablero_bottom = self.height - self.message_bar_height - self.bottom_labels_band
+        tablero_height = tablero_bottom - tablero_top
+        if isinstance(clave, int):
+            # Media columna completa: triángulo, pila de fichas y resaltado
+            medio = (tablero_top + self.top_labels_band + tablero_bottom) // 2
+            if clave < 12:
+                x, top, bottom = self._col_x(11 - clave), medio, tablero_bottom
+            else:
+                x, top, bottom = self._col_x(clave - 12), tablero_top, medio
+            return pygame.Rect(int(x), top, int(self.triangle_width) + 1, bottom - top)
+        if clave == "barra":
+            bar_left = self.margin + 6 * self.triangle_width
+            return pygame.Rect(int(bar_left), tablero_top, self.center_bar_width, tablero_height)
+        tray_left = int(self.margin + 12 * self.triangle_width + self.center_bar_width)
+        if clave == "bandeja":
+            return pygame.Rect(tray_left, tablero_top, self.off_tray_width, tablero_height)
+        if clave == "dados":
+            # Caja que envuelve los sprites de todos los dados (misma geometría que draw_dados)
+            centros = self._dice_centers()
+            left = int(min(cx for cx, _ in centros)) - DICE_SIZE // 2 - 1
+            top = int(min(cy for _, cy in centros)) - DICE_SIZE // 2 - 1
+            right = int(max(cx for cx, _ in centros)) + DICE_SIZE // 2 + 2
+            bottom = int(max(cy for _, cy in centros)) + DICE_SIZE // 2 + 2
+            return pygame.Rect(left, top, right - left, bottom - top)
+        if clave == "mensaje":
+            return pygame.Rect(0, self.height - self.message_bar_height,
+                               self.width, self.message_bar_height)
+        if clave == "nombres":
+            return pygame.Rect(0, 0, self.width, self.margin)
+        return pygame.Rect(0, 0, self.width, self.height)
+
     # ------------------------------------------------------------------
     def draw_menu(self, screen, nombre_blancas: str, nombre_negras: str, activo: str, cursor_on: bool):
         """Dibuja la pantalla de menú inicial para ingresar nombres.
@@ -127,14 +262,14 @@ class BoardView:
         """
         screen.fill((235, 225, 195))
 
-        titulo = self.message_font.render("Backgammon", True, BLACK)
-        small = pygame.font.SysFont("arial", 20)
-        subt = small.render("Ingrese nombres y presione ENTER", True, BLACK)
+        titulo = self.render_text(self.message_font, "Backgammon")
+        small = self.small_font
+        subt = self.render_text(small, "Ingrese nombres y presione ENTER")
         screen.blit(titulo, (self.width // 2 - titulo.get_width() // 2, 80))
         screen.blit(subt, (self.width // 2 - subt.get_width() // 2, 120))
 
-        etiqueta1 = small.render("Jugador BLANCAS:", True, BLACK)
-        etiqueta2 = small.render("Jugador NEGRAS:", True, BLACK)
+        etiqueta1 = self.render_text(small, "Jugador BLANCAS:")
+        etiqueta2 = self.render_text(small, "Jugador NEGRAS:")
         screen.blit(etiqueta1, (self.width // 2 - 180, self.height // 2 - 90))
         screen.blit(etiqueta2, (self.width // 2 - 180, self.height // 2 - 20))
 
@@ -153,19 +288,36 @@ class BoardView:
             mostrar = texto
             if es_activo and cursor_on:
                 mostrar += "|"
-            texto_render = self.message_font.render(mostrar or " ", True, BLACK)
+            texto_render = self.render_text(self.message_font, mostrar or " ")
             screen.blit(texto_render, (rect.x + 10, rect.y + 6))
 
-        hint = small.render("TAB cambia de campo | ESC para salir", True, BLACK)
+        hint = self.render_text(small, "TAB cambia de campo | ESC para salir")
         screen.blit(hint, (self.width // 2 - hint.get_width() // 2, self.height - 80))
 
     # ------------------------------------------------------------------
+    def _blit_checker(self, screen, color, x, y):
+        """Dibuja el sprite de una ficha centrado en (x, y)."""
+        sprite = self._checker_sprites.get(color)
+        if sprite is None:
+            radius = self.checker_radius
+            sprite = pygame.Surface((2 * radius + 1, 2 * radius + 1), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            pygame.draw.circle(sprite, GRAY, (radius, radius), radius, 2)
+            self._checker_sprites[color] = sprite
+        offset = self.checker_radius
+        screen.blit(sprite, (int(x) - offset, int(y) - offset))
+
+    def _blit_count(self, screen, count, text_color, center):
+        """Dibuja el número de fichas de una pila centrado en ``center``."""
+        label = self.render_text(self.font, str(count), text_color)
+        screen.blit(label, label.get_rect(center=center))
+
     def draw_checkers(self, screen, game):
         """Dibuja las fichas en puntos, barra central y bandeja de borne-off."""
         board = game.get_tablero()
 
         # puntos 0-11 abajo, 12-23 arriba
-        radius = int(min(self.triangle_width * 0.33, (self.off_tray_width * 0.45)))
+        radius = self.checker_radius
         max_visible = 5
         for i, fichas in enumerate(board):
             count = len(fichas)
@@ -189,17 +341,13 @@ class BoardView:
 
             visibles = min(count, max_visible)
             for j in range(visibles):
-                y = y_base + j * dy
-                pygame.draw.circle(screen, color, (int(x), int(y)), int(radius))
-                pygame.draw.circle(screen, GRAY, (int(x), int(y)), int(radius), 2)
+                self._blit_checker(screen, color, x, y_base + j * dy)
 
             # Si hay más de 5, mostrar número
             if count > max_visible:
                 y = y_base + (max_visible - 1) * dy
                 text_color = BLACK if color == WHITE else WHITE
-                label = self.font.render(str(count), True, text_color)
-                rect = label.get_rect(center=(x, y))
-                screen.blit(label, rect)
+                self._blit_count(screen, count, text_color, (x, y))
 
         # --- BARRA central ---
         try:
@@ -215,13 +363,10 @@ class BoardView:
         y_top_base = self.margin + self.top_labels_band + radius * 1.1
         for j in range(min(max_visible, blancas_en_barra)):
             y = y_top_base + j * (radius * 1.9)
-            pygame.draw.circle(screen, WHITE, (int(cx), int(y)), radius)
-            pygame.draw.circle(screen, GRAY, (int(cx), int(y)), radius, 2)
+            self._blit_checker(screen, WHITE, cx, y)
         if blancas_en_barra > max_visible:
             y = y_top_base + (max_visible - 1) * (radius * 1.9)
-            label = self.font.render(str(blancas_en_barra), True, BLACK)
-            rect = label.get_rect(center=(cx, y))
-            screen.blit(label, rect)
+            self._blit_count(screen, blancas_en_barra, BLACK, (cx, y))
 
         # Bottom (negras) hacia arriba
         y_bottom_base = (
@@ -229,13 +374,10 @@ class BoardView:
         )
         for j in range(min(max_visible, negras_en_barra)):
             y = y_bottom_base - j * (radius * 1.9)
-            pygame.draw.circle(screen, BLACK, (int(cx), int(y)), radius)
-            pygame.draw.circle(screen, GRAY, (int(cx), int(y)), radius, 2)
+            self._blit_checker(screen, BLACK, cx, y)
         if negras_en_barra > max_visible:
             y = y_bottom_base - (max_visible - 1) * (radius * 1.9)
-            label = self.font.render(str(negras_en_barra), True, WHITE)
-            rect = label.get_rect(center=(cx, y))
-            screen.blit(label, rect)
+            self._blit_count(screen, negras_en_barra, WHITE, (cx, y))
 
         # --- Bandeja de BORNE-OFF derecha ---
         try:
@@ -251,13 +393,10 @@ class BoardView:
         y_base_top = self.margin + radius * 1.1
         for j in range(min(max_visible, fuera_negras)):
             y = y_base_top + j * (radius * 1.9)
-            pygame.draw.circle(screen, BLACK, (int(tray_center_x), int(y)), radius)
-            pygame.draw.circle(screen, GRAY, (int(tray_center_x), int(y)), radius, 2)
+            self._blit_checker(screen, BLACK, tray_center_x, y)
         if fuera_negras > max_visible:
             y = y_base_top + (max_visible - 1) * (radius * 1.9)
-            label = self.font.render(str(fuera_negras), True, WHITE)
-            rect = label.get_rect(center=(tray_center_x, y))
-            screen.blit(label, rect)
+            self._blit_count(screen, fuera_negras, WHITE, (tray_center_x, y))
 
         # Blancas abajo (hacia arriba)
         y_base_bottom = (
@@ -265,13 +404,10 @@ class BoardView:
         )
         for j in range(min(max_visible, fuera_blancas)):
             y = y_base_bottom - j * (radius * 1.9)
-            pygame.draw.circle(screen, WHITE, (int(tray_center_x), int(y)), radius)
-            pygame.draw.circle(screen, GRAY, (int(tray_center_x), int(y)), radius, 2)
+            self._blit_checker(screen, WHITE, tray_center_x, y)
         if fuera_blancas > max_visible:
             y = y_base_bottom - (max_visible - 1) * (radius * 1.9)
-            label = self.font.render(str(fuera_blancas), True, BLACK)
-            rect = label.get_rect(center=(tray_center_x, y))
-            screen.blit(label, rect)
+            self._blit_count(screen, fuera_blancas, BLACK, (tray_center_x, y))
 
     # ------------------------------------------------------------------
     def draw_message_bar(self, screen, message):
@@ -287,7 +423,7 @@ class BoardView:
             (self.width, self.height - self.message_bar_height),
             2,
         )
-        text = self.message_font.render(message, True, BLACK)
+        text = self.render_text(self.message_font, message)
         rect = text.get_rect(
             center=(self.width // 2, self.height - self.message_bar_height // 2)
         )
@@ -295,7 +431,36 @@ class BoardView:
 
     # ------------------------------------------------------------------
     def get_point_from_mouse(self, pos):
-        """Traduce un clic en coordenadas a índice de punto (0–23)."""
+        """Traduce coordenadas de pantalla a punto (0–23), 'barra', 'off' o None.
+
+        Consulta en O(1) una grilla de celdas de ``HIT_GRID_CELL`` píxeles que
+        se arma una sola vez por tamaño de pantalla, así puede usarse en cada
+        movimiento del mouse.
+        """
+        x, y = int(pos[0]), int(pos[1])
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        if self._hit_grid is None:
+            self._hit_grid = self._build_hit_grid()
+        codigo = self._hit_grid[(y // HIT_GRID_CELL) * self._hit_cols + x // HIT_GRID_CELL]
+        return None if codigo == _HIT_NONE else _HIT_VALUES[codigo]
+
+    def _build_hit_grid(self):
+        """Evalúa la geometría en el centro de cada celda de la grilla."""
+        filas = -(-self.height // HIT_GRID_CELL)
+        grilla = bytearray(filas * self._hit_cols)
+        medio = HIT_GRID_CELL // 2
+        for fila in range(filas):
+            y = fila * HIT_GRID_CELL + medio
+            for col in range(self._hit_cols):
+                punto = self._point_from_geometry((col * HIT_GRID_CELL + medio, y))
+                grilla[fila * self._hit_cols + col] = (
+                    _HIT_NONE if punto is None else _HIT_CODES[punto]
+                )
+        return grilla
+
+    def _point_from_geometry(self, pos):
+        """Traduce un clic en coordenadas a índice de punto (0–23) calculando la geometría."""
         x, y = pos
         tablero_top = self.margin
         tablero_bottom = self.height - self.message_bar_height - self.bottom_labels_band
@@ -342,6 +507,35 @@ class BoardView:
         else:
             return 11 - col
 
+    # ------------------------------------------------------------------
+    def _dice_sprite(self, valor, size):
+        """Cara de dado pre-renderizada (se dibuja una vez por valor)."""
+        sprite = self._dice_sprites.get((valor, size))
+        if sprite is not None:
+            return sprite
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+        rect = sprite.get_rect()
+        pygame.draw.rect(sprite, WHITE, rect, border_radius=4)
+        pygame.draw.rect(sprite, BLACK, rect, 2, border_radius=4)
+
+        # Puntos (pips)
+        r = 3
+        ox, oy = rect.left + size * 0.25, rect.top + size * 0.25
+        mx, my = rect.centerx, rect.centery
+        px, py = rect.right - size * 0.25, rect.bottom - size * 0.25
+        posiciones = {
+            1: [(mx, my)],
+            2: [(ox, oy), (px, py)],
+            3: [(ox, oy), (mx, my), (px, py)],
+            4: [(ox, oy), (px, oy), (ox, py), (px, py)],
+            5: [(ox, oy), (px, oy), (mx, my), (ox, py), (px, py)],
+            6: [(ox, oy), (px, oy), (ox, my), (px, my), (ox, py), (px, py)],
+        }
+        for (pxx, pyy) in posiciones.get(valor, []):
+            pygame.draw.circle(sprite, BLACK, (int(pxx), int(pyy)), r)
+        self._dice_sprites[(valor, size)] = sprite
+        return sprite
+
     # ------------------------------------------------------------------
     def draw_dados(self, screen, valores):
         """Dibuja un pequeño panel de dados en la bandeja derecha.
@@ -350,59 +544,31 @@ class BoardView:
         """
         if not valores:
             return
+        for (cx, cy), val in zip(self._dice_centers(), valores[:DICE_MAX]):
+            sprite = self._dice_sprite(int(val), DICE_SIZE)
+            screen.blit(sprite, sprite.get_rect(center=(cx, cy)))
 
-        tablero_top = self.margin
-        tablero_bottom = self.height - self.message_bar_height - self.bottom_labels_band
+    def _dice_centers(self):
+        """Centros de los ``DICE_MAX`` dados, en columnas dentro de la bandeja."""
         tray_left = self.margin + 12 * self.triangle_width + self.center_bar_width
         tray_center_x = tray_left + self.off_tray_width / 2
-
-        # Dimensiones de dado
-        size = 26
-        gap = 8
-        start_y = tablero_top + 10
-
-        def dibujar_dado(cx, cy, valor):
-            rect = pygame.Rect(0, 0, size, size)
-            rect.center = (cx, cy)
-            pygame.draw.rect(screen, WHITE, rect, border_radius=4)
-            pygame.draw.rect(screen, BLACK, rect, 2, border_radius=4)
-
-            # Puntos (pips)
-            r = 3
-            ox, oy = rect.left + size * 0.25, rect.top + size * 0.25
-            mx, my = rect.centerx, rect.centery
-            px, py = rect.right - size * 0.25, rect.bottom - size * 0.25
-            posiciones = {
-                1: [(mx, my)],
-                2: [(ox, oy), (px, py)],
-                3: [(ox, oy), (mx, my), (px, py)],
-                4: [(ox, oy), (px, oy), (ox, py), (px, py)],
-                5: [(ox, oy), (px, oy), (mx, my), (ox, py), (px, py)],
-                6: [(ox, oy), (px, oy), (ox, my), (px, my), (ox, py), (px, py)],
-            }
-            for (pxx, pyy) in posiciones.get(int(valor), []):
-                pygame.draw.circle(screen, BLACK, (int(pxx), int(pyy)), r)
-
-        # Distribuir los dados en columnas dentro de la bandeja
-        cols = 2
-        for idx, val in enumerate(valores[:4]):
-            col = idx % cols
-            row = idx // cols
-            cx = tray_center_x + (col - 0.5) * (size + gap)
-            cy = start_y + row * (size + gap)
-            dibujar_dado(cx, cy, val)
+        start_y = self.margin + DICE_TOP_OFFSET
+        paso = DICE_SIZE + DICE_GAP
+        return [
+            (tray_center_x + (idx % DICE_COLS - 0.5) * paso, start_y + (idx // DICE_COLS) * paso)
+            for idx in range(DICE_MAX)
+        ]
 
     # ------------------------------------------------------------------
-    def draw_highlights(self, screen, indices):
-        """Dibuja indicadores VERDES en forma de rectángulo translúcido que
-        cubren el área completa de la posición (triángulo) para que se vean más.
+    def _highlight_sprite(self, i, color=None):
+        """(sprite, posición) translúcido para el destino ``i``, o None si no es válido.
 
-        indices: lista de índices de punto (0-23) válidos para mover.
+        Cubre el área completa de la posición (triángulo), de la barra o de la
+        bandeja para 'off'. Sin ``color`` se usa verde para puntos y azul para
+        'off'. Se construye una sola vez por destino, color y tamaño de pantalla.
         """
-        if not indices:
-            return
-
-        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        if (i, color) in self._highlight_sprites:
+            return self._highlight_sprites[(i, color)]
         verde = (50, 200, 80, 90)   # Destinos a puntos
         azul  = (80, 140, 255, 90)  # Destino especial 'off' (bandeja)
 
@@ -410,47 +576,72 @@ class BoardView:
         tablero_bottom = self.height - self.message_bar_height - self.bottom_labels_band
         top_y = tablero_top + self.top_labels_band
 
-        for i in indices:
-            # Destino especial: bandeja de borne-off ("off")
-            if i == 'off':
-                tray_left = self.margin + 12 * self.triangle_width + self.center_bar_width
-                rect = pygame.Rect(
-                    int(tray_left) + 3,
-                    int(tablero_top) + 3,
-                    int(self.off_tray_width) - 6,
-                    int(tablero_bottom - tablero_top) - 6,
-                )
-                pygame.draw.rect(overlay, azul, rect)
-                continue
-
-            if not isinstance(i, int) or i < 0 or i > 23:
-                continue
+        if i == 'off':
+            # Destino especial: bandeja de borne-off
+            tray_left = self.margin + 12 * self.triangle_width + self.center_bar_width
+            rect = pygame.Rect(
+                int(tray_left) + 3,
+                int(tablero_top) + 3,
+                int(self.off_tray_width) - 6,
+                int(tablero_bottom - tablero_top) - 6,
+            )
+            relleno = azul
+        elif i == 'barra':
+            bar_left = self.margin + 6 * self.triangle_width
+            rect = pygame.Rect(
+                int(bar_left) + 3,
+                int(tablero_top) + 3,
+                int(self.center_bar_width) - 6,
+                int(tablero_bottom - tablero_top) - 6,
+            )
+            relleno = verde
+        elif not isinstance(i, int) or i < 0 or i > 23:
+            return None
+        elif i < 12:
+            # fila inferior: el triángulo ocupa la parte baja
+            x = self._col_x(11 - i)
+            rect = pygame.Rect(
+                int(x) + 1,
+                int(tablero_bottom - self.triangle_height) + 1,
+                int(self.triangle_width) - 2,
+                int(self.triangle_height) - 2,
+            )
+            relleno = verde
+        else:
+            # fila superior: el triángulo ocupa desde top_y hacia abajo
+            x = self._col_x(i - 12)
+            rect = pygame.Rect(
+                int(x) + 1,
+                int(top_y) + 1,
+                int(self.triangle_width) - 2,
+                int(self.triangle_height) - 2,
+            )
+            relleno = verde
 
-            if i < 12:
-                # fila inferior: el triángulo ocupa la parte baja
-                col = 11 - i
-                x = self._col_x(col)
-                base_y = tablero_bottom
-                rect = pygame.Rect(
-                    int(x) + 1,
-                    int(base_y - self.triangle_height) + 1,
-                    int(self.triangle_width) - 2,
-                    int(self.triangle_height) - 2,
-                )
-            else:
-                # fila superior: el triángulo ocupa desde top_y hacia abajo
-                col = i - 12
-                x = self._col_x(col)
-                rect = pygame.Rect(
-                    int(x) + 1,
-                    int(top_y) + 1,
-                    int(self.triangle_width) - 2,
-                    int(self.triangle_height) - 2,
-                )
+        sprite = pygame.Surface(rect.size, pygame.SRCALPHA)
+        sprite.fill(color or relleno)
+        self._highlight_sprites[(i, color)] = (sprite, rect.topleft)
+        return self._highlight_sprites[(i, color)]
 
-            pygame.draw.rect(overlay, verde, rect)
+    def draw_highlights(self, screen, indices):
+        """Dibuja indicadores VERDES en forma de rectángulo translúcido que
+        cubren el área completa de la posición (triángulo) para que se vean más.
 
-        screen.blit(overlay, (0, 0))
+        indices: lista de índices de punto (0-23) válidos para mover, o 'off'.
+        Solo se dibujan los rectángulos pre-construidos de esos destinos.
+        """
+        for i in indices or ():
+            resaltado = self._highlight_sprite(i)
+            if resaltado is not None:
+                screen.blit(*resaltado)
+
+    def draw_hover(self, screen, punto):
+        """Aclara la posición bajo el mouse (punto, 'barra' u 'off')."""
+        if punto is None:
+            return
+        resaltado = self._highlight_sprite(punto, HOVER)
+        if resaltado is not None:
+            screen.blit(*resaltado)
 
     # ------------------------------------------------------------------
     def draw_names(self, screen, nombre_blancas: str, nombre_negras: str):
@@ -462,11 +653,11 @@ class BoardView:
         top_y = 8  # dentro del margen superior (fuera del tablero)
 
         if nombre_negras:
-            txt = self.message_font.render(f"Negras: {nombre_negras}", True, BLACK)
+            txt = self.render_text(self.message_font, f"Negras: {nombre_negras}")
             screen.blit(txt, (self.margin, top_y))
 
         if nombre_blancas:
-            txt = self.message_font.render(f"Blancas: {nombre_blancas}", True, BLACK)
+            txt = self.render_text(self.message_font, f"Blancas: {nombre_blancas}")
             x = self.width - self.margin - txt.get_width()
             screen.blit(txt, (x, top_y))
 
@@ -484,10 +675,9 @@ class BoardView:
         panel.center = (self.width // 2, (tablero_top + tablero_bottom) // 2)
         pygame.draw.rect(overlay, (245, 235, 210, 255), panel, border_radius=12)
         pygame.draw.rect(overlay, BLACK, panel, 3, border_radius=12)
-        big = pygame.font.SysFont("arial", 32, bold=True)
-        txt = big.render(winner_text, True, BLACK)
-        small = pygame.font.SysFont("arial", 20)
-        sub = small.render("Presione ENTER o ESC para salir", True, BLACK)
+        txt = self.render_text(self.big_font, winner_text)
+        small = self.small_font
+        sub = self.render_text(small, "Presione ENTER o ESC para salir")
         overlay.blit(txt, (panel.centerx - txt.get_width() // 2, panel.y + 36))
         overlay.blit(sub, (panel.centerx - sub.get_width() // 2, panel.y + 86))
         screen.blit(overlay, (0, 0))
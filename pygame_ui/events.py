@@ -1,5 +1,16 @@
 import pygame
-from core.game import Game
+from core.excepcions import BackgammonError
+from core.game import Game, FASE_TERMINADA
+
+
+def formatear_jugada(jugada) -> str:
+	"""Texto de una jugada con la numeración del tablero (1-24, BARRA, OFF)."""
+	partes = []
+	for origen, destino, _ in jugada:
+		desde = "BARRA" if origen == 'barra' else str(origen + 1)
+		hasta = "OFF" if destino == 'off' else str(destino + 1)
+		partes.append(f"{desde}/{hasta}")
+	return " ".join(partes) or "sin movimientos"
 
 
 class UIState:
@@ -24,10 +35,14 @@ class UIState:
 		# Interacción de turno
 		self.selected_point = None  # int | 'barra' | None
 		self.destinos_posibles = []  # lista de int o 'off'
+		self.hover_point = None  # int | 'barra' | 'off' | None bajo el mouse
 		self.message = "Presione ESPACIO para tirar los dados."
 		self.dados_actuales: list[int] = []
 		self.puede_tirar = True
 
+		# Sugerencia de la IA (se calcula en segundo plano)
+		self.pensando = False
+
 		# Control del main loop
 		self.should_quit = False
 
@@ -36,62 +51,79 @@ class EventHandler:
 	"""Maneja eventos de Pygame y actualiza el UIState.
 
 	- Detecta clics y teclas (detección de eventos de interacción).
-	- Invoca métodos del `Game` para ejecutar jugadas.
+	- Invoca la API por pasos del `Game` (roll / play / end_turn) para jugar.
 	- Calcula destinos posibles y cambios de turno.
+	- Pide sugerencias (tecla H) a un `AIWorker` opcional sin bloquear el bucle.
 	"""
 
-	def __init__(self, board_view, state: UIState):
+	def __init__(self, board_view, state: UIState, worker=None):
 		self.board_view = board_view
 		self.state = state
+		self.worker = worker
+		# Trabajo de sugerencia en curso: (id, versión de la partida) o None
+		self._sugerencia = None
+		# Memo de _hay_movimientos_posibles: ((game, versión, dados), resultado)
+		self._memo_movimientos = (None, False)
 
 	# --------------------- Utilidades de reglas/estado ---------------------
 	def _hay_movimientos_posibles(self) -> bool:
+		"""Indica si hay movimientos; se recalcula solo si cambió la partida o los dados."""
 		state = self.state
 		game = state.game
-		dados = state.dados_actuales
-		if not game or not dados:
-			return False
-		color = game.get_turno().get_color()
-		tablero = game.get_tablero()
-
-		# Si hay fichas en barra, solo reingreso
-		if game.fichas_en_barra(color) > 0:
-			for d in set(dados):
-				destino = (d - 1) if color == 'blanca' else (24 - d)
-				if 0 <= destino <= 23:
-					cont = tablero[destino]
-					if not (cont and cont[0].obtener_color() != color and len(cont) > 1):
-						return True
+		if not game or not state.dados_actuales:
 			return False
+		clave = (game, game.get_version(), tuple(state.dados_actuales))
+		memo_clave, resultado = self._memo_movimientos
+		if memo_clave != clave:
+			resultado = game.hay_movimientos_posibles(state.dados_actuales)
+			self._memo_movimientos = (clave, resultado)
+		return resultado
+
+	# ----------------------- Sugerencias en segundo plano -----------------------
+	def solicitar_sugerencia(self):
+		"""Envía la posición actual al worker y pasa al estado "pensando"."""
+		s = self.state
+		if self.worker is None or s.game is None or not s.dados_actuales or s.game_over:
+			return
+		game = s.game
+		trabajo = self.worker.enviar(
+			game.posicion_compacta(), game.get_turno().get_color(), s.dados_actuales
+		)
+		self._sugerencia = (trabajo, game.get_version())
+		s.pensando = True
+		s.message = "Pensando sugerencia..."
+
+	def poll_ai(self):
+		"""Revisa sin bloquear si llegó la sugerencia pedida.
+
+		Si la partida cambió desde el pedido (el usuario movió o tiró antes),
+		cancela la búsqueda en lugar de mostrar un resultado viejo.
+		"""
+		if self._sugerencia is None:
+			return
+		s = self.state
+		trabajo, version = self._sugerencia
+		if s.game is None or s.game.get_version() != version or s.game_over:
+			self.worker.cancelar()
+			self._sugerencia = None
+			s.pensando = False
+			return
+		resultado = self.worker.resultado(trabajo)
+		if resultado is None:
+			return
+		jugada, valor = resultado
+		self._sugerencia = None
+		s.pensando = False
+		s.message = f"Sugerencia: {formatear_jugada(jugada)} (equidad {valor:+.2f})"
 
-		# Movimiento normal sobre el tablero
-		for i, fichas in enumerate(tablero):
-			if not fichas:
-				continue
-			if fichas[0].obtener_color() != color:
-				continue
-			for d in set(dados):
-				destino = i + d if color == 'blanca' else i - d
-				if 0 <= destino <= 23:
-					cont = tablero[destino]
-					if not (cont and cont[0].obtener_color() != color and len(cont) > 1):
-						return True
-
-		# Borne-off si todas en home
-		if game.todas_fichas_en_home() and dados:
-			if color == 'blanca':
-				for i in range(18, 24):
-					if tablero[i] and tablero[i][0].obtener_color() == 'blanca':
-						needed = 24 - i
-						if any(d >= needed for d in dados):
-							return True
-			else:
-				for i in range(0, 6):
-					if tablero[i] and tablero[i][0].obtener_color() == 'negra':
-						needed = i + 1
-						if any(d >= needed for d in dados):
-							return True
-		return False
+	def _pasar_turno(self):
+		"""Cierra el turno con ``end_turn`` y prepara la UI para el rival."""
+		s = self.state
+		s.game.end_turn()
+		self._reset_seleccion()
+		s.dados_actuales = []
+		s.puede_tirar = True
+		s.message = f"Turno de {s.game.get_turno().get_color()}. Presione ESPACIO para tirar los dados."
 
 	def _reset_seleccion(self):
 		self.state.selected_point = None
@@ -145,23 +177,32 @@ class EventHandler:
 							s.nombre_negras += ch
 				return
 
+			# Juego: pedir sugerencia con H
+			if event.key == pygame.K_h and s.mode == "game":
+				if not s.dados_actuales:
+					s.message = "Tire los dados (ESPACIO) antes de pedir una sugerencia."
+				else:
+					self.solicitar_sugerencia()
+				return
+
 			# Juego: tirar dados con ESPACIO
 			if event.key == pygame.K_SPACE and s.mode == "game":
 				if not s.puede_tirar:
 					s.message = "Ya tiraste los dados este turno."
 				else:
-					s.dados_actuales = s.game.tirar_dados()
+					s.dados_actuales = s.game.roll()["dados"]
 					s.puede_tirar = False
 					s.message = f"{s.game.mostrar_turno_actual()} - Dados: {s.dados_actuales}"
 					if not self._hay_movimientos_posibles():
-						s.message = f"{s.game.mostrar_turno_actual()} - Sin movimientos posibles. Cambio de turno."
-						s.game.cambiar_turno()
-						self._reset_seleccion()
-						s.dados_actuales = []
-						s.puede_tirar = True
-						s.message = f"Turno de {s.game.get_turno().get_color()}. Presione ESPACIO para tirar los dados."
+						self._pasar_turno()
 				return
 
+		# Hover: la grilla de BoardView resuelve el punto en O(1)
+		if event.type == pygame.MOUSEMOTION:
+			if s.mode == "game" and not s.game_over:
+				s.hover_point = self.board_view.get_point_from_mouse(event.pos)
+			return
+
 		# Clics de mouse
 		if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
 			if s.game_over:
@@ -199,26 +240,12 @@ class EventHandler:
 					s.selected_point = punto
 					s.message = "Seleccionado origen: BARRA" if punto == 'barra' else f"Seleccionado origen: {punto+1}"
 
-					# Calcular destinos posibles
+					# Calcular destinos posibles (incluye 'off' para borne-off)
 					s.destinos_posibles = []
 					if s.dados_actuales:
-						tablero = s.game.get_tablero()
-						for d in set(s.dados_actuales):
-							if punto == 'barra':
-								destino = (d - 1) if color == 'blanca' else (24 - d)
-							else:
-								destino = punto + d if color == 'blanca' else punto - d
-							if 0 <= destino <= 23:
-								cont = tablero[destino]
-								if cont and cont[0].obtener_color() != color and len(cont) > 1:
-									continue
+						for origen, destino, _ in s.game.movimientos_legales(s.dados_actuales):
+							if origen == punto and destino not in s.destinos_posibles:
 								s.destinos_posibles.append(destino)
-
-						# opção de borne-off
-						if isinstance(punto, int) and s.game.todas_fichas_en_home() and s.dados_actuales:
-							needed = (24 - punto) if color == 'blanca' else (punto + 1)
-							if any(d >= needed for d in s.dados_actuales):
-								s.destinos_posibles.append('off')
 					return
 
 				# Segundo clic: elegir destino y ejecutar
@@ -273,44 +300,37 @@ class EventHandler:
 					self._reset_seleccion()
 					return
 
+				movimiento = (s.selected_point, destino, valor_dado)
+				if movimiento not in s.game.movimientos_legales(s.dados_actuales):
+					s.message = "Movimiento no permitido: debes usar ambos dados (o el mayor) si es posible."
+					self._reset_seleccion()
+					return
+
 				# Ejecutar
 				origen_param = s.selected_point
-				destino_param = destino
-				if destino == 'off':
-					ok, msg = s.game.ejecutar_bearing_off(origen_param, valor_dado)
-				else:
-					ok, msg = s.game.ejecutar_movimiento_completo(origen_param, destino_param, valor_dado)
-
-				if ok:
-					s.dados_actuales = s.game.get_dados_disponibles()
-					if s.selected_point == 'barra':
-						s.message = f"Reingreso desde BARRA a {destino+1} (dado {valor_dado}) OK"
-					elif destino == 'off':
-						s.message = f"Sacaste ficha de {origen_param+1} (dado {valor_dado}) OK"
-					else:
-						s.message = f"Movimiento {origen_param+1}->{destino_param+1} ({valor_dado}) OK"
+				try:
+					estado = s.game.play(movimiento)
+				except BackgammonError as error:
+					s.message = str(error) or "Movimiento no permitido."
+					self._reset_seleccion()
+					return
 
-					if s.game.verificar_victoria():
-						ganador_color = s.game.get_turno().get_color()
-						ganador_nombre = s.nombre_blancas if ganador_color == 'blanca' else s.nombre_negras
-						s.winner_text = f"Ganó {ganador_nombre} ({ganador_color.upper()})"
-						s.game_over = True
-					else:
-						if not s.dados_actuales:
-							s.game.cambiar_turno()
-							self._reset_seleccion()
-							s.puede_tirar = True
-							s.message = f"Turno de {s.game.get_turno().get_color()}. Presione ESPACIO para tirar los dados."
-						else:
-							if not self._hay_movimientos_posibles():
-								s.message = f"{s.game.mostrar_turno_actual()} - Sin movimientos posibles. Cambio de turno."
-								s.game.cambiar_turno()
-								self._reset_seleccion()
-								s.dados_actuales = []
-								s.puede_tirar = True
-								s.message = f"Turno de {s.game.get_turno().get_color()}. Presione ESPACIO para tirar los dados."
+				s.dados_actuales = estado["dados"]
+				if origen_param == 'barra':
+					s.message = f"Reingreso desde BARRA a {destino+1} (dado {valor_dado}) OK"
+				elif destino == 'off':
+					s.message = f"Sacaste ficha de {origen_param+1} (dado {valor_dado}) OK"
 				else:
-					s.message = msg
+					s.message = f"Movimiento {origen_param+1}->{destino+1} ({valor_dado}) OK"
+
+				if estado["fase"] == FASE_TERMINADA:
+					ganador_color = estado["ganador"]
+					ganador_nombre = s.nombre_blancas if ganador_color == 'blanca' else s.nombre_negras
+					s.winner_text = f"Ganó {ganador_nombre} ({ganador_color.upper()})"
+					s.game_over = True
+				elif not self._hay_movimientos_posibles():
+					# Sin dados o sin movimientos con los que quedan: cierra el turno
+					self._pasar_turno()
 
 				self._reset_seleccion()
 
@@ -328,8 +348,4 @@ class EventHandler:
 			else:
 				aviso = "Sin movimientos posibles. Pierdes el turno."
 			s.message = f"{s.game.mostrar_turno_actual()} - {aviso}"
-			s.game.cambiar_turno()
-			self._reset_seleccion()
-			s.dados_actuales = []
-			s.puede_tirar = True
-			s.message = f"Turno de {s.game.get_turno().get_color()}. Presione ESPACIO para tirar los dados."
+			self._pasar_turno()
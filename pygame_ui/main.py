@@ -1,12 +1,41 @@
 import pygame
+from core.worker import AIWorker
 from pygame_ui.board_renderer import BoardView
 from pygame_ui.events import UIState, EventHandler
 
 
 pygame.init()
 
+# Intervalo de parpadeo del cursor del menú y espera máxima sin eventos (ms)
+CURSOR_MS = 500
+ESPERA_MS = 1000
 
-def main():
+# Evento que el hilo de la IA publica al terminar para despertar el bucle
+AI_LISTA = pygame.USEREVENT + 1
+
+
+def draw_game(screen, board_view, state):
+    """Dibuja el cuadro completo de la pantalla de juego."""
+    board_view.draw_board(screen)
+    board_view.draw_highlights(screen, state.destinos_posibles)
+    board_view.draw_hover(screen, state.hover_point)
+    board_view.draw_checkers(screen, state.game)
+    board_view.draw_names(screen, state.nombre_blancas, state.nombre_negras)
+    board_view.draw_message_bar(screen, state.message)
+    board_view.draw_dados(screen, state.dados_actuales)
+    if state.game_over and state.winner_text:
+        board_view.draw_win_overlay(screen, state.winner_text)
+
+
+def main(dirty_rects=True):
+    """Bucle principal de la UI.
+
+    Con ``dirty_rects=True`` solo se redibuja cuando cambia algo visible y se
+    envían a la pantalla únicamente las regiones sucias con
+    ``pygame.display.update(rects)``; sin eventos el bucle queda bloqueado en
+    ``pygame.event.wait``. Con ``False`` se redibuja y se hace ``flip`` de la
+    pantalla completa a 60 Hz.
+    """
     width, height = 900, 600
     screen = pygame.display.set_mode((width, height))
     pygame.display.set_caption("Backgammon (Pygame)")
@@ -14,49 +43,89 @@ def main():
     clock = pygame.time.Clock()
     board_view = BoardView(width, height)
 
-    # Estado y manejador de eventos
+    # Estado y manejador de eventos; la IA busca en un hilo aparte
     state = UIState()
-    handler = EventHandler(board_view, state)
+    worker = AIWorker(al_terminar=lambda _: pygame.event.post(pygame.event.Event(AI_LISTA)))
+    handler = EventHandler(board_view, state, worker)
 
     # Cursor parpadeante para el menú
-    cursor_timer = 0
+    proximo_parpadeo = pygame.time.get_ticks() + CURSOR_MS
     cursor_on = True
 
+    # Último contenido dibujado (None fuerza un cuadro completo)
+    menu_previo = None
+    regiones_previas = None
+
     running = True
     while running:
-        for event in pygame.event.get():
+        if dirty_rects:
+            # Dormir hasta el próximo evento o el próximo parpadeo del cursor
+            espera = ESPERA_MS
+            if state.mode == "menu":
+                espera = max(1, proximo_parpadeo - pygame.time.get_ticks())
+            evento = pygame.event.wait(espera)
+            eventos = [evento] if evento.type != pygame.NOEVENT else []
+            eventos.extend(pygame.event.get())
+        else:
+            eventos = pygame.event.get()
+        for event in eventos:
             handler.handle(event)
         if state.should_quit:
             break
 
         # Salvaguarda: auto-pass si no hay movimientos con dados ya tirados
         handler.auto_pass_if_stuck()
+        # Sugerencia de la IA: consulta sin bloquear
+        handler.poll_ai()
+
+        ahora = pygame.time.get_ticks()
+        if ahora >= proximo_parpadeo:
+            cursor_on = not cursor_on
+            proximo_parpadeo = ahora + CURSOR_MS
 
         # --- Dibujo ---
         if state.mode == "menu":
-            cursor_timer = (cursor_timer + 1) % 30
-            if cursor_timer == 0:
-                cursor_on = not cursor_on
-            board_view.draw_menu(
-                screen,
-                state.nombre_blancas,
-                state.nombre_negras,
-                state.activo,
-                cursor_on,
-            )
+            menu = (state.nombre_blancas, state.nombre_negras, state.activo, cursor_on)
+            if not dirty_rects or menu != menu_previo:
+                board_view.draw_menu(screen, *menu)
+                pygame.display.flip()
+            menu_previo = menu
+            regiones_previas = None
+        elif not dirty_rects:
+            draw_game(screen, board_view, state)
+            pygame.display.flip()
         else:
-            board_view.draw_board(screen)
-            board_view.draw_highlights(screen, state.destinos_posibles)
-            board_view.draw_checkers(screen, state.game)
-            board_view.draw_names(screen, state.nombre_blancas, state.nombre_negras)
-            board_view.draw_message_bar(screen, state.message)
-            board_view.draw_dados(screen, state.dados_actuales)
-            if state.game_over and state.winner_text:
-                board_view.draw_win_overlay(screen, state.winner_text)
-
-        pygame.display.flip()
+            regiones = board_view.regiones(
+                state.game,
+                state.message,
+                state.dados_actuales,
+                state.destinos_posibles,
+                (state.nombre_blancas, state.nombre_negras),
+                state.winner_text if state.game_over else None,
+                state.hover_point,
+            )
+            if regiones_previas is None:
+                draw_game(screen, board_view, state)
+                pygame.display.flip()
+            else:
+                sucias = [
+                    board_view.region_rect(clave)
+                    for clave, contenido in regiones.items()
+                    if regiones_previas.get(clave) != contenido
+                ]
+                if sucias:
+                    # Redibujar solo dentro de las regiones sucias
+                    screen.set_clip(sucias[0].unionall(sucias[1:]))
+                    draw_game(screen, board_view, state)
+                    screen.set_clip(None)
+                    pygame.display.update(sucias)
+            regiones_previas = regiones
+            menu_previo = None
+
         clock.tick(60)
 
+    worker.cerrar(timeout=1)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,299 @@
+"""Servidor asyncio de muchas partidas simultáneas con protocolo JSON-lines.
+
+Cada línea que envía un cliente es un objeto JSON con un comando:
+
+    {"cmd": "join", "sesion": "abc", "color": "blanca"}   unirse (crea la sesión)
+    {"cmd": "roll"}                                        tirar los dados
+    {"cmd": "move", "jugada": [[0, 6, 6], [6, 11, 5]]}     jugada completa
+    {"cmd": "move", "movimiento": ["barra", 3, 4]}         un solo movimiento
+    {"cmd": "state"}                                       pedir el estado
+
+Si el comando trae ``"id"`` la respuesta lo repite. Las respuestas llevan
+``"ok": true`` o ``"ok": false`` con ``"error"``. Después de cada tirada o
+movimiento el servidor envía el estado nuevo a los dos jugadores (al que
+jugó como respuesta, al rival como evento ``"tipo": "estado"``). El turno se
+cierra solo cuando no quedan movimientos legales.
+
+La lógica de cada comando usa la API por pasos de ``Game`` (sin entrada ni
+salida) y tarda microsegundos a pocos milisegundos gracias a la cache de
+jugadas, así que corre directamente en el bucle de eventos. Las partidas viven
+en un ``SessionStore``: las inactivas (o sin jugadores conectados) se guardan
+como instantáneas compactas y se rehidratan solas en el próximo comando o
+``join`` con el mismo id. Uso:
+
+    python -m server.server --port 8765
+    python -m server.server --unix /tmp/backgammon.sock
+    python -m server.server --instantaneas /var/tmp/backgammon --inactividad 120
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import uuid
+
+from core.excepcions import BackgammonError, EntradaInvalidaError, TurnoInvalidoError
+from core.game import FASE_MOVER, FASE_TERMINADA
+from server.store import SessionStore
+
+COLORES = ("blanca", "negra")
+
+
+class Sesion:
+    """Las conexiones sentadas en cada color de una partida del almacén."""
+
+    def __init__(self, identificador, almacen):
+        self.id = identificador
+        self.almacen = almacen
+        self.jugadores = {}
+
+    @property
+    def game(self):
+        """``Game`` de la sesión (lo rehidrata si el almacén lo había desalojado)."""
+        return self.almacen.obtener(self.id)
+
+    def estado(self):
+        """Estado serializable de la partida con los movimientos legales."""
+        game = self.game
+        estado = game.status()
+        estado["sesion"] = self.id
+        estado["jugadores"] = sorted(self.jugadores)
+        estado["movimientos"] = (
+            game.movimientos_legales() if estado["fase"] == FASE_MOVER else []
+        )
+        return estado
+
+
+class Conexion:
+    """Un cliente conectado; escribe mensajes JSON de a una línea."""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.sesion = None
+        self.color = None
+
+    def enviar(self, mensaje):
+        """Encola un mensaje sin esperar (el transporte lo envía en segundo plano)."""
+        if not self.writer.is_closing():
+            self.writer.write(json.dumps(mensaje, separators=(",", ":")).encode() + b"\n")
+
+
+class GameServer:
+    """Administra sesiones de ``Game`` por id y atiende conexiones TCP o Unix.
+
+    ``rng`` es el generador de los dados de todas las partidas (p. ej.
+    ``random.Random(semilla)`` para pruebas reproducibles) y se ignora si se
+    pasa ``almacen``. Cada ``barrido`` segundos se desalojan del almacén las
+    partidas inactivas.
+    """
+
+    def __init__(self, rng=None, almacen=None, barrido=30.0):
+        self.sesiones = {}
+        self.almacen = almacen if almacen is not None else SessionStore(
+            rng=rng or random.Random())
+        self.__barrido__ = barrido
+        self.__tarea_barrido__ = None
+        self.__servidores__ = []
+
+    # ----------------------------- red -----------------------------
+    async def iniciar_tcp(self, host="127.0.0.1", port=0):
+        """Escucha en TCP; devuelve el ``asyncio.Server`` (port=0 elige uno libre)."""
+        servidor = await asyncio.start_server(self.atender, host, port)
+        self._registrar(servidor)
+        return servidor
+
+    async def iniciar_unix(self, ruta):
+        """Escucha en un socket Unix; devuelve el ``asyncio.Server``."""
+        servidor = await asyncio.start_unix_server(self.atender, ruta)
+        self._registrar(servidor)
+        return servidor
+
+    def _registrar(self, servidor):
+        self.__servidores__.append(servidor)
+        if self.__tarea_barrido__ is None:
+            self.__tarea_barrido__ = asyncio.ensure_future(self._barrer())
+
+    async def _barrer(self):
+        """Tarea periódica: guarda como instantánea las partidas inactivas."""
+        while True:
+            await asyncio.sleep(self.__barrido__)
+            self.almacen.desalojar_inactivas()
+
+    async def cerrar(self):
+        """Deja de aceptar conexiones y espera a que cierren los servidores."""
+        if self.__tarea_barrido__ is not None:
+            self.__tarea_barrido__.cancel()
+            self.__tarea_barrido__ = None
+        for servidor in self.__servidores__:
+            servidor.close()
+            await servidor.wait_closed()
+        self.__servidores__ = []
+
+    async def atender(self, reader, writer):
+        """Atiende a un cliente: una respuesta por cada línea recibida."""
+        conexion = Conexion(writer)
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                if not linea.strip():
+                    continue
+                conexion.enviar(self.procesar(conexion, linea))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.desconectar(conexion)
+            writer.close()
+
+    # --------------------------- comandos ---------------------------
+    def procesar(self, conexion, linea):
+        """Ejecuta una línea de comando y devuelve la respuesta (dict)."""
+        try:
+            mensaje = json.loads(linea)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return {"ok": False, "error": "JSON inválido"}
+        if not isinstance(mensaje, dict):
+            return {"ok": False, "error": "Se esperaba un objeto JSON"}
+        comando = mensaje.get("cmd")
+        manejador = self.__comandos__.get(comando) if isinstance(comando, str) else None
+        if manejador is None:
+            respuesta = {"ok": False, "error": f"Comando desconocido: {comando}"}
+        else:
+            try:
+                respuesta = manejador(self, conexion, mensaje)
+            except (BackgammonError, TypeError, ValueError, IndexError) as error:
+                respuesta = {"ok": False, "error": str(error) or type(error).__name__}
+        if "id" in mensaje:
+            respuesta["id"] = mensaje["id"]
+        return respuesta
+
+    def _join(self, conexion, mensaje):
+        if conexion.sesion is not None:
+            raise TurnoInvalidoError("La conexión ya está en una sesión")
+        if mensaje.get("color") not in (None,) + COLORES:
+            raise EntradaInvalidaError(f"Color desconocido: {mensaje.get('color')}")
+        identificador = str(mensaje.get("sesion") or uuid.uuid4().hex[:12])
+        sesion = self.sesiones.get(identificador)
+        if sesion is None:
+            if identificador not in self.almacen:
+                self.almacen.crear(identificador)
+            sesion = self.sesiones[identificador] = Sesion(identificador, self.almacen)
+        libres = [c for c in COLORES if c not in sesion.jugadores]
+        color = mensaje.get("color") or (libres[0] if libres else None)
+        if color not in libres:
+            raise TurnoInvalidoError("Ese color ya está ocupado" if libres else "Sesión completa")
+        sesion.jugadores[color] = conexion
+        conexion.sesion, conexion.color = sesion, color
+        self._avisar_rival(conexion, {"tipo": "unido", "color": color})
+        return {"ok": True, "tipo": "unido", "color": color, "estado": sesion.estado()}
+
+    def _state(self, conexion, _mensaje):
+        return {"ok": True, "tipo": "estado", "estado": self._sesion(conexion).estado()}
+
+    def _roll(self, conexion, _mensaje):
+        game = self._en_turno(conexion)
+        tirada = game.roll()["dados"]
+        self._cerrar_turno_si_corresponde(game)
+        return self._difundir(conexion, {"tirada": tirada})
+
+    def _move(self, conexion, mensaje):
+        game = self._en_turno(conexion)
+        jugada = mensaje.get("jugada", mensaje.get("movimiento"))
+        if jugada is None:
+            raise EntradaInvalidaError("Falta 'jugada' o 'movimiento'")
+        game.play(jugada)
+        self._cerrar_turno_si_corresponde(game)
+        return self._difundir(conexion)
+
+    __comandos__ = {"join": _join, "state": _state, "roll": _roll, "move": _move}
+
+    # --------------------------- auxiliares ---------------------------
+    @staticmethod
+    def _sesion(conexion):
+        if conexion.sesion is None:
+            raise TurnoInvalidoError("Primero hay que unirse a una sesión (join)")
+        return conexion.sesion
+
+    def _en_turno(self, conexion):
+        """Game de la sesión, si es el turno del color de esta conexión."""
+        game = self._sesion(conexion).game
+        if game.get_turno().get_color() != conexion.color:
+            raise TurnoInvalidoError("No es tu turno")
+        return game
+
+    @staticmethod
+    def _cerrar_turno_si_corresponde(game):
+        """Pasa el turno cuando ya no queda ningún movimiento legal."""
+        if game.status()["fase"] == FASE_MOVER and not game.movimientos_legales():
+            game.end_turn()
+
+    def _difundir(self, conexion, extra=None):
+        """Arma el estado, lo envía al rival y lo devuelve como respuesta."""
+        evento = {"tipo": "estado", "estado": conexion.sesion.estado()}
+        if extra:
+            evento.update(extra)
+        self._avisar_rival(conexion, evento)
+        return dict(evento, ok=True)
+
+    @staticmethod
+    def _avisar_rival(conexion, evento):
+        for color, otra in conexion.sesion.jugadores.items():
+            if color != conexion.color:
+                otra.enviar(evento)
+
+    def desconectar(self, conexion):
+        """Libera el asiento; cuando no queda nadie la partida pasa a instantánea.
+
+        Una partida terminada sin jugadores se descarta del almacén.
+        """
+        sesion = conexion.sesion
+        if sesion is None:
+            return
+        if sesion.jugadores.get(conexion.color) is conexion:
+            del sesion.jugadores[conexion.color]
+            self._avisar_rival(conexion, {"tipo": "salio", "color": conexion.color})
+        if not sesion.jugadores and self.sesiones.pop(sesion.id, None) is not None:
+            if sesion.game.status()["fase"] == FASE_TERMINADA:
+                self.almacen.descartar(sesion.id)
+            else:
+                try:
+                    self.almacen.desalojar(sesion.id)
+                except OSError:
+                    pass  # queda en memoria; el barrido periódico lo reintenta
+        conexion.sesion = None
+
+
+async def _servir(args):
+    almacen = SessionStore(args.instantaneas, maximo=args.maximo,
+                           inactividad=args.inactividad, rng=random.Random())
+    servidor = GameServer(almacen=almacen)
+    if args.unix:
+        await servidor.iniciar_unix(args.unix)
+    else:
+        await servidor.iniciar_tcp(args.host, args.port)
+    await asyncio.Event().wait()
+
+
+def main(argv=None):
+    """Punto de entrada de ``python -m server.server``."""
+    parser = argparse.ArgumentParser(description="Servidor de partidas de backgammon")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="ruta de socket Unix (en lugar de TCP)")
+    parser.add_argument("--instantaneas",
+                        help="carpeta para las partidas desalojadas (por defecto, en memoria)")
+    parser.add_argument("--maximo", type=int, default=10000,
+                        help="partidas vivas en memoria como máximo")
+    parser.add_argument("--inactividad", type=float, default=300.0,
+                        help="segundos sin uso antes de guardar una partida como instantánea")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_servir(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Almacén de partidas del servidor: calientes en memoria, inactivas en disco.
+
+Cada ``Game`` vivo arrastra tablero, jugadores, dados e historial; con cientos
+de miles de sesiones casi todas esperando a un jugador eso no escala. El
+almacén mantiene en memoria solo las partidas usadas hace poco (a lo sumo
+``maximo``) y las demás las guarda como una instantánea binaria de
+``TAMANO_INSTANTANEA`` bytes: los 28 casilleros de la posición compacta,
+turno, fase, dados restantes, ganador, puntos y versión. ``obtener`` rehidrata
+la partida de forma transparente en el próximo comando.
+
+Las instantáneas van a ``directorio`` (un archivo por sesión, con nombre
+derivado de un hash del id) o, si no se indica, a un diccionario de bytes en
+memoria. Si no se puede escribir una instantánea la partida queda en memoria.
+"""
+
+import hashlib
+import os
+import struct
+import time
+from collections import OrderedDict
+
+from core.game import Game, FASE_TIRAR, FASE_MOVER, FASE_TERMINADA
+
+FORMATO_INSTANTANEA = 1
+_FASES = (FASE_TIRAR, FASE_MOVER, FASE_TERMINADA)
+_GANADORES = (None, "blanca", "negra")
+# versión, 28 casilleros, turno, fase, cantidad de dados, 4 dados, ganador, puntos, versión
+_INSTANTANEA = struct.Struct("<B28bBBB4BBBI")
+TAMANO_INSTANTANEA = _INSTANTANEA.size
+_EXTENSION = ".bgs"
+
+
+def empaquetar(game):
+    """Instantánea binaria compacta de la partida (ver ``desempaquetar``)."""
+    estado = game.status()
+    dados = list(estado["dados"])
+    return _INSTANTANEA.pack(
+        FORMATO_INSTANTANEA,
+        *estado["posicion"],
+        0 if estado["turno"] == "blanca" else 1,
+        _FASES.index(estado["fase"]),
+        len(dados),
+        *(dados + [0] * (4 - len(dados))),
+        _GANADORES.index(estado["ganador"]),
+        estado["puntos"],
+        estado["version"] & 0xFFFFFFFF,
+    )
+
+
+def desempaquetar(datos, rng=None):
+    """Reconstruye un ``Game`` compacto a partir de ``empaquetar(game)``."""
+    campos = _INSTANTANEA.unpack(datos)
+    if campos[0] != FORMATO_INSTANTANEA:
+        raise ValueError(f"Formato de instantánea desconocido: {campos[0]}")
+    turno, fase, cantidad = campos[29:32]
+    game = Game(quiet=True, compacto=True, rng=rng)
+    game.cargar_estado(
+        campos[1:29],
+        turno,
+        fase=_FASES[fase],
+        dados=campos[32:32 + cantidad],
+        ganador=_GANADORES[campos[36]],
+        puntos=campos[37],
+        version=campos[38],
+    )
+    return game
+
+
+class SessionStore:
+    """Partidas por id de sesión con desalojo LRU y por inactividad.
+
+    - ``maximo``: partidas en memoria a la vez; al pasarlo se desaloja la
+      usada hace más tiempo.
+    - ``inactividad``: segundos sin uso tras los cuales ``desalojar_inactivas``
+      guarda la partida como instantánea.
+    - ``rng``: generador de dados de las partidas creadas o rehidratadas.
+    - ``reloj``: función de tiempo (``time.monotonic`` por defecto).
+    """
+
+    def __init__(self, directorio=None, maximo=10000, inactividad=300.0, rng=None,
+                 reloj=time.monotonic):
+        self.__directorio__ = directorio
+        if directorio is not None:
+            os.makedirs(directorio, exist_ok=True)
+        self.__maximo__ = maximo
+        self.__inactividad__ = inactividad
+        self.__rng__ = rng
+        self.__reloj__ = reloj
+        # id -> (game, último uso); el orden es el de uso (el primero es el más viejo)
+        self.__calientes__ = OrderedDict()
+        self.__instantaneas__ = {}
+        self.desalojos = 0
+        self.rehidrataciones = 0
+        self.fallos_escritura = 0
+
+    def __len__(self):
+        return len(self.__calientes__) + len(self.__instantaneas__)
+
+    def __contains__(self, identificador):
+        return identificador in self.__calientes__ or identificador in self.__instantaneas__
+
+    def en_memoria(self):
+        """Cantidad de partidas vivas (sin contar las guardadas como instantánea)."""
+        return len(self.__calientes__)
+
+    def crear(self, identificador):
+        """Crea una partida nueva para la sesión (falla si ya existe)."""
+        if identificador in self:
+            raise KeyError(f"La sesión {identificador} ya existe")
+        game = Game(quiet=True, compacto=True, rng=self.__rng__)
+        self._calentar(identificador, game)
+        return game
+
+    def obtener(self, identificador):
+        """Partida de la sesión, rehidratándola si estaba desalojada.
+
+        Marca la partida como recién usada. Lanza ``KeyError`` si no existe.
+        """
+        entrada = self.__calientes__.get(identificador)
+        if entrada is not None:
+            self.__calientes__[identificador] = (entrada[0], self.__reloj__())
+            self.__calientes__.move_to_end(identificador)
+            return entrada[0]
+        datos = self._leer(identificador)
+        game = desempaquetar(datos, self.__rng__)
+        self.rehidrataciones += 1
+        self._calentar(identificador, game)
+        return game
+
+    def desalojar(self, identificador):
+        """Guarda la partida como instantánea y la saca de memoria.
+
+        Si la escritura falla (``OSError``) la partida sigue en memoria y el
+        error se propaga.
+        """
+        entrada = self.__calientes__.get(identificador)
+        if entrada is None:
+            return
+        self._escribir(identificador, empaquetar(entrada[0]))
+        del self.__calientes__[identificador]
+        self.desalojos += 1
+
+    def _intentar_desalojar(self, identificador):
+        """Como ``desalojar`` pero devuelve False en lugar de propagar ``OSError``."""
+        try:
+            self.desalojar(identificador)
+        except OSError:
+            self.fallos_escritura += 1
+            return False
+        return True
+
+    def desalojar_inactivas(self, ahora=None):
+        """Desaloja las partidas sin uso hace ``inactividad`` segundos; devuelve cuántas.
+
+        Las que no se pueden escribir quedan en memoria para el próximo barrido.
+        """
+        limite = (self.__reloj__() if ahora is None else ahora) - self.__inactividad__
+        viejas = []
+        for identificador, (_, uso) in self.__calientes__.items():
+            if uso > limite:
+                break
+            viejas.append(identificador)
+        return sum(self._intentar_desalojar(identificador) for identificador in viejas)
+
+    def descartar(self, identificador):
+        """Olvida la partida (en memoria y en disco)."""
+        self.__calientes__.pop(identificador, None)
+        if self.__directorio__ is None:
+            self.__instantaneas__.pop(identificador, None)
+        elif self.__instantaneas__.pop(identificador, None) is not None:
+            try:
+                os.remove(self._ruta(identificador))
+            except FileNotFoundError:
+                pass
+
+    def _calentar(self, identificador, game):
+        self.__calientes__[identificador] = (game, self.__reloj__())
+        self.__calientes__.move_to_end(identificador)
+        sobrantes = len(self.__calientes__) - self.__maximo__
+        if sobrantes > 0:
+            for viejo in list(self.__calientes__)[:sobrantes]:
+                self._intentar_desalojar(viejo)
+
+    # ---------------------- instantáneas ----------------------
+    def _ruta(self, identificador):
+        # Hash de largo fijo: el id lo elige el cliente y puede ser arbitrariamente largo
+        nombre = hashlib.sha1(str(identificador).encode("utf-8")).hexdigest() + _EXTENSION
+        return os.path.join(self.__directorio__, nombre)
+
+    def _escribir(self, identificador, datos):
+        if self.__directorio__ is None:
+            self.__instantaneas__[identificador] = datos
+            return
+        ruta = self._ruta(identificador)
+        temporal = ruta + ".tmp"
+        with open(temporal, "wb") as archivo:
+            archivo.write(datos)
+        os.replace(temporal, ruta)
+        # En memoria solo queda la marca de que la sesión existe
+        self.__instantaneas__[identificador] = True
+
+    def _leer(self, identificador):
+        datos = self.__instantaneas__[identificador]
+        if self.__directorio__ is not None:
+            ruta = self._ruta(identificador)
+            with open(ruta, "rb") as archivo:
+                datos = archivo.read()
+            os.remove(ruta)
+        del self.__instantaneas__[identificador]
+        return datos
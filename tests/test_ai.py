@@ -0,0 +1,175 @@
+"""Tests para la búsqueda expectiminimax."""
+# pylint: disable=missing-function-docstring
+
+import random
+import unittest
+from core import ai, movegen, simulate
+from core.board import POSICION_INICIAL, AFUERA_BLANCAS, AFUERA_NEGRAS, BARRA_NEGRAS
+from core.excepcions import BusquedaCanceladaError
+from core.game import Game
+
+
+def _expectimax_sin_poda(posicion, color, dados, plies, motor):
+    """Referencia sin ninguna poda para comparar valores."""
+    mejor = -float("inf")
+    for _, final in movegen.generar_jugadas(posicion, color, dados):
+        valor = motor._estatico(final, color)  # pylint: disable=protected-access
+        if plies > 1 and not ai.puntos_ganados(final, color):
+            rival = "negra" if color == "blanca" else "blanca"
+            valor = -sum(prob * _expectimax_sin_poda(final, rival, tirada, plies - 1, motor)
+                         for tirada, prob in ai.TIRADAS)
+        mejor = max(mejor, valor)
+    return mejor
+
+
+def _posiciones(cantidad, semilla):
+    """Posiciones alcanzables jugando al azar desde la inicial."""
+    rng = random.Random(semilla)
+    posicion = POSICION_INICIAL
+    color = "blanca"
+    resultado = []
+    for _ in range(cantidad):
+        dados = [rng.randint(1, 6), rng.randint(1, 6)]
+        if dados[0] == dados[1]:
+            dados *= 2
+        resultado.append((posicion, color, dados))
+        posicion = rng.choice(movegen.generar_jugadas(posicion, color, dados))[1]
+        color = "negra" if color == "blanca" else "blanca"
+    return resultado
+
+
+class TestTiradas(unittest.TestCase):
+    """Tabla de las 21 tiradas distintas."""
+
+    def test_21_tiradas_que_suman_uno(self):
+        self.assertEqual(len(ai.TIRADAS), 21)
+        self.assertAlmostEqual(sum(prob for _, prob in ai.TIRADAS), 1.0)
+
+    def test_dobles_con_cuatro_dados(self):
+        dobles = [dados for dados, prob in ai.TIRADAS if prob == 1 / 36]
+        self.assertEqual(len(dobles), 6)
+        self.assertIn((3, 3, 3, 3), dobles)
+
+
+class TestEvaluacion(unittest.TestCase):
+    """Evaluación estática y puntos de fin de partida."""
+
+    def test_inicial_es_simetrica(self):
+        self.assertEqual(ai.evaluar_heuristica(POSICION_INICIAL, "blanca"), 0.0)
+
+    def test_negamax(self):
+        for posicion, _, _ in _posiciones(20, 5):
+            self.assertAlmostEqual(ai.evaluar_heuristica(posicion, "blanca"),
+                                   -ai.evaluar_heuristica(posicion, "negra"))
+
+    def test_puntos_ganados(self):
+        posicion = [0] * 28
+        posicion[AFUERA_BLANCAS] = 15
+        posicion[AFUERA_NEGRAS] = 3
+        self.assertEqual(ai.puntos_ganados(posicion, "blanca"), 1)
+        self.assertEqual(ai.puntos_ganados(posicion, "negra"), 0)
+        posicion[AFUERA_NEGRAS] = 0
+        posicion[5] = -15
+        self.assertEqual(ai.puntos_ganados(posicion, "blanca"), 2)
+        posicion[5] = -14
+        posicion[BARRA_NEGRAS] = 1
+        self.assertEqual(ai.puntos_ganados(posicion, "blanca"), 3)
+
+
+class TestExpectimax(unittest.TestCase):
+    """Búsqueda con poda Star1/Star2."""
+
+    def test_profundidad_invalida(self):
+        with self.assertRaises(ValueError):
+            ai.Expectimax(profundidad=0)
+
+    def test_un_ply_es_mejor_estatica(self):
+        motor = ai.Expectimax(profundidad=1)
+        jugada, valor = motor.mejor_jugada(POSICION_INICIAL, "blanca", [6, 5])
+        finales = dict(movegen.generar_jugadas(POSICION_INICIAL, "blanca", [6, 5]))
+        self.assertEqual(valor, max(ai.evaluar_heuristica(f, "blanca") for f in finales.values()))
+        self.assertEqual(ai.evaluar_heuristica(finales[jugada], "blanca"), valor)
+
+    def test_poda_no_cambia_el_valor(self):
+        referencia = ai.Expectimax(profundidad=2)
+        for star2 in (True, False):
+            motor = ai.Expectimax(profundidad=2, star2=star2)
+            for posicion, color, dados in _posiciones(6, 11):
+                esperado = _expectimax_sin_poda(posicion, color, dados, 2, referencia)
+                _, valor = motor.mejor_jugada(posicion, color, dados)
+                self.assertAlmostEqual(valor, esperado)
+
+    def test_cache_de_jugadas_no_cambia_el_resultado(self):
+        cache = movegen.CacheJugadas()
+        sin_cache = ai.Expectimax(profundidad=2)
+        con_cache = ai.Expectimax(profundidad=2, cache=cache)
+        for posicion, color, dados in _posiciones(3, 5) * 2:
+            self.assertEqual(con_cache.mejor_jugada(posicion, color, dados),
+                             sin_cache.mejor_jugada(posicion, color, dados))
+        self.assertGreaterEqual(cache.tasa_aciertos(), 0.5)
+
+    def test_detener_corta_la_busqueda(self):
+        motor = ai.Expectimax(profundidad=2)
+        with self.assertRaises(BusquedaCanceladaError):
+            motor.mejor_jugada(POSICION_INICIAL, "blanca", [6, 5], detener=lambda: True)
+        # Sin nodos de azar (1 ply) no hay nada que cortar
+        uno = ai.Expectimax(profundidad=1)
+        self.assertEqual(uno.mejor_jugada(POSICION_INICIAL, "blanca", [6, 5], detener=lambda: True),
+                         uno.mejor_jugada(POSICION_INICIAL, "blanca", [6, 5]))
+        esperado = ai.Expectimax(profundidad=2).mejor_jugada(POSICION_INICIAL, "blanca", [6, 5])
+        self.assertEqual(motor.mejor_jugada(POSICION_INICIAL, "blanca", [6, 5]), esperado)
+
+    def test_evaluar_jugadas_ordenadas(self):
+        motor = ai.Expectimax(profundidad=2)
+        resultado = motor.evaluar_jugadas(POSICION_INICIAL, "blanca", [3, 1])
+        valores = [valor for valor, _, _ in resultado]
+        self.assertEqual(valores, sorted(valores, reverse=True))
+        jugada, valor = motor.mejor_jugada(POSICION_INICIAL, "blanca", [3, 1])
+        self.assertAlmostEqual(valor, valores[0])
+        self.assertIn(jugada, [j for v, j, _ in resultado if abs(v - valor) < 1e-12])
+
+    def test_toma_la_victoria(self):
+        posicion = [0] * 28
+        posicion[23] = 1
+        posicion[AFUERA_BLANCAS] = 14
+        posicion[0] = -15
+        jugada, valor = ai.Expectimax().mejor_jugada(posicion, "blanca", [2, 1])
+        self.assertEqual(valor, 2.0)
+        self.assertEqual(jugada[-1][1], "off")
+
+    def test_sugerir_y_agente(self):
+        game = Game(compacto=True)
+        game.__dice__.__valores__ = [6, 1]
+        motor = ai.Expectimax(profundidad=2)
+        jugada, _ = motor.sugerir(game)
+        self.assertIn(jugada, [j for j, _ in game.generar_jugadas()])
+        elegida = motor.elegir_jugada(game, game.generar_jugadas())
+        self.assertEqual(elegida[0], jugada)
+        game.aplicar_jugada(jugada)
+        self.assertEqual(game.get_dados_disponibles(), [])
+
+    def test_evaluador_por_lotes(self):
+        class _Lotes:
+            """Evaluador falso que cuenta las llamadas por lote."""
+            llamadas = 0
+
+            def __call__(self, posicion, color):
+                raise AssertionError("Debe usarse evaluar_lote")
+
+            def evaluar_lote(self, posiciones, color):
+                self.llamadas += 1
+                return [ai.evaluar_heuristica(p, color) for p in posiciones]
+
+        evaluador = _Lotes()
+        motor = ai.Expectimax(evaluador, profundidad=2)
+        esperado = ai.Expectimax(profundidad=2).mejor_jugada(POSICION_INICIAL, "blanca", [4, 2])
+        self.assertEqual(motor.mejor_jugada(POSICION_INICIAL, "blanca", [4, 2]), esperado)
+        self.assertGreater(evaluador.llamadas, 0)
+
+    def test_registrado_en_simulador(self):
+        agente = simulate.AGENTES["expectimax"](random.Random(0))
+        self.assertIsInstance(agente, ai.Expectimax)
+
+
+if __name__ == '__main__':
+    unittest.main()
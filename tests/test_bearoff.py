@@ -0,0 +1,209 @@
+"""Tests para la base de bearoff de un solo lado."""
+# pylint: disable=missing-function-docstring
+
+import os
+import tempfile
+import unittest
+from core import bearoff, movegen
+from core.ai import TIRADAS
+from core.board import AFUERA_BLANCAS, AFUERA_NEGRAS
+from core.game import Game
+
+
+def _posicion_absoluta(blancas, negras=(0, 0, 0, 0, 0, 1)):
+    """Posición compacta con blancas y negras en sus homes (conteos por distancia)."""
+    posicion = [0] * 28
+    for k, cantidad in enumerate(blancas):
+        posicion[23 - k] = cantidad
+    for k, cantidad in enumerate(negras):
+        posicion[k] = -cantidad
+    posicion[AFUERA_BLANCAS] = 15 - sum(blancas)
+    posicion[AFUERA_NEGRAS] = 15 - sum(negras)
+    return posicion
+
+
+class TestIndice(unittest.TestCase):
+    """Ranking combinatorio."""
+
+    def test_cantidad(self):
+        self.assertEqual(bearoff.cantidad_posiciones(), 54264)
+
+    def test_biyeccion(self):
+        vistos = set()
+        for numero in range(bearoff.cantidad_posiciones(6, 4)):
+            posicion = bearoff.posicion_de_indice(numero)
+            self.assertLessEqual(sum(posicion), 4)
+            self.assertEqual(bearoff.indice(posicion), numero)
+            vistos.add(posicion)
+        self.assertEqual(len(vistos), bearoff.cantidad_posiciones(6, 4))
+        self.assertLess(bearoff.indice((0, 0, 0, 0, 0, 15)), 54264)
+        self.assertEqual(bearoff.indice((0,) * 6), 0)
+
+    def test_movimientos(self):
+        self.assertEqual(bearoff.movimientos((0, 0, 1, 0, 0, 0), 5), [(0, 0, 0, 0, 0, 0)])
+        # Con un 2 la ficha del punto 1 no puede salir: no es la más alejada
+        self.assertEqual(bearoff.movimientos((1, 0, 1, 0, 0, 0), 2), [(2, 0, 0, 0, 0, 0)])
+        self.assertEqual(sorted(bearoff.movimientos((1, 0, 1, 0, 0, 0), 1)),
+                         [(0, 0, 1, 0, 0, 0), (1, 1, 0, 0, 0, 0)])
+
+
+class TestOneSidedBearoff(unittest.TestCase):
+    """Base chica (3 fichas) generada en un directorio temporal."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.carpeta = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        cls.ruta = os.path.join(cls.carpeta.name, "bearoff.bin")
+        bearoff.escribir(cls.ruta, puntos=6, fichas=3)
+        cls.base = bearoff.OneSidedBearoff(cls.ruta)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.base.cerrar()
+        cls.carpeta.cleanup()
+
+    def test_cabecera_y_limites(self):
+        self.assertEqual((self.base.puntos, self.base.fichas), (6, 3))
+        self.assertTrue(self.base.contiene((0, 0, 0, 0, 0, 3)))
+        self.assertFalse(self.base.contiene((0, 0, 0, 0, 2, 2)))
+
+    def test_valores_conocidos(self):
+        self.assertEqual(self.base.esperanza((0,) * 6), 0.0)
+        self.assertEqual(self.base.esperanza((1, 0, 0, 0, 0, 0)), 1.0)
+        # Una ficha en el 6: sale de una tirada con suma >= 6 o dobles desde 2-2
+        distribucion = self.base.distribucion((0, 0, 0, 0, 0, 1))
+        self.assertAlmostEqual(distribucion[1], 27 / 36, places=4)
+        self.assertAlmostEqual(distribucion[2], 9 / 36, places=4)
+        self.assertAlmostEqual(sum(distribucion), 1.0, places=3)
+
+    def test_coincide_con_el_generador_de_jugadas(self):
+        for numero in range(bearoff.cantidad_posiciones(6, 3)):
+            propia = bearoff.posicion_de_indice(numero)
+            if not any(propia):
+                continue
+            posicion = _posicion_absoluta(propia)
+            esperada = 1.0
+            for dados, prob in TIRADAS:
+                resultados = []
+                for _, final in movegen.generar_jugadas(posicion, "blanca", dados):
+                    restante = bearoff.posicion_home(final, "blanca")
+                    resultados.append(self.base.esperanza(restante))
+                esperada += prob * min(resultados)
+            self.assertAlmostEqual(self.base.esperanza(propia), esperada, places=4)
+
+    def test_probabilidad_ganar(self):
+        una_ficha = (1, 0, 0, 0, 0, 0)
+        self.assertAlmostEqual(self.base.probabilidad_ganar(una_ficha, una_ficha), 1.0, places=4)
+        lejos = (0, 0, 0, 0, 0, 3)
+        # Solo 6-6 saca las tres fichas del punto 6 en una tirada
+        self.assertAlmostEqual(self.base.probabilidad_ganar(lejos, una_ficha), 1 / 36, places=4)
+
+    def test_archivo_invalido(self):
+        ruta = os.path.join(self.carpeta.name, "otro.bin")
+        with open(ruta, "wb") as archivo:
+            archivo.write(b"no es una base")
+        with self.assertRaises(ValueError):
+            bearoff.OneSidedBearoff(ruta)
+
+    def test_evaluador(self):
+        evaluador = bearoff.EvaluadorBearoff(self.base, lambda posicion, color: 0.5)
+        # Blancas acaban de mover y les queda una ficha; negras (en turno) tienen 3 lejos
+        posicion = _posicion_absoluta((1, 0, 0, 0, 0, 0), (0, 0, 0, 0, 0, 3))
+        valor = evaluador(posicion, "blanca")
+        self.assertGreater(valor, 0.9)
+        self.assertAlmostEqual(evaluador(posicion, "negra"),
+                               1 - 2 * self.base.probabilidad_ganar((1, 0, 0, 0, 0, 0),
+                                                                    (0, 0, 0, 0, 0, 3)))
+        # Con contacto o fuera de los límites se usa el respaldo
+        posicion[10] = 1
+        self.assertEqual(evaluador(posicion, "blanca"), 0.5)
+
+    def test_game(self):
+        game = Game(compacto=True)
+        self.assertIsNone(game.tiradas_esperadas_bearoff(self.base))
+        game.cargar_posicion(_posicion_absoluta((0, 2, 0, 0, 0, 0)))
+        self.assertEqual(game.tiradas_esperadas_bearoff(self.base),
+                         self.base.esperanza((0, 2, 0, 0, 0, 0)))
+
+
+class TestTwoSidedBearoff(unittest.TestCase):
+    """Base exacta de dos lados chica (3 fichas) generada en un directorio temporal."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.carpeta = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        cls.ruta = os.path.join(cls.carpeta.name, "bearoff2.bin")
+        bearoff.escribir_dos_lados(cls.ruta, puntos=6, fichas=3)
+        cls.base = bearoff.TwoSidedBearoff(cls.ruta)
+        bearoff.escribir(os.path.join(cls.carpeta.name, "bearoff1.bin"), puntos=6, fichas=3)
+        cls.un_lado = bearoff.OneSidedBearoff(os.path.join(cls.carpeta.name, "bearoff1.bin"))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.base.cerrar()
+        cls.un_lado.cerrar()
+        cls.carpeta.cleanup()
+
+    def test_tamano_del_archivo(self):
+        pares = bearoff.cantidad_posiciones(6, 3) ** 2
+        self.assertEqual(os.path.getsize(self.ruta), len(bearoff.MAGIA_DOS_LADOS) + 6 + 2 * pares)
+
+    def test_valores_conocidos(self):
+        una_ficha = (1, 0, 0, 0, 0, 0)
+        self.assertEqual(self.base.probabilidad_ganar(una_ficha, (0, 0, 0, 0, 0, 3)), 1.0)
+        self.assertEqual(self.base.equidad(una_ficha, una_ficha), 1.0)
+        self.assertAlmostEqual(self.base.probabilidad_ganar((0, 0, 0, 0, 0, 3), una_ficha),
+                               1 / 36, places=4)
+
+    def test_coincide_con_el_generador_de_jugadas(self):
+        total = bearoff.cantidad_posiciones(6, 3)
+        for i in range(1, total, 7):
+            for j in range(1, total, 11):
+                propia = bearoff.posicion_de_indice(i)
+                ajena = bearoff.posicion_de_indice(j)
+                posicion = _posicion_absoluta(propia, ajena)
+                esperada = 0.0
+                for dados, prob in TIRADAS:
+                    mejor = 0.0
+                    for _, final in movegen.generar_jugadas(posicion, "blanca", dados):
+                        restante = bearoff.posicion_home(final, "blanca")
+                        if not any(restante):
+                            mejor = 1.0
+                            break
+                        mejor = max(mejor, 1 - self.base.probabilidad_ganar(ajena, restante))
+                    esperada += prob * mejor
+                self.assertAlmostEqual(self.base.probabilidad_ganar(propia, ajena), esperada,
+                                       places=3)
+
+    def test_parecida_a_la_de_un_lado(self):
+        total = bearoff.cantidad_posiciones(6, 3)
+        for i in range(1, total, 5):
+            for j in range(1, total, 5):
+                propia = bearoff.posicion_de_indice(i)
+                ajena = bearoff.posicion_de_indice(j)
+                self.assertAlmostEqual(self.base.probabilidad_ganar(propia, ajena),
+                                       self.un_lado.probabilidad_ganar(propia, ajena), delta=0.05)
+
+    def test_evaluador_prefiere_la_exacta(self):
+        evaluador = bearoff.EvaluadorBearoff(self.un_lado, lambda posicion, color: 0.0,
+                                             dos_lados=self.base)
+        propia, ajena = (0, 1, 1, 0, 0, 0), (0, 0, 1, 1, 0, 0)
+        posicion = _posicion_absoluta(propia, ajena)
+        self.assertEqual(evaluador(posicion, "blanca"),
+                         -self.base.equidad(ajena, propia))
+
+    def test_archivo_de_un_lado_no_sirve(self):
+        with self.assertRaises(ValueError):
+            bearoff.TwoSidedBearoff(os.path.join(self.carpeta.name, "bearoff1.bin"))
+
+    def test_rechaza_bases_mas_grandes_que_el_tope(self):
+        with self.assertRaises(ValueError):
+            bearoff.generar_dos_lados(puntos=6, fichas=7)
+        with self.assertRaises(SystemExit):
+            bearoff.main(["--dos-lados", "--fichas", "7",
+                          "--salida", os.path.join(self.carpeta.name, "grande.bin")])
+        self.assertFalse(os.path.exists(os.path.join(self.carpeta.name, "grande.bin")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,8 +3,11 @@
 
 import unittest
 from unittest.mock import patch
-from core.board import Board
+from core.board import (Board, CompactBoard, BARRA_BLANCAS, BARRA_NEGRAS,
+                        AFUERA_BLANCAS, POSICION_INICIAL)
+from core import zobrist
 from core.checker import Ficha
+from core.excepcions import PosicionVaciaError
 
 class TestBoard(unittest.TestCase):
     """Conjunto de pruebas para verificar comportamiento del tablero."""
@@ -358,6 +361,138 @@ class TestBoard(unittest.TestCase):
         board.__contenedor__[2].append(Ficha("negra"))  # 1 ficha negra en pos 3
         self.assertFalse(board.posicion_bloqueada(3, "blanca"))  # No bloqueada (solo 1 ficha)
 
+    def test_posicion_compacta_y_fichas_afuera(self):
+        board = Board()
+        self.assertEqual(tuple(board.posicion_compacta()), POSICION_INICIAL)
+        board.sacar_ficha(18)
+        board.enviar_a_barra(board.quitar_ficha(23))
+        posicion = board.posicion_compacta()
+        self.assertEqual(posicion[18], 4)
+        self.assertEqual(posicion[23], -1)
+        self.assertEqual(posicion[BARRA_NEGRAS], 1)
+        self.assertEqual(posicion[AFUERA_BLANCAS], 1)
+        self.assertEqual(board.fichas_afuera("blanca"), 1)
+
+
+class TestCompactBoard(unittest.TestCase):
+    """Pruebas del tablero compacto basado en conteos int8."""
+
+    def test_estado_inicial_igual_a_board(self):
+        compacto = CompactBoard()
+        board = Board()
+        for i in range(24):
+            self.assertEqual(compacto.contar_fichas(i), board.contar_fichas(i))
+            self.assertEqual(compacto.color_en_posicion(i), board.color_en_posicion(i))
+
+    def test_vista_contenedor_perezosa(self):
+        b = CompactBoard()
+        contenedor = b.get_contenedor()
+        self.assertEqual(len(contenedor), 24)
+        self.assertEqual([f.obtener_color() for f in contenedor[0]], ["blanca", "blanca"])
+        self.assertEqual(len(list(contenedor)), 24)
+        contenedor[3] = [Ficha("negra", 3)]
+        self.assertEqual(b.posicion_compacta()[3], -1)
+        contenedor[3] = []
+        self.assertIsNone(b.color_en_posicion(3))
+        with self.assertRaises(IndexError):
+            _ = contenedor[24]
+
+    def test_mover_capturar_y_reingresar(self):
+        b = CompactBoard()
+        b.mover_ficha(0, 3)
+        self.assertEqual(b.contar_fichas(0), 1)
+        self.assertEqual(b.color_en_posicion(3), "blanca")
+        ficha = b.quitar_ficha(3)
+        b.enviar_a_barra(ficha)
+        self.assertTrue(ficha.esta_en_barra())
+        self.assertEqual(b.fichas_en_barra("blanca"), 1)
+        b.reingresar_desde_barra("blanca", 2)
+        self.assertEqual(b.fichas_en_barra("blanca"), 0)
+        self.assertEqual(b.contar_fichas(2), 1)
+        with self.assertRaises(PosicionVaciaError):
+            b.mover_ficha(4, 5)
+        self.assertIsNone(b.quitar_ficha(4))
+
+    def test_sacar_ficha(self):
+        b = CompactBoard()
+        ficha = b.sacar_ficha(5)
+        self.assertTrue(ficha.esta_afuera())
+        self.assertEqual(ficha.obtener_color(), "negra")
+        self.assertEqual(b.fichas_afuera("negra"), 1)
+        self.assertIsNone(b.sacar_ficha(4))
+
+    def test_conversion_ida_y_vuelta(self):
+        board = Board()
+        board.enviar_a_barra(board.quitar_ficha(0))
+        board.sacar_ficha(5)
+        compacto = board.a_compacto()
+        self.assertEqual(compacto.posicion_compacta(), board.posicion_compacta())
+        self.assertEqual(compacto.a_board().posicion_compacta(), board.posicion_compacta())
+        self.assertEqual(compacto.posicion_compacta()[BARRA_BLANCAS], 1)
+
+    def test_copia_independiente(self):
+        b = CompactBoard()
+        copia = b.copiar()
+        copia.mover_ficha(0, 1)
+        self.assertEqual(b.contar_fichas(0), 2)
+        self.assertEqual(copia.contar_fichas(0), 1)
+
+    def test_validaciones_heredadas(self):
+        b = CompactBoard()
+        self.assertTrue(b.hay_fichas_en_posicion(1, "blanca"))
+        self.assertFalse(b.hay_fichas_en_posicion(1, "negra"))
+        self.assertFalse(b.hay_fichas_en_posicion("barra"))
+        self.assertTrue(b.posicion_bloqueada(6, "blanca"))
+        self.assertFalse(b.posicion_bloqueada(4, "negra"))
+        self.assertTrue(b.posicion_bloqueada(25, "blanca"))
+        with patch('builtins.print') as mock_print:
+            b.mostrar_tablero()
+            mock_print.assert_called()
+
+    def test_posicion_invalida(self):
+        with self.assertRaises(ValueError):
+            CompactBoard([0] * 10)
+
+
+class TestHashZobrist(unittest.TestCase):
+    """El hash incremental debe coincidir siempre con el recalculado."""
+
+    def _secuencia(self, b):
+        yield b.mover_ficha(0, 3)
+        yield b.enviar_a_barra(b.quitar_ficha(3))
+        yield b.reingresar_desde_barra("blanca", 2)
+        yield b.guardar_ficha(4, Ficha("negra"))
+        yield b.sacar_ficha(5)
+        yield b.mover(11, 13)
+
+    def test_hash_incremental_coincide(self):
+        for b in (Board(), CompactBoard()):
+            for _ in self._secuencia(b):
+                self.assertEqual(b.hash_posicion(), zobrist.hash_posicion(b.posicion_compacta()))
+
+    def test_board_y_compacto_tienen_mismo_hash(self):
+        board, compacto = Board(), CompactBoard()
+        self.assertEqual(board.hash_posicion(), compacto.hash_posicion())
+        for _ in zip(self._secuencia(board), self._secuencia(compacto)):
+            self.assertEqual(board.hash_posicion(), compacto.hash_posicion())
+
+    def test_hash_vuelve_al_deshacer(self):
+        b = CompactBoard()
+        inicial = b.hash_posicion()
+        b.mover_ficha(0, 3)
+        self.assertNotEqual(b.hash_posicion(), inicial)
+        b.mover_ficha(3, 0)
+        self.assertEqual(b.hash_posicion(), inicial)
+
+    def test_recalcular_tras_modificacion_directa(self):
+        b = Board()
+        b.get_contenedor()[3] = [Ficha("negra", 3)]
+        self.assertEqual(b.recalcular_hash(), zobrist.hash_posicion(b.posicion_compacta()))
+        b.reset()
+        self.assertEqual(b.hash_posicion(), zobrist.hash_posicion(b.posicion_compacta()))
+        self.assertEqual(b.a_compacto().hash_posicion(), b.hash_posicion())
+        self.assertEqual(b.a_compacto().a_board().hash_posicion(), b.hash_posicion())
+
 
 if __name__ == '__main__':
     unittest.main()
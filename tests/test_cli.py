@@ -103,7 +103,8 @@ class TestBackgammonCLI(unittest.TestCase):
         
         # Verificaciones
         self.assertEqual(mock_game_instance.turno_completo.call_count, 3)
-        self.assertEqual(mock_game_instance.cambiar_turno.call_count, 2)
+        # El turno lo cierra turno_completo (end_turn); el CLI no lo cambia
+        mock_game_instance.cambiar_turno.assert_not_called()
         
         # Verificar mensajes de cambio de turno (solo buscar las partes importantes)
         mock_print.assert_any_call("Cambiando turno...")
@@ -270,8 +271,8 @@ class TestBackgammonCLI(unittest.TestCase):
 
         cli.jugar()
 
-        # Debe haberse llamado a cambiar_turno al menos una vez
-        self.assertGreaterEqual(mock_game_instance.cambiar_turno.call_count, 1)
+        # Debe haberse pausado entre turnos
+        self.assertGreaterEqual(mock_input.call_count, 1)
         # Debe haberse impreso el mensaje de cambio de turno
         calls = [call.args[0] for call in mock_print.call_args_list if call.args]
         self.assertTrue(any("Cambiando turno" in str(c) for c in calls))
@@ -1,5 +1,6 @@
 """Tests para la clase Dice."""
 
+import random
 import unittest
 from unittest.mock import patch
 from core.dice import Dice
@@ -62,6 +63,36 @@ class TestDados(unittest.TestCase):
         self.assertEqual(resultado, (3, 5))
         self.assertIsInstance(resultado, tuple)
 
+    def test_rng_inyectado_es_reproducible(self):
+        """Dos dados con la misma semilla producen la misma secuencia."""
+        a, b = Dice(random.Random(9)), Dice(random.Random(9))
+        self.assertEqual([a.roll() for _ in range(20)], [b.roll() for _ in range(20)])
+
+    def test_buffer_sirve_tiradas_validas(self):
+        """El modo con buffer reparte tiradas válidas y recarga el bloque."""
+        dados = Dice(random.Random(3), buffer=4)
+        tiradas = [tuple(dados.roll()) for _ in range(20)]
+        for tirada in tiradas:
+            self.assertIn(len(tirada), (2, 4))
+            self.assertTrue(all(1 <= v <= 6 for v in tirada))
+        otros = Dice(random.Random(3), buffer=4)
+        self.assertEqual(tiradas, [tuple(otros.roll()) for _ in range(20)])
+
+    def test_generador_estilo_numpy(self):
+        """Acepta generadores con la API ``integers`` de numpy.random.Generator."""
+        class Bloque(list):
+            """Lista con tobytes(), como un ndarray int8."""
+            def tobytes(self):
+                return bytes(self)
+
+        class GeneradorFalso:
+            """Imita numpy.random.Generator.integers."""
+            def integers(self, bajo, alto, size=None, dtype=None):  # pylint: disable=unused-argument
+                return Bloque([3, 6] * (size // 2))
+
+        self.assertEqual(Dice(GeneradorFalso()).roll(), [3, 6])
+        self.assertEqual(Dice(GeneradorFalso(), buffer=8).roll(), [3, 6])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -6,7 +6,7 @@ from core.excepcions import (
     PosicionBloqueadaError, MovimientoColorError, JuegoTerminadoError,
     ColorInvalidoError, FichaInvalidaError, BearingOffInvalidoError,
     MovimientoBarraError, TurnoInvalidoError, ConfiguracionJuegoError,
-    EstadoJuegoInconsistenteError
+    EstadoJuegoInconsistenteError, BusquedaCanceladaError
 )
 
 
@@ -109,6 +109,12 @@ class TestExcepciones(unittest.TestCase):
         self.assertIsInstance(error, BackgammonError)
         self.assertEqual(str(error), "Estado de juego inconsistente")
 
+    def test_busqueda_cancelada_error(self):
+        """Test de BusquedaCanceladaError."""
+        error = BusquedaCanceladaError("Búsqueda cancelada")
+        self.assertIsInstance(error, BackgammonError)
+        self.assertEqual(str(error), "Búsqueda cancelada")
+
     def test_herencia_excepciones(self):
         """Test de que todas las excepciones heredan de BackgammonError."""
         excepciones_backgammon = [
@@ -126,6 +132,7 @@ class TestExcepciones(unittest.TestCase):
             TurnoInvalidoError("test"),
             ConfiguracionJuegoError("test"),
             EstadoJuegoInconsistenteError("test"),
+            BusquedaCanceladaError("test"),
             PosicionBloqueadaError("test")
         ]
 
@@ -3,12 +3,15 @@
 
 import unittest
 from unittest.mock import patch
-from core.game import Game
+import random
+from core.game import Game, FASE_TIRAR, FASE_MOVER, FASE_TERMINADA
+from core.board import CompactBoard
 from core.checker import Ficha
 from core.player import Player
 from core.excepcions import (DadoNoDisponibleError, PosicionVaciaError,
                            PosicionBloqueadaError, MovimientoColorError,
-                           MovimientoInvalidoError)
+                           MovimientoInvalidoError, EntradaInvalidaError,
+                           JuegoTerminadoError, TurnoInvalidoError)
 
 
 class TestGame(unittest.TestCase):  # pylint: disable=too-many-public-methods
@@ -990,11 +993,12 @@ class TestGame(unittest.TestCase):  # pylint: disable=too-many-public-methods
     def test_ejecutar_movimiento_completo_ok_y_error(self):
         """Cubre éxito normal y excepción capturada en ejecutar_movimiento_completo."""
         game = Game(Player("blanca"), Player("negra"))
-        with patch.object(Game, 'mover', return_value=None):
+        with patch.object(Game, 'play', return_value=None) as mock_play:
             exito, mensaje = game.ejecutar_movimiento_completo(0, 1, 1)
             self.assertTrue(exito)
             self.assertIn("Movimiento realizado", mensaje)
-        with patch.object(Game, 'mover', side_effect=MovimientoInvalidoError("mala")):
+            mock_play.assert_called_once_with((0, 1, 1))
+        with patch.object(Game, 'play', side_effect=MovimientoInvalidoError("mala")):
             exito, mensaje = game.ejecutar_movimiento_completo(0, 1, 1)
             self.assertFalse(exito)
             self.assertIn("ERROR", mensaje)
@@ -1038,6 +1042,273 @@ class TestGame(unittest.TestCase):  # pylint: disable=too-many-public-methods
             calls = [c.args[0] for c in mock_print.call_args_list if c.args]
             self.assertTrue(any("JUEGO TERMINADO" in s for s in calls))
 
+    def test_partida_compacta_mover_y_capturar(self):
+        """Con compacto=True el Game opera sobre un CompactBoard con la misma API."""
+        game = Game(Player("blanca"), Player("negra"), compacto=True)
+        self.assertIsInstance(game.__board__, CompactBoard)
+        game.get_tablero()[3] = [Ficha("negra", 3)]
+        game.__dice__.__valores__ = [3, 5]
+        game.mover(0, 3, 3)
+        self.assertEqual(game.get_tablero()[3][0].obtener_color(), "blanca")
+        self.assertEqual(game.fichas_en_barra("negra"), 1)
+        self.assertEqual(game.get_dados_disponibles(), [5])
+
+    def test_hash_posicion_incluye_turno(self):
+        game = Game(Player("blanca"), Player("negra"))
+        hash_blancas = game.hash_posicion()
+        game.cambiar_turno()
+        self.assertNotEqual(game.hash_posicion(), hash_blancas)
+        game.cambiar_turno()
+        self.assertEqual(game.hash_posicion(), hash_blancas)
+        self.assertEqual(Game(compacto=True).hash_posicion(), hash_blancas)
+
+
+class TestAplicarDeshacer(unittest.TestCase):
+    """Pruebas de la API make/unmake con pila de deshacer."""
+
+    def _ida_y_vuelta(self, game, dados):
+        posicion = game.__board__.posicion_compacta()
+        hash_inicial = game.hash_posicion()
+        for jugada, final in game.generar_jugadas(dados):
+            game.__dice__.__valores__ = list(dados)
+            game.aplicar_jugada(jugada)
+            self.assertEqual(tuple(game.__board__.posicion_compacta()), final)
+            for _ in jugada:
+                game.deshacer()
+            self.assertEqual(game.__board__.posicion_compacta(), posicion)
+            self.assertEqual(game.hash_posicion(), hash_inicial)
+            self.assertEqual(game.get_dados_disponibles(), list(dados))
+
+    def test_ida_y_vuelta_todas_las_jugadas(self):
+        for compacto in (False, True):
+            game = Game(compacto=compacto)
+            self._ida_y_vuelta(game, [3, 1])
+            self._ida_y_vuelta(game, [5, 5, 5, 5])
+            game.cambiar_turno()
+            self._ida_y_vuelta(game, [6, 4])
+
+    def test_captura_y_reingreso(self):
+        for compacto in (False, True):
+            game = Game(compacto=compacto)
+            game.get_tablero()[3] = [Ficha("negra", 3)]
+            game.__board__.recalcular_hash()
+            hash_inicial = game.hash_posicion()
+            game.__dice__.__valores__ = [3, 4]
+            game.aplicar((0, 3, 3))
+            self.assertEqual(game.fichas_en_barra("negra"), 1)
+            game.cambiar_turno()
+            game.aplicar(("barra", 20, 4))
+            self.assertEqual(game.fichas_en_barra("negra"), 0)
+            self.assertEqual(game.deshacer(), ("barra", 20, 4))
+            game.deshacer()
+            self.assertEqual(game.fichas_en_barra("negra"), 0)
+            self.assertEqual(game.get_tablero()[3][0].obtener_color(), "negra")
+            game.cambiar_turno()
+            self.assertEqual(game.hash_posicion(), hash_inicial)
+            self.assertIsNone(game.deshacer())
+
+    def test_sacar_y_deshacer(self):
+        for compacto in (False, True):
+            game = Game(compacto=compacto)
+            for i in range(24):
+                game.get_tablero()[i] = []
+            game.get_tablero()[20] = [Ficha("blanca", 20)]
+            game.__board__.recalcular_hash()
+            game.__dice__.__valores__ = [6]
+            game.aplicar((20, "off", 6))
+            self.assertEqual(game.fichas_fuera("blanca"), 1)
+            self.assertEqual(game.__board__.fichas_afuera("blanca"), 1)
+            game.cambiar_turno()
+            game.deshacer()
+            self.assertEqual(game.fichas_fuera("blanca"), 0)
+            self.assertEqual(game.fichas_fuera("negra"), 0)
+            self.assertEqual(game.__board__.contar_fichas(20), 1)
+            self.assertEqual(game.__board__.color_en_posicion(20), "blanca")
+            self.assertEqual(game.get_dados_disponibles(), [6])
+
+    def test_puntos_victoria(self):
+        game = Game(compacto=True)
+        self.assertEqual(game.puntos_victoria(), 0)
+        for _ in range(15):
+            game.get_turno().sacar_del_tablero(Ficha("blanca"))
+        for i in range(24):
+            game.get_tablero()[i] = []
+        game.get_tablero()[2] = [Ficha("negra", 2)]
+        self.assertEqual(game.puntos_victoria(), 2)
+        game.get_tablero()[20] = [Ficha("negra", 20)]
+        self.assertEqual(game.puntos_victoria(), 3)
+        game.get_tablero()[20] = []
+        game.__board__.enviar_a_barra(Ficha("negra"))
+        self.assertEqual(game.puntos_victoria(), 3)
+        game.get_tablero()[2] = []
+        game.__board__.reingresar_desde_barra("negra", 2)
+        game.__board__.sacar_ficha(2)
+        self.assertEqual(game.puntos_victoria(), 1)
+
+    def test_aplicar_invalido_no_modifica(self):
+        game = Game()
+        game.__dice__.__valores__ = [2, 5]
+        with self.assertRaises(DadoNoDisponibleError):
+            game.aplicar((0, 3, 3))
+        with self.assertRaises(PosicionBloqueadaError):
+            game.aplicar((0, 5, 5))
+        with self.assertRaises(PosicionVaciaError):
+            game.aplicar((2, 4, 2))
+        with self.assertRaises(PosicionVaciaError):
+            game.aplicar((3, "off", 2))
+        with self.assertRaises(MovimientoInvalidoError):
+            game.aplicar(("barra", 2, 2))
+        self.assertEqual(game.get_dados_disponibles(), [2, 5])
+        self.assertIsNone(game.deshacer())
+
+    def test_cargar_posicion(self):
+        posicion = [0] * 28
+        posicion[23] = 1
+        posicion[26] = 14
+        posicion[0] = -15
+        for compacto in (False, True):
+            game = Game(compacto=compacto)
+            game.__dice__.__valores__ = [4, 2]
+            game.cargar_posicion(posicion, turno=1)
+            self.assertEqual(isinstance(game.__board__, CompactBoard), compacto)
+            self.assertEqual(list(game.__board__.posicion_compacta()), posicion)
+            self.assertEqual(game.posicion_compacta(), tuple(posicion))
+            self.assertEqual(game.get_turno().get_color(), "negra")
+            self.assertEqual(game.fichas_fuera("blanca"), 14)
+            self.assertEqual(game.get_dados_disponibles(), [])
+            game.cambiar_turno()
+            game.__dice__.__valores__ = [1, 2]
+            game.aplicar((23, "off", 1))
+            self.assertEqual(game.puntos_victoria(), 2)
+
+    def test_version_cambia_con_el_estado(self):
+        game = Game(compacto=True)
+        versiones = [game.get_version()]
+        game.tirar_dados()
+        versiones.append(game.get_version())
+        game.__dice__.__valores__ = [6, 5]
+        self.assertEqual(game.get_version(), versiones[-1])
+        game.aplicar((0, 6, 6))
+        versiones.append(game.get_version())
+        game.deshacer()
+        versiones.append(game.get_version())
+        self.assertTrue(game.usar_valor_dado(5))
+        versiones.append(game.get_version())
+        self.assertFalse(game.usar_valor_dado(3))
+        self.assertEqual(game.get_version(), versiones[-1])
+        game.cambiar_turno()
+        versiones.append(game.get_version())
+        game.cargar_posicion(game.__board__.posicion_compacta())
+        versiones.append(game.get_version())
+        self.assertEqual(versiones, sorted(set(versiones)))
+
+
+class TestApiPorPasos(unittest.TestCase):
+    """API roll / legal_plays / play / end_turn / status sin entrada/salida."""
+
+    def test_partida_completa_sin_io(self):
+        game = Game(compacto=True, rng=random.Random(3))
+        rng = random.Random(4)
+        with patch('builtins.input', side_effect=AssertionError("input")), \
+             patch('builtins.print', side_effect=AssertionError("print")):
+            estado = game.status()
+            while estado["fase"] != FASE_TERMINADA:
+                self.assertEqual(estado["fase"], FASE_TIRAR)
+                estado = game.roll()
+                jugadas = game.legal_plays()
+                jugada, final = jugadas[rng.randrange(len(jugadas))]
+                for movimiento in jugada:
+                    estado = game.play(movimiento)
+                if estado["fase"] != FASE_TERMINADA:
+                    self.assertEqual(estado["posicion"], final)
+                    estado = game.end_turn()
+        self.assertIn(estado["ganador"], ("blanca", "negra"))
+        self.assertIn(estado["puntos"], (1, 2, 3))
+        self.assertEqual(game.legal_plays(), [])
+        with self.assertRaises(JuegoTerminadoError):
+            game.roll()
+
+    def test_fases_y_errores(self):
+        game = Game()
+        with self.assertRaises(TurnoInvalidoError):
+            game.play((0, 6, 6))
+        with self.assertRaises(TurnoInvalidoError):
+            game.end_turn()
+        with self.assertRaises(EntradaInvalidaError):
+            game.roll((7, 1))
+        estado = game.roll((3, 3))
+        self.assertEqual((estado["fase"], estado["dados"]), (FASE_MOVER, [3, 3, 3, 3]))
+        with self.assertRaises(TurnoInvalidoError):
+            game.roll()
+        with self.assertRaises(MovimientoInvalidoError):
+            game.end_turn()
+        with self.assertRaises(MovimientoInvalidoError):
+            game.play((0, 4, 4))
+        with self.assertRaises(EntradaInvalidaError):
+            game.play({"x": 1})
+        with self.assertRaises(EntradaInvalidaError):
+            game.play(None)
+
+    def test_jugada_completa_es_atomica(self):
+        game = Game(compacto=True)
+        game.roll((6, 5))
+        inicial = game.status()
+        with self.assertRaises(MovimientoInvalidoError):
+            game.play(((0, 6, 6), (0, 6, 6)))
+        self.assertEqual(game.status()["posicion"], inicial["posicion"])
+        self.assertEqual(game.status()["dados"], [6, 5])
+        estado = game.play([[0, 6, 6], [6, 11, 5]])
+        self.assertEqual(estado["dados"], [])
+        self.assertEqual(game.end_turn()["turno"], "negra")
+
+    def test_pasar_sin_movimientos(self):
+        posicion = [0] * 28
+        for i in range(6):
+            posicion[i] = -2
+        posicion[24] = 1
+        posicion[10] = 14
+        posicion[27] = 3
+        game = Game(compacto=True)
+        game.cargar_posicion(posicion)
+        game.roll((2, 5))
+        self.assertEqual(game.legal_plays(), [((), tuple(posicion))])
+        self.assertEqual(game.end_turn()["fase"], FASE_TIRAR)
+
+    def test_turno_completo_usa_la_api_por_pasos(self):
+        game = Game(quiet=True, rng=random.Random(8))
+
+        def entrada():
+            origen, destino, dado = game.movimientos_legales()[0]
+            origen = origen if origen == "barra" else origen + 1
+            destino = destino if destino == "off" else destino + 1
+            return f"{origen},{destino},{dado}"
+
+        entradas = iter(["pass"])
+        with patch.object(game, 'obtener_entrada_usuario',
+                          side_effect=lambda: next(entradas, None) or entrada()), \
+             patch('builtins.print') as mock_print:
+            self.assertTrue(game.turno_completo())
+        impresos = [c.args[0] for c in mock_print.call_args_list if c.args]
+        self.assertIn("ERROR: Todavía hay movimientos legales con los dados restantes", impresos)
+        estado = game.status()
+        self.assertEqual((estado["turno"], estado["fase"], estado["dados"]),
+                         ("negra", FASE_TIRAR, []))
+        self.assertNotEqual(estado["posicion"], Game(compacto=True).posicion_compacta())
+
+    def test_cargar_estado_restaura_status(self):
+        original = Game(compacto=True, rng=random.Random(5))
+        original.roll((3, 1))
+        original.play((0, 3, 3))
+        estado = original.status()
+        copia = Game(compacto=True)
+        copia.cargar_estado(estado["posicion"], 0, estado["fase"], estado["dados"],
+                            version=estado["version"])
+        self.assertEqual(copia.status(), estado)
+        self.assertEqual(copia.legal_plays(), original.legal_plays())
+        with self.assertRaises(EntradaInvalidaError):
+            copia.cargar_estado(estado["posicion"], 0, "bailar")
+
+
 if __name__ == '__main__':
     unittest.main()
 # EOF
@@ -0,0 +1,192 @@
+"""Tests para el generador de jugadas legales."""
+# pylint: disable=missing-function-docstring
+
+import unittest
+from core import movegen, zobrist
+from core.board import (POSICION_INICIAL, BARRA_BLANCAS, BARRA_NEGRAS,
+                        AFUERA_BLANCAS, AFUERA_NEGRAS)
+from core.game import Game
+
+
+_EXTRA = {"barra_blancas": BARRA_BLANCAS, "barra_negras": BARRA_NEGRAS,
+          "afuera_blancas": AFUERA_BLANCAS, "afuera_negras": AFUERA_NEGRAS}
+
+
+def _posicion(puntos, **extra):
+    """Arma una posición de 28 casilleros a partir de {indice: conteo}."""
+    posicion = [0] * 28
+    for indice, cantidad in puntos.items():
+        posicion[indice] = cantidad
+    for nombre, valor in extra.items():
+        posicion[_EXTRA[nombre]] = valor
+    return posicion
+
+
+def _espejo(posicion):
+    """Intercambia colores y sentido de juego de una posición."""
+    puntos = [-v for v in reversed(posicion[:24])]
+    return puntos + [posicion[BARRA_NEGRAS], posicion[BARRA_BLANCAS],
+                     posicion[AFUERA_NEGRAS], posicion[AFUERA_BLANCAS]]
+
+
+class TestMovegen(unittest.TestCase):
+    """Pruebas de generar_jugadas y funciones asociadas."""
+
+    def test_apertura_usa_ambos_dados_sin_repetir(self):
+        jugadas = movegen.generar_jugadas(POSICION_INICIAL, "blanca", [3, 1])
+        self.assertEqual(len(jugadas), 16)
+        self.assertTrue(all(len(jugada) == 2 for jugada, _ in jugadas))
+        finales = [final for _, final in jugadas]
+        self.assertEqual(len(finales), len(set(finales)))
+
+    def test_dobles_usan_cuatro_movimientos(self):
+        jugadas = movegen.generar_jugadas(POSICION_INICIAL, "blanca", [4, 4, 4, 4])
+        self.assertTrue(jugadas)
+        self.assertTrue(all(len(jugada) == 4 for jugada, _ in jugadas))
+
+    def test_negras_simetricas(self):
+        for dados in ([3, 1], [6, 5], [2, 2, 2, 2]):
+            blancas = movegen.generar_jugadas(POSICION_INICIAL, "blanca", dados)
+            negras = movegen.generar_jugadas(_espejo(POSICION_INICIAL), "negra", dados)
+            self.assertEqual(sorted(f for _, f in blancas),
+                             sorted(tuple(_espejo(f)) for _, f in negras))
+
+    def test_barra_primero(self):
+        posicion = list(POSICION_INICIAL)
+        posicion[0] = 1
+        posicion[BARRA_BLANCAS] = 1
+        for jugada, final in movegen.generar_jugadas(posicion, "blanca", [6, 3]):
+            self.assertEqual(jugada[0][0], "barra")
+            self.assertEqual(final[BARRA_BLANCAS], 0)
+
+    def test_tablero_cerrado_solo_pasa(self):
+        posicion = _posicion({i: -2 for i in range(6)}, barra_blancas=1)
+        self.assertEqual(movegen.generar_jugadas(posicion, "blanca", [3, 5]),
+                         [((), tuple(posicion))])
+        self.assertFalse(movegen.hay_movimientos(posicion, "blanca", [3, 5]))
+
+    def test_captura_envia_a_barra(self):
+        posicion = _posicion({0: 1, 3: -1, 20: -14}, afuera_blancas=14)
+        finales = [f for j, f in movegen.generar_jugadas(posicion, "blanca", [3, 6])
+                   if j[0] == (0, 3, 3)]
+        self.assertTrue(finales)
+        self.assertEqual(finales[0][BARRA_NEGRAS], 1)
+
+    def test_debe_usar_dado_mayor(self):
+        # Solo se puede usar un dado: 0->5 o 0->6, pero 11 está bloqueado
+        posicion = _posicion({0: 1, 11: -2, 12: -13}, afuera_blancas=14)
+        jugadas = movegen.generar_jugadas(posicion, "blanca", [5, 6])
+        self.assertEqual([j for j, _ in jugadas], [((0, 6, 6),)])
+        self.assertEqual(movegen.movimientos_legales(posicion, "blanca", [5, 6]),
+                         [(0, 6, 6)])
+
+    def test_sacar_con_dado_mayor_solo_desde_el_punto_mas_alto(self):
+        posicion = _posicion({20: 1, 22: 1, 0: -15}, afuera_blancas=13)
+        self.assertEqual(movegen.movimientos_legales(posicion, "blanca", [5]),
+                         [(20, "off", 5)])
+        jugadas = movegen.generar_jugadas(posicion, "blanca", [6, 6, 6, 6])
+        self.assertEqual(len(jugadas), 1)
+        self.assertEqual(len(jugadas[0][0]), 2)
+        self.assertEqual(jugadas[0][1][AFUERA_BLANCAS], 15)
+
+    def test_ultima_ficha_con_cualquier_dado_usa_el_mayor(self):
+        posicion = _posicion({23: 1, 0: -15}, afuera_blancas=14)
+        for dados in ([1, 2], [2, 1]):
+            jugadas = movegen.generar_jugadas(posicion, "blanca", dados)
+            self.assertEqual([j for j, _ in jugadas], [((23, "off", 2),)])
+            self.assertEqual(movegen.movimientos_legales(posicion, "blanca", dados),
+                             [(23, "off", 2)])
+        game = Game(compacto=True)
+        game.cargar_posicion(posicion)
+        game.roll((1, 2))
+        self.assertEqual(game.play(game.legal_plays()[0][0])["ganador"], "blanca")
+
+    def test_sin_dados(self):
+        self.assertEqual(movegen.generar_jugadas(POSICION_INICIAL, "negra", []),
+                         [((), tuple(POSICION_INICIAL))])
+        self.assertEqual(movegen.movimientos_legales(POSICION_INICIAL, "negra", []), [])
+
+    def test_game_generar_jugadas_usa_turno_y_dados(self):
+        game = Game()
+        game.cambiar_turno()
+        game.__dice__.__valores__ = [6, 5]
+        jugadas = game.generar_jugadas()
+        self.assertEqual(len(jugadas), 7)
+        self.assertTrue(all(jugada[0][0] in (23, 12, 7, 5) for jugada, _ in jugadas))
+        self.assertTrue(game.hay_movimientos_posibles())
+        self.assertIn((23, 17, 6), game.movimientos_legales())
+        game.__dice__.__valores__ = []
+        self.assertFalse(game.hay_movimientos_posibles())
+
+
+class TestCacheJugadas(unittest.TestCase):
+    """Cache LRU compartida de jugadas generadas."""
+
+    def test_resultado_igual_al_generador(self):
+        cache = movegen.CacheJugadas()
+        for dados in ([3, 1], [4, 4, 4, 4], [6, 5]):
+            esperado = movegen.generar_jugadas(POSICION_INICIAL, "blanca", dados)
+            self.assertEqual(movegen.generar_jugadas_cacheadas(
+                POSICION_INICIAL, "blanca", dados, cache), esperado)
+        self.assertEqual(movegen.movimientos_legales_cacheados(
+            POSICION_INICIAL, "negra", [6, 5], cache),
+            movegen.movimientos_legales(POSICION_INICIAL, "negra", [6, 5]))
+        self.assertTrue(movegen.hay_movimientos_cacheado(POSICION_INICIAL, "negra", [2], cache))
+
+    def test_aciertos(self):
+        cache = movegen.CacheJugadas()
+        primera = movegen.generar_jugadas_cacheadas(POSICION_INICIAL, "blanca", [3, 1], cache)
+        segunda = movegen.generar_jugadas_cacheadas(POSICION_INICIAL, "blanca", (3, 1), cache)
+        self.assertIs(primera, segunda)
+        movegen.generar_jugadas_cacheadas(POSICION_INICIAL, "negra", [3, 1], cache)
+        movegen.generar_jugadas_cacheadas(POSICION_INICIAL, "blanca", [1, 3], cache)
+        self.assertEqual((cache.aciertos, cache.fallos), (1, 3))
+        self.assertAlmostEqual(cache.tasa_aciertos(), 1 / 4)
+        cache.limpiar()
+        self.assertEqual((len(cache), cache.tasa_aciertos()), (0, 0.0))
+
+    def test_hash_incremental_y_posicion_perezosa(self):
+        cache = movegen.CacheJugadas()
+        construidas = []
+
+        def posicion():
+            construidas.append(1)
+            return POSICION_INICIAL
+
+        for compacto in (False, True):
+            game = Game(compacto=compacto)
+            self.assertEqual(game.__board__.hash_posicion(),
+                             zobrist.hash_posicion(POSICION_INICIAL))
+            for _ in range(2):
+                self.assertEqual(movegen.generar_jugadas_cacheadas(
+                    posicion, "blanca", [3, 1], cache,
+                    hash_posicion=game.__board__.hash_posicion()),
+                    movegen.generar_jugadas(POSICION_INICIAL, "blanca", [3, 1]))
+        self.assertEqual(len(construidas), 1)
+        self.assertEqual((cache.aciertos, cache.fallos), (3, 1))
+
+    def test_expulsa_la_menos_usada(self):
+        cache = movegen.CacheJugadas(maximo=2)
+        calculos = []
+        for clave in ("a", "b", "a", "c", "b"):
+            cache.obtener(clave, lambda clave=clave: calculos.append(clave) or clave)
+        # "b" salió al entrar "c" porque "a" se había usado más recientemente
+        self.assertEqual(calculos, ["a", "b", "c", "b"])
+        self.assertEqual(len(cache), 2)
+
+    def test_game_usa_la_cache_compartida(self):
+        movegen.CACHE.limpiar()
+        game = Game()
+        game.__dice__.__valores__ = [6, 5]
+        game.generar_jugadas()
+        game.generar_jugadas()
+        self.assertEqual(movegen.CACHE.aciertos, 1)
+        # Mover cambia la posición, así que la consulta siguiente es un fallo
+        game.aplicar_jugada(game.generar_jugadas()[0][0])
+        game.__dice__.__valores__ = [6, 5]
+        game.generar_jugadas()
+        self.assertEqual(movegen.CACHE.fallos, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
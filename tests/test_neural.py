@@ -0,0 +1,82 @@
+"""Tests para el evaluador con red neuronal (requieren NumPy)."""
+# pylint: disable=missing-function-docstring
+
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy es opcional para el resto del juego
+    np = None
+
+from core import movegen
+from core.board import POSICION_INICIAL
+
+try:
+    from core import neural
+except ImportError:  # pragma: no cover - core.neural importa NumPy
+    neural = None
+
+
+@unittest.skipIf(np is None, "NumPy no está instalado")
+class TestNeuralEvaluator(unittest.TestCase):
+    """Pruebas de codificación, inferencia por lotes y pesos en archivo."""
+
+    def setUp(self):
+        self.red = neural.NeuralEvaluator(ocultas=16, rng=np.random.default_rng(0))
+
+    def test_codificacion_inicial(self):
+        entradas = neural.codificar([POSICION_INICIAL], "blanca")
+        self.assertEqual(entradas.shape, (1, neural.ENTRADAS))
+        # 4 puntos ocupados por jugador; 15 fichas en total en cada lado
+        propias = entradas[0, :96].reshape(24, 4)
+        self.assertEqual(propias[:, 0].sum(), 4)
+        self.assertAlmostEqual(float((propias[:, :3].sum(axis=1) + propias[:, 3] * 2).sum()),
+                               15.0)
+
+    def test_codificacion_simetrica_por_color(self):
+        blancas = neural.codificar([POSICION_INICIAL], "blanca")
+        negras = neural.codificar([POSICION_INICIAL], "negra")
+        np.testing.assert_array_equal(blancas, negras)
+
+    def test_lote_igual_a_uno_por_uno(self):
+        jugadas = movegen.generar_jugadas(POSICION_INICIAL, "blanca", [6, 5])
+        finales = [final for _, final in jugadas]
+        lote = self.red.evaluar_lote(finales, "blanca")
+        sueltos = [self.red(final, "blanca") for final in finales]
+        np.testing.assert_allclose(lote, sueltos, rtol=1e-5)
+        probabilidades = self.red.probabilidades(finales, "blanca")
+        self.assertEqual(probabilidades.shape, (len(finales), neural.SALIDAS))
+        self.assertTrue(((probabilidades > 0) & (probabilidades < 1)).all())
+
+    def test_guardar_y_cargar(self):
+        with tempfile.TemporaryDirectory() as carpeta:
+            ruta = os.path.join(carpeta, "pesos.npz")
+            self.red.guardar(ruta)
+            cargada = neural.NeuralEvaluator.cargar(ruta)
+        self.assertAlmostEqual(cargada(POSICION_INICIAL, "negra"),
+                               self.red(POSICION_INICIAL, "negra"), places=6)
+
+    def test_pesos_invalidos(self):
+        with self.assertRaises(ValueError):
+            neural.NeuralEvaluator(pesos=(np.zeros((3, 4)), np.zeros(4),
+                                          np.zeros((4, 5)), np.zeros(5)))
+
+    def test_agente(self):
+        class _Game:
+            """Game mínimo con el jugador en turno."""
+            def get_turno(self):
+                return self
+
+            def get_color(self):
+                return "blanca"
+
+        jugadas = movegen.generar_jugadas(POSICION_INICIAL, "blanca", [3, 1])
+        elegida = self.red.elegir_jugada(_Game(), jugadas)
+        valores = self.red.evaluar_lote([f for _, f in jugadas], "blanca")
+        self.assertEqual(elegida, jugadas[int(np.argmax(valores))])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -114,6 +114,16 @@ class TestPlayer(unittest.TestCase):
         # Caso 3: punto que no existe en ninguna lista
         self.assertFalse(p.has_checker("punto_inexistente"))
 
+    def test_devolver_al_tablero(self):
+        """Deshace sacar_del_tablero y devuelve None si no hay fichas fuera."""
+        p = Player("blanca")
+        self.assertIsNone(p.devolver_al_tablero())
+        f = Ficha("blanca", 20)
+        p.sacar_del_tablero(f)
+        self.assertIs(p.devolver_al_tablero(), f)
+        self.assertEqual(p.fichas_fuera(), 0)
+        self.assertIsNone(f.obtener_posicion())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,105 @@
+"""Tests para el motor de rollouts."""
+# pylint: disable=missing-function-docstring
+
+import random
+import unittest
+from core import rollout
+from core.board import POSICION_INICIAL, AFUERA_BLANCAS, AFUERA_NEGRAS
+from core.game import Game
+
+
+def _carrera():
+    """Carrera corta: blancas con 3 fichas por sacar, negras con 2."""
+    posicion = [0] * 28
+    posicion[20] = 2
+    posicion[22] = 1
+    posicion[AFUERA_BLANCAS] = 12
+    posicion[1] = -1
+    posicion[4] = -1
+    posicion[AFUERA_NEGRAS] = 13
+    return posicion
+
+
+class TestDadosRollout(unittest.TestCase):
+    """Dados con primera tirada fija y espejo antitético."""
+
+    def test_primera_tirada_fija(self):
+        dados = rollout.DadosRollout(random.Random(1), primera=(6, 1))
+        self.assertEqual(dados.roll(), [6, 1])
+        self.assertIn(len(dados.roll()), (2, 4))
+
+    def test_antitetico_espeja(self):
+        normales = rollout.DadosRollout(random.Random(4), primera=(2, 3))
+        espejo = rollout.DadosRollout(random.Random(4), primera=(2, 3), antitetico=True)
+        self.assertEqual(normales.roll(), [2, 3])
+        self.assertEqual(espejo.roll(), [5, 4])
+        for _ in range(50):
+            originales = normales.roll()
+            self.assertEqual(espejo.roll(), [7 - d for d in originales])
+
+    def test_estratificacion_cubre_las_36(self):
+        self.assertEqual(len(set(rollout.PRIMERAS_TIRADAS)), 36)
+
+
+class TestResultadoRollout(unittest.TestCase):
+    """Estadísticas acumuladas."""
+
+    def test_media_y_error(self):
+        resultado = rollout.ResultadoRollout()
+        for valor in (1, -1, 2, -1):
+            resultado.agregar_partida(valor)
+            resultado.agregar_unidad(valor)
+        self.assertAlmostEqual(resultado.equidad(), 0.25)
+        self.assertAlmostEqual(resultado.error_estandar(), (2.25 / 4) ** 0.5)
+        bajo, alto = resultado.intervalo()
+        self.assertLess(bajo, 0.25)
+        self.assertGreater(alto, 0.25)
+        self.assertEqual((resultado.victorias, resultado.gammons), (2, 1))
+        self.assertIn("Equidad", resultado.reporte())
+
+    def test_error_con_una_unidad(self):
+        resultado = rollout.ResultadoRollout()
+        resultado.agregar_unidad(1.0)
+        self.assertEqual(resultado.error_estandar(), float("inf"))
+
+
+class TestRollout(unittest.TestCase):
+    """Rollouts completos."""
+
+    def test_victoria_segura(self):
+        posicion = [0] * 28
+        posicion[23] = 1
+        posicion[AFUERA_BLANCAS] = 14
+        posicion[0] = -15
+        resultado = rollout.rollout_posicion(posicion, 0, "aleatorio", partidas=36)
+        self.assertEqual(resultado.equidad(), 2.0)
+        self.assertEqual(resultado.error_estandar(), 0.0)
+        # Visto desde negras (si les tocara tirar) no es victoria segura
+        resultado = rollout.rollout_posicion(posicion, 1, "aleatorio", partidas=36)
+        self.assertLess(resultado.equidad(), 2.0)
+
+    def test_determinista_por_semilla(self):
+        opciones = {"partidas": 40, "semilla": 3, "antitetico": True}
+        uno = rollout.rollout_posicion(_carrera(), 0, tamano_shard=5, **opciones)
+        otro = rollout.rollout_posicion(_carrera(), 0, tamano_shard=20, **opciones)
+        self.assertEqual(uno.partidas, 40)
+        self.assertEqual(uno.unidades, 20)
+        self.assertEqual((uno.suma, uno.partidas, uno.victorias),
+                         (otro.suma, otro.partidas, otro.victorias))
+
+    def test_corte_temprano(self):
+        resultado = rollout.rollout_posicion(_carrera(), 0, partidas=360,
+                                             error_objetivo=10.0, tamano_shard=36)
+        self.assertEqual(resultado.partidas, 36)
+
+    def test_rollout_desde_game_no_lo_modifica(self):
+        game = Game(compacto=True)
+        antes = game.hash_posicion()
+        resultado = rollout.rollout(game, "heuristico", partidas=4)
+        self.assertEqual(resultado.partidas, 4)
+        self.assertEqual(game.hash_posicion(), antes)
+        self.assertEqual(list(game.__board__.posicion_compacta()), list(POSICION_INICIAL))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+"""Tests para el servidor asyncio de partidas."""
+# pylint: disable=missing-function-docstring
+
+import asyncio
+import json
+import os
+import random
+import tempfile
+import unittest
+from server.server import GameServer
+from server.store import SessionStore
+
+
+class _Cliente:
+    """Cliente JSON-lines mínimo sobre streams de asyncio."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def enviar(self, **mensaje):
+        self.writer.write(json.dumps(mensaje).encode() + b"\n")
+        await self.writer.drain()
+        return await self.recibir()
+
+    async def recibir(self):
+        return json.loads(await asyncio.wait_for(self.reader.readline(), 5))
+
+    async def cerrar(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+    """Partidas completas y errores a través de sockets reales."""
+
+    async def asyncSetUp(self):
+        self.servidor = GameServer(random.Random(7))
+        tcp = await self.servidor.iniciar_tcp("127.0.0.1", 0)
+        self.puerto = tcp.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        await self.servidor.cerrar()
+
+    async def _conectar(self):
+        return _Cliente(*await asyncio.open_connection("127.0.0.1", self.puerto))
+
+    async def test_unirse_y_recibir_eventos(self):
+        blancas, negras = await self._conectar(), await self._conectar()
+        respuesta = await blancas.enviar(cmd="join", sesion="s1", id=1)
+        self.assertEqual((respuesta["ok"], respuesta["color"], respuesta["id"]),
+                         (True, "blanca", 1))
+        respuesta = await negras.enviar(cmd="join", sesion="s1")
+        self.assertEqual(respuesta["color"], "negra")
+        self.assertEqual(respuesta["estado"]["jugadores"], ["blanca", "negra"])
+        self.assertEqual((await blancas.recibir())["tipo"], "unido")
+
+        tercero = await self._conectar()
+        self.assertFalse((await tercero.enviar(cmd="join", sesion="s1"))["ok"])
+        respuesta = await negras.enviar(cmd="roll")
+        self.assertEqual((respuesta["ok"], respuesta["error"]), (False, "No es tu turno"))
+        for cliente in (blancas, negras, tercero):
+            await cliente.cerrar()
+
+    async def test_partida_completa(self):
+        clientes = {}
+        for color in ("blanca", "negra"):
+            clientes[color] = await self._conectar()
+            await clientes[color].enviar(cmd="join", sesion="completa", color=color)
+        await clientes["blanca"].recibir()  # aviso de que se unió el rival
+        rng = random.Random(1)
+        estado = (await clientes["blanca"].enviar(cmd="state"))["estado"]
+        for _ in range(2000):
+            if estado["ganador"]:
+                break
+            turno, rival = estado["turno"], "negra" if estado["turno"] == "blanca" else "blanca"
+            respuesta = await clientes[turno].enviar(cmd="roll")
+            self.assertTrue(respuesta["ok"], respuesta)
+            self.assertEqual((await clientes[rival].recibir())["estado"], respuesta["estado"])
+            estado = respuesta["estado"]
+            while estado["turno"] == turno and estado["movimientos"] and not estado["ganador"]:
+                movimiento = rng.choice(estado["movimientos"])
+                respuesta = await clientes[turno].enviar(cmd="move", movimiento=movimiento)
+                self.assertTrue(respuesta["ok"], respuesta)
+                self.assertEqual((await clientes[rival].recibir())["estado"], respuesta["estado"])
+                estado = respuesta["estado"]
+        self.assertIn(estado["ganador"], ("blanca", "negra"))
+        self.assertEqual(estado["fase"], "terminada")
+        for cliente in clientes.values():
+            await cliente.cerrar()
+
+    async def test_errores_de_protocolo(self):
+        cliente = await self._conectar()
+        cliente.writer.write(b"no es json\n")
+        self.assertEqual(await cliente.recibir(), {"ok": False, "error": "JSON inválido"})
+        self.assertFalse((await cliente.enviar(cmd="roll"))["ok"])
+        self.assertFalse((await cliente.enviar(cmd="bailar"))["ok"])
+        await cliente.enviar(cmd="join", sesion="errores")
+        await cliente.enviar(cmd="roll")
+        respuesta = await cliente.enviar(cmd="move", movimiento=[0, 1, 9], id="x")
+        self.assertEqual((respuesta["ok"], respuesta["id"]), (False, "x"))
+        self.assertFalse((await cliente.enviar(cmd="move"))["ok"])
+        self.assertFalse((await cliente.enviar(cmd=["x"], id=2))["ok"])
+        respuesta = await cliente.enviar(cmd="move", jugada={"x": 1})
+        self.assertEqual((respuesta["ok"], respuesta["error"][:15]), (False, "Se esperaba un "))
+        self.assertTrue((await cliente.enviar(cmd="state"))["ok"])
+        await cliente.cerrar()
+
+    async def test_sesion_se_descarta_al_salir_todos(self):
+        cliente = await self._conectar()
+        respuesta = await cliente.enviar(cmd="join")
+        sesion = respuesta["estado"]["sesion"]
+        self.assertIn(sesion, self.servidor.sesiones)
+        await cliente.cerrar()
+        for _ in range(100):
+            if sesion not in self.servidor.sesiones:
+                break
+            await asyncio.sleep(0.01)
+        self.assertNotIn(sesion, self.servidor.sesiones)
+
+    async def test_retomar_sesion_desalojada(self):
+        cliente = await self._conectar()
+        await cliente.enviar(cmd="join", sesion="pausa")
+        estado = (await cliente.enviar(cmd="roll"))["estado"]
+        await cliente.cerrar()
+        for _ in range(100):
+            if "pausa" not in self.servidor.sesiones:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(self.servidor.almacen.en_memoria(), 0)
+        self.assertIn("pausa", self.servidor.almacen)
+        cliente = await self._conectar()
+        respuesta = await cliente.enviar(cmd="join", sesion="pausa")
+        self.assertEqual(respuesta["estado"]["dados"], estado["dados"])
+        self.assertEqual(respuesta["estado"]["movimientos"], estado["movimientos"])
+        self.assertFalse((await cliente.enviar(cmd="join", sesion="x", color="roja"))["ok"])
+        await cliente.cerrar()
+
+    async def test_almacen_inyectado(self):
+        with tempfile.TemporaryDirectory() as carpeta:
+            almacen = SessionStore(carpeta, maximo=1, rng=random.Random(3))
+            servidor = GameServer(almacen=almacen)
+            self.assertIs(servidor.almacen, almacen)
+            tcp = await servidor.iniciar_tcp("127.0.0.1", 0)
+            puerto = tcp.sockets[0].getsockname()[1]
+            clientes = []
+            for sesion in ("uno", "dos"):
+                cliente = _Cliente(*await asyncio.open_connection("127.0.0.1", puerto))
+                await cliente.enviar(cmd="join", sesion=sesion)
+                clientes.append(cliente)
+            self.assertEqual((almacen.en_memoria(), almacen.desalojos), (1, 1))
+            self.assertEqual(len(os.listdir(carpeta)), 1)
+            respuesta = await clientes[0].enviar(cmd="roll")
+            self.assertTrue(respuesta["ok"], respuesta)
+            self.assertEqual((almacen.rehidrataciones, almacen.desalojos), (1, 2))
+            for cliente in clientes:
+                await cliente.cerrar()
+            await servidor.cerrar()
+
+    @unittest.skipUnless(hasattr(asyncio, "start_unix_server"), "sin sockets Unix")
+    async def test_socket_unix(self):
+        with tempfile.TemporaryDirectory() as carpeta:
+            ruta = os.path.join(carpeta, "bg.sock")
+            await self.servidor.iniciar_unix(ruta)
+            cliente = _Cliente(*await asyncio.open_unix_connection(ruta))
+            respuesta = await cliente.enviar(cmd="join", sesion="unix")
+            self.assertTrue(respuesta["ok"])
+            await cliente.cerrar()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""Tests para el simulador headless."""
+# pylint: disable=missing-function-docstring
+
+import random
+import unittest
+from unittest.mock import patch
+from core import simulate
+from core.board import POSICION_INICIAL
+from core.game import Game
+
+
+class TestSimulate(unittest.TestCase):
+    """Pruebas del simulador de partidas completas."""
+
+    def test_jugar_partida_termina_sin_io(self):
+        agentes = (simulate.AgenteAleatorio(random.Random(1)),
+                   simulate.AgenteAleatorio(random.Random(2)))
+        with patch('builtins.input', side_effect=AssertionError("input")), \
+             patch('builtins.print', side_effect=AssertionError("print")), \
+             patch.object(Game, 'turno_completo', side_effect=AssertionError("turno")):
+            ganador, puntos, turnos = simulate.jugar_partida(agentes)
+        self.assertIn(ganador, ("blanca", "negra"))
+        self.assertIn(puntos, (1, 2, 3))
+        self.assertGreater(turnos, 0)
+
+    def test_heuristico_prefiere_mejor_carrera(self):
+        agente = simulate.AgenteHeuristico()
+        game = Game(compacto=True)
+        game.__dice__.__valores__ = [6, 5]
+        jugadas = game.generar_jugadas()
+        elegida = agente.elegir_jugada(game, jugadas)
+        self.assertIn(elegida, jugadas)
+        puntajes = [agente.puntaje(final, "blanca") for _, final in jugadas]
+        self.assertEqual(agente.puntaje(elegida[1], "blanca"), max(puntajes))
+
+    def test_conteo_pips_inicial(self):
+        self.assertEqual(simulate.conteo_pips(POSICION_INICIAL, "blanca"), 167)
+        self.assertEqual(simulate.conteo_pips(POSICION_INICIAL, "negra"), 167)
+
+    def test_resumen(self):
+        resumen = simulate.ResumenSimulacion()
+        self.assertEqual(resumen.partidas_por_segundo(), 0.0)
+        self.assertEqual(resumen.turnos_promedio(), 0.0)
+        resumen.agregar("blanca", 1, 40)
+        resumen.agregar("negra", 2, 60)
+        resumen.agregar("blanca", 3, 50)
+        resumen.agregar("negra", 1, 50)
+        resumen.segundos = 2.0
+        self.assertEqual(resumen.partidas_por_segundo(), 2.0)
+        self.assertEqual(resumen.turnos_promedio(), 50.0)
+        self.assertEqual(resumen.tasa_gammon(), 0.25)
+        self.assertEqual(resumen.tasa_backgammon(), 0.25)
+        self.assertEqual(resumen.victorias_blancas, 2)
+        self.assertIn("Backgammons: 25.00%", resumen.reporte())
+
+    def test_shards_deterministas_con_cualquier_cantidad_de_procesos(self):
+        serie = simulate.simular_paralelo(6, semilla=3, procesos=1, tamano_shard=2)
+        paralelo = simulate.simular_paralelo(6, semilla=3, procesos=2, tamano_shard=2)
+        self.assertEqual(serie.partidas, 6)
+        self.assertEqual(serie.resultados(), paralelo.resultados())
+        otra = simulate.simular_paralelo(6, semilla=4, procesos=1, tamano_shard=2)
+        self.assertNotEqual(serie.resultados(), otra.resultados())
+
+    def test_combinar(self):
+        a = simulate.ResumenSimulacion()
+        a.agregar("blanca", 2, 30)
+        b = simulate.ResumenSimulacion()
+        b.agregar("negra", 3, 70)
+        self.assertEqual(a.combinar(b).resultados(), (2, 100, 1, 1, 1))
+
+    def test_main_reporta(self):
+        with patch('builtins.print') as mock_print:
+            resumen = simulate.main(["-n", "2", "--blancas", "heuristico", "--semilla", "5"])
+        self.assertEqual(resumen.partidas, 2)
+        self.assertIn("partidas/s", mock_print.call_args.args[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""Tests para el almacén de partidas con instantáneas."""
+# pylint: disable=missing-function-docstring
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from core.game import Game, FASE_MOVER, FASE_TERMINADA
+from server.store import SessionStore, TAMANO_INSTANTANEA, empaquetar, desempaquetar
+
+
+class _Reloj:
+    """Reloj manual para probar el desalojo por inactividad."""
+
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+class TestInstantaneas(unittest.TestCase):
+    """empaquetar / desempaquetar."""
+
+    def test_ida_y_vuelta_a_mitad_de_turno(self):
+        game = Game(quiet=True, compacto=True)
+        game.roll((4, 4))
+        game.play((0, 4, 4))
+        datos = empaquetar(game)
+        self.assertEqual(len(datos), TAMANO_INSTANTANEA)
+        self.assertLess(TAMANO_INSTANTANEA, 64)
+        copia = desempaquetar(datos)
+        self.assertEqual(copia.status(), game.status())
+        self.assertEqual(copia.status()["fase"], FASE_MOVER)
+        self.assertEqual(copia.movimientos_legales(), game.movimientos_legales())
+
+    def test_partida_terminada(self):
+        posicion = [0] * 28
+        posicion[23] = 1
+        posicion[26] = 14
+        posicion[0] = -15
+        game = Game(quiet=True, compacto=True)
+        game.cargar_posicion(posicion)
+        game.roll((1, 2))
+        game.play((23, "off", 2))
+        copia = desempaquetar(empaquetar(game))
+        self.assertEqual(copia.status()["fase"], FASE_TERMINADA)
+        self.assertEqual((copia.status()["ganador"], copia.status()["puntos"]), ("blanca", 2))
+
+    def test_formato_desconocido(self):
+        datos = bytearray(empaquetar(Game(quiet=True, compacto=True)))
+        datos[0] = 99
+        with self.assertRaises(ValueError):
+            desempaquetar(bytes(datos))
+
+
+class TestSessionStore(unittest.TestCase):
+    """Desalojo LRU, por inactividad y rehidratación transparente."""
+
+    def _jugar_un_poco(self, game):
+        game.roll()
+        movimientos = game.movimientos_legales()
+        if movimientos:
+            game.play(movimientos[0])
+        return game.status()
+
+    def test_maximo_en_memoria(self):
+        almacen = SessionStore(maximo=2, rng=random.Random(1))
+        for nombre in "abc":
+            almacen.crear(nombre)
+        self.assertEqual((len(almacen), almacen.en_memoria(), almacen.desalojos), (3, 2, 1))
+        self.assertIn("a", almacen)
+        almacen.obtener("a")
+        self.assertEqual((almacen.rehidrataciones, almacen.desalojos), (1, 2))
+        with self.assertRaises(KeyError):
+            almacen.crear("a")
+        with self.assertRaises(KeyError):
+            almacen.obtener("z")
+
+    def test_bajo_el_maximo_no_desaloja(self):
+        almacen = SessionStore(maximo=5)
+        for nombre in "abcd":
+            almacen.crear(nombre)
+        self.assertEqual((almacen.en_memoria(), almacen.desalojos), (4, 0))
+
+    def test_inactividad_y_rehidratacion(self):
+        reloj = _Reloj()
+        almacen = SessionStore(inactividad=10, rng=random.Random(2), reloj=reloj)
+        estado = self._jugar_un_poco(almacen.crear("vieja"))
+        reloj.ahora = 5
+        almacen.crear("nueva")
+        reloj.ahora = 12
+        self.assertEqual(almacen.desalojar_inactivas(), 1)
+        self.assertEqual(almacen.en_memoria(), 1)
+        self.assertEqual(almacen.obtener("vieja").status(), estado)
+        self.assertEqual(almacen.desalojar_inactivas(), 0)
+
+    def test_instantaneas_en_disco(self):
+        with tempfile.TemporaryDirectory() as carpeta:
+            almacen = SessionStore(carpeta, rng=random.Random(3))
+            estado = self._jugar_un_poco(almacen.crear("sesión/1"))
+            almacen.desalojar("sesión/1")
+            self.assertEqual(almacen.en_memoria(), 0)
+            self.assertEqual(almacen.obtener("sesión/1").status(), estado)
+            almacen.desalojar("sesión/1")
+            almacen.descartar("sesión/1")
+            self.assertNotIn("sesión/1", almacen)
+            self.assertEqual(len(almacen), 0)
+
+    def test_id_largo_en_disco(self):
+        with tempfile.TemporaryDirectory() as carpeta:
+            almacen = SessionStore(carpeta, rng=random.Random(4))
+            identificador = "x" * 500
+            estado = self._jugar_un_poco(almacen.crear(identificador))
+            almacen.desalojar(identificador)
+            self.assertEqual(almacen.obtener(identificador).status(), estado)
+
+    def test_fallo_de_escritura_conserva_la_partida(self):
+        reloj = _Reloj()
+        with tempfile.TemporaryDirectory() as carpeta:
+            almacen = SessionStore(os.path.join(carpeta, "borrada"), maximo=1,
+                                   inactividad=1, reloj=reloj)
+            shutil.rmtree(os.path.join(carpeta, "borrada"))
+            almacen.crear("a")
+            almacen.crear("b")
+            self.assertEqual((almacen.en_memoria(), almacen.fallos_escritura), (2, 1))
+            with self.assertRaises(OSError):
+                almacen.desalojar("a")
+            reloj.ahora = 5
+            self.assertEqual(almacen.desalojar_inactivas(), 0)
+            self.assertIn("a", almacen)
+            self.assertEqual(almacen.obtener("a").status()["fase"], "tirar")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""Tests para el entrenamiento TD(λ) (requieren NumPy)."""
+# pylint: disable=missing-function-docstring
+
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+    from core import train
+    from core.neural import NeuralEvaluator
+except ImportError:  # pragma: no cover - NumPy es opcional para el resto del juego
+    np = None
+
+
+@unittest.skipIf(np is None, "NumPy no está instalado")
+class TestTrain(unittest.TestCase):
+    """Pruebas del autojuego, los objetivos TD(λ) y el entrenador."""
+
+    def setUp(self):
+        self.red = NeuralEvaluator(ocultas=8, rng=np.random.default_rng(1))
+
+    def _pesos(self):
+        return (self.red.w1, self.red.b1, self.red.w2, self.red.b2)
+
+    def test_generar_partidas_determinista(self):
+        tarea = (self._pesos(), "prueba", 2, 0.1)
+        partidas = train.generar_partidas(tarea)
+        self.assertEqual(len(partidas), 2)
+        posiciones, turnos, puntos = partidas[0]
+        self.assertEqual(len(posiciones), len(turnos))
+        self.assertTrue(all(a != b for a, b in zip(turnos, turnos[1:])))
+        self.assertIn(puntos, (1, 2, 3))
+        self.assertEqual(train.generar_partidas(tarea), partidas)
+
+    def test_objetivos_lambda_uno_es_el_resultado(self):
+        posiciones, turnos, _ = train.generar_partidas((self._pesos(), "l1", 1, 0.0))[0]
+        entradas = train.codificar_partida(posiciones, turnos)
+        objetivos = train.objetivos_td(self.red, entradas, 2, lam=1.0)
+        np.testing.assert_allclose(objetivos[-1], [1, 1, 0, 0, 0])
+        np.testing.assert_allclose(objetivos[-2], [0, 0, 0, 1, 0])
+        np.testing.assert_allclose(objetivos[-3], [1, 1, 0, 0, 0])
+
+    def test_objetivos_lambda_cero_es_la_prediccion(self):
+        posiciones, turnos, _ = train.generar_partidas((self._pesos(), "l0", 1, 0.0))[0]
+        entradas = train.codificar_partida(posiciones, turnos)
+        objetivos = train.objetivos_td(self.red, entradas, 1, lam=0.0)
+        predicciones = self.red.propagar(entradas)[1]
+        esperado = train._invertir(predicciones[1:])  # pylint: disable=protected-access
+        np.testing.assert_allclose(objetivos[:-1], esperado, rtol=1e-5)
+
+    def test_paso_gradiente_reduce_error(self):
+        entradas = np.random.default_rng(2).random((32, self.red.w1.shape[0]), dtype=np.float32)
+        objetivos = np.full((32, 5), 0.25, dtype=np.float32)
+        primero = train.paso_gradiente(self.red, entradas, objetivos, 0.5)
+        for _ in range(20):
+            ultimo = train.paso_gradiente(self.red, entradas, objetivos, 0.5)
+        self.assertLess(ultimo, primero)
+
+    def test_entrenador_con_puntos_de_control(self):
+        with tempfile.TemporaryDirectory() as carpeta:
+            entrenador = train.EntrenadorTD(self.red, partidas_por_tarea=1, carpeta=carpeta,
+                                            cada=1, evaluacion=2)
+            antes = self.red.w1.copy()
+            entrenador.entrenar(2)
+            self.assertEqual(entrenador.partidas, 2)
+            self.assertEqual([m["partidas"] for m in entrenador.metricas], [1, 2])
+            self.assertIn("equidad_vs_heuristico", entrenador.metricas[0])
+            self.assertTrue(os.path.exists(os.path.join(carpeta, "pesos_00000002.npz")))
+            with open(os.path.join(carpeta, "metricas.jsonl"), encoding="utf-8") as archivo:
+                self.assertEqual(len(archivo.readlines()), 2)
+        self.assertFalse(np.array_equal(antes, self.red.w1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Tests para la tabla de transposición."""
+# pylint: disable=missing-function-docstring
+
+import unittest
+from core import ai, transposition, zobrist
+from core.board import POSICION_INICIAL
+from core.game import Game
+from core.transposition import TranspositionTable, EXACTO, COTA_INFERIOR, COTA_SUPERIOR
+
+
+class TestTranspositionTable(unittest.TestCase):
+    """Pruebas de la tabla de tamaño fijo."""
+
+    def test_tope_de_memoria(self):
+        tabla = TranspositionTable(megabytes=1)
+        self.assertEqual(tabla.capacidad() & (tabla.capacidad() - 1), 0)
+        self.assertLessEqual(tabla.capacidad() * 18, 1024 * 1024)
+        self.assertGreater(tabla.capacidad() * 2 * 18, 1024 * 1024)
+        with self.assertRaises(ValueError):
+            TranspositionTable(megabytes=0)
+
+    def test_guardar_y_consultar(self):
+        tabla = TranspositionTable(1)
+        self.assertIsNone(tabla.consultar(12345, 1, -3, 3))
+        tabla.guardar(12345, 2, 0.5)
+        self.assertEqual(tabla.consultar(12345, 2, -3, 3), 0.5)
+        self.assertEqual(tabla.consultar(12345, 1, -3, 3), 0.5)
+        # Una entrada menos profunda que la pedida no sirve
+        self.assertIsNone(tabla.consultar(12345, 3, -3, 3))
+        self.assertEqual((tabla.aciertos, tabla.fallos), (2, 2))
+        self.assertAlmostEqual(tabla.tasa_aciertos(), 0.5)
+        self.assertEqual(len(tabla), 1)
+
+    def test_cotas(self):
+        tabla = TranspositionTable(1)
+        tabla.guardar(1, 1, 0.8, COTA_INFERIOR)
+        self.assertEqual(tabla.consultar(1, 1, 0.0, 0.5), 0.8)
+        self.assertIsNone(tabla.consultar(1, 1, 0.0, 1.0))
+        tabla.guardar(2, 1, -0.8, COTA_SUPERIOR)
+        self.assertEqual(tabla.consultar(2, 1, -0.5, 0.5), -0.8)
+        self.assertIsNone(tabla.consultar(2, 1, -1.0, 0.5))
+
+    def test_reemplazo_por_profundidad(self):
+        tabla = TranspositionTable(1)
+        otra = 7 + tabla.capacidad()  # misma casilla que la clave 7
+        tabla.guardar(7, 3, 1.0)
+        self.assertFalse(tabla.guardar(otra, 2, 2.0))
+        self.assertEqual(tabla.consultar(7, 3, -3, 3), 1.0)
+        self.assertTrue(tabla.guardar(otra, 3, 2.0))
+        self.assertEqual(tabla.reemplazos, 1)
+        self.assertIsNone(tabla.consultar(7, 1, -3, 3))
+        self.assertEqual(tabla.consultar(otra, 3, -3, 3), 2.0)
+
+    def test_limpiar(self):
+        tabla = TranspositionTable(1)
+        tabla.guardar(5, 1, 0.1, EXACTO)
+        tabla.consultar(5, 1, -3, 3)
+        tabla.limpiar()
+        self.assertEqual(len(tabla), 0)
+        self.assertEqual(tabla.estadisticas()["aciertos"], 0)
+
+    def test_clave_coincide_con_game(self):
+        game = Game(compacto=True)
+        self.assertEqual(transposition.clave(POSICION_INICIAL, "blanca"), game.hash_posicion())
+        game.cambiar_turno()
+        self.assertEqual(transposition.clave(POSICION_INICIAL, "negra"), game.hash_posicion())
+        self.assertEqual(transposition.clave(POSICION_INICIAL, "negra")
+                         ^ transposition.clave(POSICION_INICIAL, "blanca"),
+                         zobrist.TURNO_NEGRAS)
+
+    def test_busqueda_con_tabla_da_el_mismo_valor(self):
+        tabla = TranspositionTable(1)
+        sin_tabla = ai.Expectimax(profundidad=2)
+        con_tabla = ai.Expectimax(profundidad=2, tabla=tabla)
+        for dados in ([3, 1], [6, 6, 6, 6], [5, 2]):
+            esperado = sin_tabla.mejor_jugada(POSICION_INICIAL, "negra", dados)
+            self.assertEqual(con_tabla.mejor_jugada(POSICION_INICIAL, "negra", dados), esperado)
+        self.assertGreater(tabla.fallos, 0)
+        # Repetir la búsqueda responde desde la tabla
+        con_tabla.nodos = 0
+        con_tabla.mejor_jugada(POSICION_INICIAL, "negra", [3, 1])
+        self.assertGreater(tabla.aciertos, 0)
+        self.assertLess(con_tabla.nodos, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
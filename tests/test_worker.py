@@ -0,0 +1,81 @@
+"""Tests para la búsqueda en un hilo de fondo."""
+# pylint: disable=missing-function-docstring
+
+import threading
+import unittest
+from core.ai import Expectimax
+from core.board import POSICION_INICIAL
+from core.excepcions import BusquedaCanceladaError
+from core.worker import AIWorker
+
+
+class _MotorControlado:
+    """Motor falso que no termina hasta que se libera o se cancela."""
+
+    def __init__(self):
+        self.liberar = threading.Event()
+        self.empezo = threading.Event()
+
+    def mejor_jugada(self, _posicion, color, dados, detener=None):
+        self.empezo.set()
+        while not self.liberar.wait(0.001):
+            if detener():
+                raise BusquedaCanceladaError("cancelada")
+        return (("jugada", color, dados), 0.5)
+
+
+class TestAIWorker(unittest.TestCase):
+    """Trabajos, resultados y cancelación."""
+
+    def _worker(self, motor=None):
+        listos = []
+        terminado = threading.Event()
+
+        def al_terminar(trabajo):
+            listos.append(trabajo)
+            terminado.set()
+
+        worker = AIWorker(motor, al_terminar=al_terminar)
+        self.addCleanup(worker.cerrar, 5)
+        return worker, listos, terminado
+
+    def test_resultado_igual_a_la_busqueda_directa(self):
+        worker, listos, terminado = self._worker()
+        trabajo = worker.enviar(POSICION_INICIAL, "blanca", [6, 5])
+        self.assertTrue(terminado.wait(10))
+        self.assertEqual(listos, [trabajo])
+        self.assertFalse(worker.ocupado())
+        esperado = Expectimax(profundidad=2).mejor_jugada(POSICION_INICIAL, "blanca", [6, 5])
+        self.assertEqual(worker.resultado(trabajo), esperado)
+
+    def test_no_bloquea_mientras_busca(self):
+        motor = _MotorControlado()
+        worker, _, terminado = self._worker(motor)
+        trabajo = worker.enviar(POSICION_INICIAL, "negra", [3, 1])
+        self.assertTrue(motor.empezo.wait(5))
+        self.assertTrue(worker.ocupado())
+        self.assertIsNone(worker.resultado(trabajo))
+        motor.liberar.set()
+        self.assertTrue(terminado.wait(5))
+        self.assertEqual(worker.resultado(trabajo), (("jugada", "negra", (3, 1)), 0.5))
+
+    def test_cancelar_descarta_el_trabajo(self):
+        motor = _MotorControlado()
+        worker, listos, terminado = self._worker(motor)
+        viejo = worker.enviar(POSICION_INICIAL, "blanca", [6, 6, 6, 6])
+        self.assertTrue(motor.empezo.wait(5))
+        worker.cancelar()
+        self.assertFalse(worker.ocupado())
+        # Un trabajo nuevo reemplaza al cancelado
+        nuevo = worker.enviar(POSICION_INICIAL, "blanca", [2, 1])
+        motor.liberar.set()
+        self.assertTrue(terminado.wait(5))
+        self.assertEqual(listos, [nuevo])
+        self.assertIsNone(worker.resultado(viejo))
+        self.assertIsNotNone(worker.resultado(nuevo))
+        worker.cancelar()
+        self.assertIsNone(worker.resultado(nuevo))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+"""Tests para las claves Zobrist."""
+
+import unittest
+from core import zobrist
+from core.board import POSICION_INICIAL
+
+
+class TestZobrist(unittest.TestCase):
+    """Pruebas de las funciones de hash Zobrist."""
+
+    def test_posicion_vacia_tiene_hash_cero(self):
+        """Los casilleros vacíos no aportan al hash."""
+        self.assertEqual(zobrist.hash_posicion([0] * 28), 0)
+
+    def test_delta_equivale_a_recalcular(self):
+        """Aplicar delta sobre un casillero da el mismo hash que recalcular."""
+        posicion = list(POSICION_INICIAL)
+        antes = zobrist.hash_posicion(posicion)
+        posicion[5] = -4
+        esperado = zobrist.hash_posicion(posicion)
+        self.assertEqual(antes ^ zobrist.delta(5, -5, -4), esperado)
+
+    def test_clave_turno(self):
+        """Solo el turno de negras modifica el hash."""
+        self.assertEqual(zobrist.clave_turno(0), 0)
+        self.assertEqual(zobrist.clave_turno(1), zobrist.TURNO_NEGRAS)
+        self.assertLess(zobrist.TURNO_NEGRAS, 2 ** 64)
+
+
+if __name__ == '__main__':
+    unittest.main()